@@ -1,9 +1,11 @@
-"""Benchmark `unibox` performance (ls and concurrent_loads)."""
+"""Benchmark `unibox` performance (ls, concurrent_loads and its executors)."""
 
 from __future__ import annotations
 
 import argparse
+import json
 import sys
+import tempfile
 import time
 from pathlib import Path
 
@@ -88,10 +90,43 @@ def benchmark_concurrent_loads(
     print()
 
 
+def make_synthetic_files(directory: Path, num_files: int) -> list[str]:
+    """Write `num_files` small JSON files (a few hundred bytes each) into `directory`."""
+    paths = []
+    for i in range(num_files):
+        path = directory / f"{i:06d}.json"
+        record = {
+            "id": i,
+            "caption": f"sample {i} " * 8,
+            "tags": [f"tag{j}" for j in range(10)],
+            "score": i / num_files,
+        }
+        path.write_text(json.dumps(record), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def benchmark_executors(files: list[str], num_workers: int = 8, repeats: int = 3) -> None:
+    """Compare `concurrent_loads` with thread, process and auto executors on the same files."""
+    print("=== concurrent_loads executor benchmark ===")
+    print(f"Python: {sys.version.split()[0]}")
+    print(f"Files: {len(files)}, workers: {num_workers}, best of {repeats}")
+
+    for executor in ("thread", "process", "auto"):
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            ub.concurrent_loads(files, num_workers=num_workers, debug_print=False, executor=executor)
+            best = min(best, time.perf_counter() - start)
+        throughput = len(files) / best if best > 0 else float("inf")
+        print(f"{executor:>8}: {best:.3f} s ({throughput:.1f} files/s)")
+    print()
+
+
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(
-        description="Benchmark unibox performance (ls and concurrent_loads).",
+        description="Benchmark unibox performance (ls, concurrent_loads and its executors).",
     )
     parser.add_argument(
         "path",
@@ -101,9 +136,15 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     )
     parser.add_argument(
         "--mode",
-        choices=("ls", "concurrent", "both"),
+        choices=("ls", "concurrent", "both", "executors"),
         default="both",
-        help="Which benchmark to run (default: both).",
+        help="Which benchmark to run (default: both). 'executors' compares thread/process/auto.",
+    )
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=0,
+        help="For --mode executors: load this many generated small JSON files instead of `path`.",
     )
     parser.add_argument(
         "--batch-size",
@@ -131,6 +172,16 @@ def main(argv: list[str] | None = None) -> None:
     args = parse_args(argv)
     path = Path(args.path)
 
+    if args.mode == "executors":
+        if args.synthetic:
+            with tempfile.TemporaryDirectory(prefix="unibox_bench_") as tmp_dir:
+                files = make_synthetic_files(Path(tmp_dir), args.synthetic)
+                benchmark_executors(files, num_workers=args.workers)
+        else:
+            files = ub.ls(str(path), debug_print=False)[: args.batch_size * args.batches]
+            benchmark_executors(files, num_workers=args.workers)
+        return
+
     if args.mode in ("ls", "both"):
         benchmark_ls(path)
     if args.mode in ("concurrent", "both"):
@@ -12,19 +12,43 @@ __all__: list[str] = [
     "IMG_FILES",
     "VIDEO_FILES",
     "UniLogger",
+    "compute_image_hashes",
     "concurrent_loads",
+    "find_duplicates",
     "gallery",
+    "iter_loads",
     "label_gallery",
+    "load_image_batch",
     "loads",
     "ls",
     "peeks",
     "presigns",
+    "probe_images",
+    "resolve_revision",
+    "save_images",
     "saves",
     "to_df",
     "traverses",
 ]
 
-from .unibox import concurrent_loads, gallery, label_gallery, loads, ls, peeks, presigns, saves, to_df, traverses
+from .unibox import (
+    concurrent_loads,
+    gallery,
+    iter_loads,
+    label_gallery,
+    loads,
+    ls,
+    peeks,
+    presigns,
+    resolve_revision,
+    saves,
+    to_df,
+    traverses,
+)
 from .utils.constants import IMAGE_FILES, IMG_FILES, VIDEO_FILES
 from .utils.globals import GLOBAL_TMP_DIR
+from .utils.image_batch import load_image_batch
+from .utils.image_dedup import compute_image_hashes, find_duplicates
+from .utils.image_export import save_images
+from .utils.image_probe import probe_images
 from .utils.logger import UniLogger
@@ -4,13 +4,16 @@ import os
 import re
 import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Mapping, Optional, Sequence, Union
 
-from huggingface_hub import HfApi, hf_hub_download
+from huggingface_hub import CommitOperationAdd, HfApi, hf_hub_download
 from huggingface_hub.errors import RepositoryNotFoundError
+from tqdm.auto import tqdm
 
 from .base_backend import BaseBackend
+from .hf_repo_cache import get_repo_cache
 from ..utils.utils import parse_hf_uri
 
 HF_PREFIX = "hf://"
@@ -21,69 +24,173 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Files per commit in upload_many; the Hub handles a few thousand operations per commit well
+DEFAULT_FILES_PER_COMMIT = 1000
 
 
+# ioctl that clones a file's extents (copy-on-write) on btrfs, XFS, bcachefs and similar
+_FICLONE = 0x40049409
+
+
+def _reflink(src: str, dst: Path) -> bool:
+    """Clone `src` to `dst` without copying data, where the filesystem supports it (Linux only)."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        return True
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
+
+
+def _place_from_cache(
+    cached_path: str, final_path: Path, read_only: bool = False, allow_symlink: bool = False
+) -> Path:
+    """Make the HF-cached file available at `final_path` without copying it if possible.
+
+    Tries a reflink first: the clone shares storage with the blob copy-on-write, so writing
+    to it later leaves the cache untouched. A hardlink (or, with `allow_symlink`, a symlink)
+    shares the blob itself, so writing to it would corrupt the cache; it is only used when
+    `read_only` says the caller hands out a view that must not be modified. Otherwise the
+    file is copied.
+    """
+    blob = os.path.realpath(cached_path)
+    final_path.parent.mkdir(parents=True, exist_ok=True)
+    if final_path.is_symlink() or final_path.exists():
+        if read_only and final_path.exists() and os.path.samefile(final_path, blob):
+            return final_path
+        # Unlinking only drops this name; a hardlinked blob keeps its content
+        final_path.unlink()
+    if _reflink(blob, final_path):
+        return final_path
+    if read_only:
+        try:
+            os.link(blob, final_path)
+            return final_path
+        except OSError:
+            pass  # cross-device target or a filesystem without hardlinks
+        if allow_symlink:
+            try:
+                os.symlink(blob, final_path)
+                return final_path
+            except OSError:
+                pass
+    shutil.copyfile(blob, final_path)
+    return final_path
+
 
 class HuggingfaceHybridBackend(BaseBackend):
     """A backend that uses low-level HfApi to handle single-file or folder usage in HF repos.
 
     It can:
-      - download a single file (download)
-      - upload a single file (upload)
+      - download a single file (download), or many concurrently (download_many)
+      - upload a single file (upload), or many in a few commits (upload_many)
       - list files in a repo (ls)
     """
 
     def __init__(self):
         self.api = HfApi()
 
+    def resolve_revision(self, uri: str, revision: Optional[str] = None) -> str:
+        """Return the commit sha that `revision` (default: the URI's revision, else main) points at.
+
+        Branches and tags are resolved once per repo cache TTL; commit shas are returned as is.
+        """
+        parts = parse_hf_uri(uri)
+        return get_repo_cache().resolve(self.api, parts.repo_id, parts.repo_type, revision or parts.revision)[1]
+
+    def _download_to_cache(self, uri: str) -> str:
+        """Download one file into the HF cache and return its cached path.
+
+        URIs without a repo type prefix are tried as a model repo first, then as a dataset.
+        The repo type and the revision's commit sha come from the repo cache, and
+        downloading by commit sha lets `hf_hub_download` return files it already has
+        without contacting the Hub.
+        """
+        parts = parse_hf_uri(uri)
+        try:
+            repo_type, sha = get_repo_cache().resolve(self.api, parts.repo_id, parts.repo_type, parts.revision)
+        except RepositoryNotFoundError:
+            if parts.repo_type != "model":
+                raise
+            raise ValueError(f"File not found in HF repo: {uri}")
+        return hf_hub_download(repo_id=parts.repo_id, filename=parts.path_in_repo, revision=sha, repo_type=repo_type)
+
     def download(self, uri: str, target_dir: str | None = None) -> Path | str:
-        """Download a single file from a HF repo to `target_dir`.
-        If the path_in_repo is actually a folder or there's no final file, we raise NotImplemented.
+        """Download a single file from a HF repo.
+
+        Without `target_dir` the file's path in the HF cache is returned, so nothing is
+        copied. With `target_dir` the file is reflinked or hardlinked there, and copied only
+        when neither works, e.g. across filesystems.
+
+        The result must be treated as read-only either way: a cache path or a hardlink is the
+        cached blob itself, so writing to it corrupts the HF cache. Write changes to a new
+        file, or use `cp_to_local` for an independent copy.
         """
         if not uri.startswith(HF_PREFIX):
             raise ValueError(f"Invalid HF URI: {uri}")
-        parts = parse_hf_uri(uri)
-        repo_id = parts.repo_id
-        path_in_repo = parts.path_in_repo
-        repo_type = parts.repo_type
-        revision = parts.revision or "main"
+        path_in_repo = parse_hf_uri(uri).path_in_repo
         if not path_in_repo:
             # do nothing, let loader handle it (load dataset as hf://.../)
             logger.info(f"{uri}: is a Huggingface dataset; skipping download.")
             return uri
 
+        local_path = self._download_to_cache(uri)
         if not target_dir:
-            target_dir = tempfile.gettempdir()
-        os.makedirs(target_dir, exist_ok=True)
+            return Path(local_path)
+        return _place_from_cache(local_path, Path(target_dir) / os.path.basename(path_in_repo), read_only=True)
 
-        # Download
-        if repo_type == "model":
-            try:
-                local_path = hf_hub_download(repo_id=repo_id, filename=path_in_repo, revision=revision)
-            except RepositoryNotFoundError:
-                logger.info(f"{uri}: is not a model repo; trying to download as dataset...")
+    def download_many(
+        self,
+        uris: List[str],
+        target_dir: Optional[str] = None,
+        num_workers: int = 8,
+        debug_print: bool = True,
+    ) -> List[Optional[Path]]:
+        """Download many files from HF repos concurrently.
+
+        Files are fetched into the HF cache by a thread pool and then reflinked (or
+        hardlinked, symlinked, or copied as a last resort) into `target_dir`, keeping their
+        paths in the repo so files with the same name in different folders do not collide.
+        As with `download`, the results share the cached blobs and must be treated as read-only.
+
+        Args:
+            uris: File URIs, e.g. ``hf://datasets/owner/repo/images/0001.png``.
+            target_dir: Directory to place the files in (default: return the HF cache paths).
+            num_workers: Concurrent downloads.
+            debug_print: Show a progress bar.
+
+        Returns:
+            List[Optional[Path]]: Local paths in the order of `uris`; None for failed downloads.
+        """
+        def fetch(uri: str) -> Path:
+            path_in_repo = parse_hf_uri(uri).path_in_repo
+            if not path_in_repo:
+                raise ValueError(f"Not a file URI: {uri}")
+            cached = self._download_to_cache(uri)
+            if not target_dir:
+                return Path(cached)
+            return _place_from_cache(cached, Path(target_dir) / path_in_repo, read_only=True, allow_symlink=True)
+
+        results: List[Optional[Path]] = [None] * len(uris)
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            future_to_idx = {executor.submit(fetch, uri): idx for idx, uri in enumerate(uris)}
+            futures_iter = as_completed(future_to_idx)
+            if debug_print:
+                futures_iter = tqdm(futures_iter, total=len(uris), desc="Downloading HF")
+
+            for future in futures_iter:
+                idx = future_to_idx[future]
                 try:
-                    local_path = hf_hub_download(
-                        repo_id=repo_id,
-                        filename=path_in_repo,
-                        revision=revision,
-                        repo_type="dataset",
-                    )
-                except RepositoryNotFoundError:
-                    raise ValueError(f"File not found in HF repo: {uri}")
-        else:
-            local_path = hf_hub_download(
-                repo_id=repo_id,
-                filename=path_in_repo,
-                revision=revision,
-                repo_type=repo_type,
-            )
+                    results[idx] = future.result()
+                except Exception as e:
+                    logger.error(f"Exception downloading {uris[idx]}: {e}")
 
-        # Copy from HF cache to target_dir if needed
-        filename_only = os.path.basename(path_in_repo)
-        final_path = Path(target_dir) / filename_only
-        shutil.copy(local_path, final_path)
-        return final_path
+        return results
 
     def upload(self, local_path: Path, uri: str) -> None:
         """Upload a single local file to HF at the given subpath in repo.
@@ -106,6 +213,68 @@ class HuggingfaceHybridBackend(BaseBackend):
             repo_id=repo_id,
             repo_type=repo_type,
         )
+        get_repo_cache().invalidate(repo_id)
+
+    def upload_many(
+        self,
+        files: Union[Sequence[Union[str, Path]], Mapping[Union[str, Path], str]],
+        uri: str,
+        files_per_commit: int = DEFAULT_FILES_PER_COMMIT,
+        num_workers: int = 8,
+        private: bool = True,
+        commit_message: Optional[str] = None,
+    ) -> List[str]:
+        """Upload many local files to one HF repo, grouped into a few commits.
+
+        `upload` makes one commit per file; here every `files_per_commit` files become a
+        single `create_commit`, with their blobs uploaded concurrently beforehand.
+
+        Args:
+            files: Local paths, placed by file name under the folder `uri` points to, or a
+                mapping of local path -> path relative to that folder (e.g. to keep
+                subdirectories).
+            uri: Destination repo or folder, e.g. ``hf://datasets/owner/repo/images``.
+            files_per_commit: Files per commit.
+            num_workers: Concurrent blob uploads.
+            private: Create the repo as private if it does not exist.
+            commit_message: Commit message (default: "Upload N files").
+
+        Returns:
+            List[str]: URIs of the uploaded files, in input order.
+        """
+        parts = parse_hf_uri(uri)
+        folder = parts.path_in_repo.strip("/")
+        if isinstance(files, Mapping):
+            pairs = [(Path(local), str(dest).lstrip("/")) for local, dest in files.items()]
+        else:
+            pairs = [(Path(local), Path(local).name) for local in files]
+        destinations: Dict[str, Path] = {}
+        for local, dest in pairs:
+            path_in_repo = f"{folder}/{dest}" if folder else dest
+            if path_in_repo in destinations:
+                raise ValueError(f"Both {destinations[path_in_repo]} and {local} map to {path_in_repo}")
+            destinations[path_in_repo] = local
+
+        self.api.create_repo(repo_id=parts.repo_id, private=private, exist_ok=True, repo_type=parts.repo_type)
+        operations = [
+            CommitOperationAdd(path_in_repo=path_in_repo, path_or_fileobj=str(local))
+            for path_in_repo, local in destinations.items()
+        ]
+        for start in range(0, len(operations), files_per_commit):
+            batch = operations[start : start + files_per_commit]
+            self.api.create_commit(
+                repo_id=parts.repo_id,
+                operations=batch,
+                commit_message=commit_message or f"Upload {len(batch)} files",
+                repo_type=parts.repo_type,
+                revision=parts.revision,
+                num_threads=num_workers,
+            )
+            logger.info(f"Committed {start + len(batch)}/{len(operations)} files to {parts.repo_id}")
+        get_repo_cache().invalidate(parts.repo_id)
+
+        prefix = "hf://" if parts.repo_type == "model" else f"hf://{parts.repo_type}s/"
+        return [f"{prefix}{parts.repo_id}/{path_in_repo}" for path_in_repo in destinations]
 
     def ls(
         self,
@@ -113,6 +282,7 @@ class HuggingfaceHybridBackend(BaseBackend):
         exts: Optional[List[str]] = None,
         relative_unix: bool = False,
         debug_print: bool = True,
+        revision: Optional[str] = None,
         **kwargs,
     ) -> List[str]:
         """List all files in the HF repo. If path_in_repo is a subfolder prefix, we can filter.
@@ -122,14 +292,10 @@ class HuggingfaceHybridBackend(BaseBackend):
         repo_id = parts.repo_id
         path_in_repo = parts.path_in_repo
         repo_type = parts.repo_type
-        try:
-            if repo_type == "model":
-                files = self.api.list_repo_files(repo_id=repo_id)
-            else:
-                files = self.api.list_repo_files(repo_id=repo_id, repo_type=repo_type)
-        except RepositoryNotFoundError:
-            logger.info(f"{uri}: is not a model repo; trying to list as dataset...")
-            files = self.api.list_repo_files(repo_id=repo_id, repo_type="dataset")
+        revision = revision or parts.revision
+        # Type detection and the file tree come from the repo cache: at most one repo_info
+        # call per TTL, and one listing per commit
+        files = get_repo_cache().list_files(self.api, repo_id, repo_type, revision)
 
         # If path_in_repo is not empty, we can filter by that prefix
         if path_in_repo:
@@ -189,11 +355,15 @@ class HuggingfaceHybridBackend(BaseBackend):
             repo_id=repo_id,
             repo_type=repo_type,
         )
+        get_repo_cache().invalidate(repo_id)
         print(f"cp {local_file_path} hf://{repo_id}/{path_in_repo}")
 
     def cp_to_local(self, hf_uri: str, local_file_path: str, revision: str = "main"):
         """Copy (download) a file from a Hugging Face repository to a local path.
         (Provided for reference; 'download()' is the simpler approach.)
+
+        The result is an independent file that is safe to modify: a reflink where the
+        filesystem supports it, otherwise a copy.
         """
         parts = parse_hf_uri(hf_uri)
         repo_id = parts.repo_id
@@ -208,7 +378,7 @@ class HuggingfaceHybridBackend(BaseBackend):
             revision=effective_revision,
             repo_type=repo_type,
         )
-        shutil.copy(cached_file_path, local_file_path)
+        _place_from_cache(cached_file_path, Path(local_file_path))
         print(f"cp {hf_uri} {local_file_path}")
 
     # You can include rm/mv/cp as well if you wish, but omitted here for brevity.
@@ -316,3 +486,4 @@ class HuggingfaceHybridBackend(BaseBackend):
             # Cleanup local file
             if os.path.exists(temp_path):
                 os.remove(temp_path)
+        get_repo_cache().invalidate(repo_id)
@@ -0,0 +1,150 @@
+# per-process and on-disk cache of Hugging Face repo types, revisions and file trees
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from huggingface_hub.errors import RepositoryNotFoundError
+
+logger = logging.getLogger(__name__)
+
+# How long a branch or tag is trusted to point at the same commit before asking the Hub again
+DEFAULT_TTL_SECONDS = 300
+_COMMIT_SHA = re.compile(r"^[0-9a-f]{40}$")
+
+
+def _safe_name(*parts: str) -> str:
+    return "--".join(part.replace("/", "--") for part in parts)
+
+
+class HfRepoCache:
+    """Cache of which type a repo is, which commit a revision points at, and its file list.
+
+    A revision resolves to a commit sha through one `repo_info` call, which also tells
+    whether a repo given without a type prefix is a model or a dataset. The resolution is
+    trusted for `ttl` seconds; file trees are keyed by commit sha and never expire, since a
+    commit's content cannot change. Everything is kept in memory and mirrored to small
+    JSON files, so other processes and later runs skip the same Hub calls.
+
+    Example:
+        >>> cache = get_repo_cache()
+        >>> repo_type, sha = cache.resolve(api, "owner/repo", "model", "main")
+        >>> files = cache.list_files(api, "owner/repo", "model", "main")
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, ttl: float = DEFAULT_TTL_SECONDS):
+        from ..utils.globals import GLOBAL_CACHE_DIR
+
+        self.cache_dir = Path(cache_dir) if cache_dir else GLOBAL_CACHE_DIR / "hf_repos"
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # (repo type as given, repo_id, revision) -> {"repo_type", "sha", "checked_at"}
+        self._revisions: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        # (repo type, repo_id, commit sha) -> file paths
+        self._trees: Dict[Tuple[str, str, str], List[str]] = {}
+
+    # --- disk ---------------------------------------------------------------------------------
+
+    def _read(self, path: Path) -> Optional[Any]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path: Path, data: Any) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename, so concurrent readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Could not write HF repo cache entry {path}: {e}")
+
+    def _revision_path(self, key: Tuple[str, str, str]) -> Path:
+        return self.cache_dir / "revisions" / f"{_safe_name(*key)}.json"
+
+    def _tree_path(self, key: Tuple[str, str, str]) -> Path:
+        return self.cache_dir / "trees" / f"{_safe_name(*key)}.json"
+
+    # --- lookups ------------------------------------------------------------------------------
+
+    def resolve(self, api: Any, repo_id: str, repo_type: str, revision: Optional[str] = None) -> Tuple[str, str]:
+        """Return the repo's actual type and the commit sha `revision` points at.
+
+        `repo_type` "model" is what URIs without a type prefix parse to, so a model repo
+        that does not exist is retried as a dataset, once per TTL rather than per call.
+
+        Raises:
+            RepositoryNotFoundError: If the repo exists under neither type.
+        """
+        revision = revision or "main"
+        key = (repo_type, repo_id, revision)
+        with self._lock:
+            entry = self._revisions.get(key) or self._read(self._revision_path(key))
+            # A commit sha never moves, so its entry does not expire
+            if entry and (_COMMIT_SHA.match(revision) or time.time() - entry["checked_at"] < self.ttl):
+                self._revisions[key] = entry
+                return entry["repo_type"], entry["sha"]
+
+        # Ask the Hub without holding the lock, so lookups of other repos are not serialized behind it;
+        # concurrent misses of the same key both ask and store the same answer
+        candidates = ["model", "dataset"] if repo_type == "model" else [repo_type]
+        for candidate in candidates:
+            try:
+                info = api.repo_info(repo_id, repo_type=candidate, revision=revision)
+                break
+            except RepositoryNotFoundError:
+                if candidate == candidates[-1]:
+                    raise
+                logger.info(f"{repo_id}: is not a model repo; trying as dataset...")
+
+        entry = {"repo_type": candidate, "sha": info.sha, "checked_at": time.time()}
+        with self._lock:
+            self._revisions[key] = entry
+            self._write(self._revision_path(key), entry)
+        return candidate, info.sha
+
+    def list_files(self, api: Any, repo_id: str, repo_type: str, revision: Optional[str] = None) -> List[str]:
+        """All file paths in the repo at `revision`, listed from the Hub once per commit."""
+        resolved_type, sha = self.resolve(api, repo_id, repo_type, revision)
+        key = (resolved_type, repo_id, sha)
+        with self._lock:
+            files = self._trees.get(key) or self._read(self._tree_path(key))
+            if files is not None:
+                self._trees[key] = files
+                return list(files)
+
+        files = api.list_repo_files(repo_id=repo_id, repo_type=resolved_type, revision=sha)
+        with self._lock:
+            self._trees[key] = files
+            self._write(self._tree_path(key), files)
+        return list(files)
+
+    def invalidate(self, repo_id: str) -> None:
+        """Forget which commits the repo's revisions point at, e.g. after pushing to it."""
+        with self._lock:
+            for key in [key for key in self._revisions if key[1] == repo_id]:
+                del self._revisions[key]
+            for repo_type in ("model", "dataset", "space"):
+                for path in (self.cache_dir / "revisions").glob(f"{_safe_name(repo_type, repo_id)}--*.json"):
+                    path.unlink(missing_ok=True)
+
+
+_default_cache: Optional[HfRepoCache] = None
+
+
+def get_repo_cache() -> HfRepoCache:
+    """Return the shared cache the HF backend uses (under `GLOBAL_CACHE_DIR / "hf_repos"`)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = HfRepoCache()
+    return _default_cache
@@ -8,7 +8,7 @@ import uuid
 import warnings
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 from urllib.request import Request, urlopen
 
@@ -269,6 +269,41 @@ class HTTPBackend(BaseBackend):
 
             raise RuntimeError(f"Failed to download {uri}: {last_error}")
 
+    def read_range(
+        self,
+        uri: str,
+        start: int = 0,
+        length: int = 65536,
+        timeout: float = 30.0,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[bytes, Optional[int]]:
+        """Read `length` bytes starting at `start` using an HTTP Range request.
+
+        Servers that ignore the Range header still only have the requested bytes read
+        from the connection before it is closed.
+
+        Args:
+            uri: HTTP/HTTPS URL to read from
+            start: First byte to read
+            length: Number of bytes to read
+
+        Returns:
+            Tuple[bytes, Optional[int]]: The bytes read and the total size of the resource, if known
+        """
+        uri = self._validate_http_uri(uri)
+        request_headers = {**(headers or {}), "Range": f"bytes={start}-{start + length - 1}"}
+        with urlopen(Request(uri, headers=request_headers), timeout=timeout) as response:
+            if response.status == 206:
+                # "bytes 0-65535/1234567"; the total may be "*" when unknown
+                total = (response.headers.get("Content-Range") or "").rpartition("/")[2]
+                return response.read(length), int(total) if total.isdigit() else None
+
+            content_length = response.headers.get("Content-Length")
+            total_size = int(content_length) if content_length and content_length.isdigit() else None
+            if start:
+                response.read(start)
+            return response.read(length), total_size
+
     def download_many(
         self,
         uris: List[str],
@@ -0,0 +1,211 @@
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set
+
+from .base_loader import BaseLoader
+from .video_loader import _import_av
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# Encoder used when saving, by suffix; other suffixes need an explicit `codec`
+_DEFAULT_CODECS = {
+    ".wav": "pcm_s16le",
+    ".flac": "flac",
+    ".mp3": "libmp3lame",
+    ".ogg": "libopus",  # Opus in Ogg; libvorbis is often missing from FFmpeg builds
+    ".opus": "libopus",
+    ".m4a": "aac",
+    ".aac": "aac",
+    ".aiff": "pcm_s16be",
+}
+
+
+class AudioLoader(BaseLoader):
+    """Load and save audio using PyAV (FFmpeg).
+
+    Audio is decoded packet by packet and resampled on the fly, so `offset`/`duration`
+    reads seek to the requested range and `chunk_duration` streams fixed-size chunks
+    without ever holding the whole file in memory. Samples are float32 in [-1, 1], shaped
+    (channels, samples), or (samples,) with `mono=True`.
+    """
+
+    SUPPORTED_LOAD_CONFIG = {
+        "sr",  # int: Resample to this rate (default: the file's rate)
+        "mono",  # bool: Downmix to one channel and return 1-D arrays
+        "offset",  # float: Start time in seconds (seeks instead of decoding up to it)
+        "duration",  # float: Seconds to read from `offset`
+        "chunk_duration",  # float: Return an iterator of chunks of this many seconds
+        "stream_index",  # int: Which audio stream to read (default 0)
+    }
+
+    SUPPORTED_SAVE_CONFIG = {
+        "sr",  # int: Sample rate of the data when it is passed as an array only
+        "codec",  # str: Encoder name (default by suffix, e.g. pcm_s16le for .wav)
+        "bit_rate",  # int: Target bit rate for lossy codecs
+    }
+
+    def load(self, file_path: Path, loader_config: Optional[Dict[str, Any]] = None) -> Any:
+        """Load audio samples.
+
+        Args:
+            file_path (Path): Path to the audio file
+            loader_config (Optional[Dict]): Configuration options for decoding
+
+        Returns:
+            Tuple[np.ndarray, int]: ``(samples, sample_rate)``, or with `chunk_duration`
+            ``(iterator of sample chunks, sample_rate)``
+        """
+        import numpy as np
+
+        av = _import_av()
+        config = loader_config or {}
+        used_keys: Set[str] = set()
+        for key in self.SUPPORTED_LOAD_CONFIG:
+            if key in config:
+                used_keys.add(key)
+
+        # Warn about unused config options
+        self._warn_unused_config(config, used_keys, "AudioLoader")
+
+        # The output rate is needed before decoding starts, so read it from the header
+        with av.open(str(file_path)) as container:
+            stream = container.streams.audio[config.get("stream_index", 0)]
+            sample_rate = config.get("sr") or stream.codec_context.sample_rate
+
+        if config.get("chunk_duration") is not None:
+            chunk_samples = max(1, round(config["chunk_duration"] * sample_rate))
+            return self._iter_chunks(str(file_path), config, sample_rate, chunk_samples), sample_rate
+
+        blocks = list(self._iter_blocks(str(file_path), config, sample_rate))
+        channels = 1 if config.get("mono", False) else stream.codec_context.channels
+        samples = np.concatenate(blocks, axis=1) if blocks else np.zeros((channels, 0), dtype=np.float32)
+        return (samples[0] if config.get("mono", False) else samples), sample_rate
+
+    def _iter_blocks(self, path: str, config: Dict[str, Any], sample_rate: int) -> Iterator["np.ndarray"]:
+        """Yield resampled (channels, n) float32 blocks covering [offset, offset + duration)."""
+        av = _import_av()
+        offset = config.get("offset") or 0.0
+        duration = config.get("duration")
+        remaining = None if duration is None else round(duration * sample_rate)
+
+        with av.open(path) as container:
+            stream = container.streams.audio[config.get("stream_index", 0)]
+            resampler = av.AudioResampler(
+                format="fltp",
+                layout="mono" if config.get("mono", False) else stream.codec_context.layout.name,
+                rate=sample_rate,
+            )
+            if offset:
+                container.seek(int(offset / stream.time_base), stream=stream, backward=True)
+
+            # Samples to drop before `offset`: seeking lands on a packet at or before it
+            skip = None
+            for frame in self._decode_resampled(container, stream, resampler):
+                if skip is None:
+                    start = frame.time if frame.time is not None else offset
+                    skip = max(0, round((offset - start) * sample_rate))
+                block = frame.to_ndarray()
+                if skip:
+                    dropped = min(skip, block.shape[1])
+                    block, skip = block[:, dropped:], skip - dropped
+                if remaining is not None:
+                    block = block[:, :remaining]
+                    remaining -= block.shape[1]
+                if block.shape[1]:
+                    yield block
+                if remaining is not None and remaining <= 0:
+                    return
+
+    @staticmethod
+    def _decode_resampled(container, stream, resampler) -> Iterator[Any]:
+        for frame in container.decode(stream):
+            yield from resampler.resample(frame)
+        yield from resampler.resample(None)
+
+    def _iter_chunks(
+        self, path: str, config: Dict[str, Any], sample_rate: int, chunk_samples: int
+    ) -> Iterator["np.ndarray"]:
+        """Regroup decoded blocks into chunks of exactly `chunk_samples` (the last may be shorter)."""
+        import numpy as np
+
+        pending: List["np.ndarray"] = []
+        pending_samples = 0
+        mono = config.get("mono", False)
+        for block in self._iter_blocks(path, config, sample_rate):
+            pending.append(block)
+            pending_samples += block.shape[1]
+            if pending_samples < chunk_samples:
+                continue
+            buffered = np.concatenate(pending, axis=1)
+            full = buffered.shape[1] - buffered.shape[1] % chunk_samples
+            for start in range(0, full, chunk_samples):
+                chunk = buffered[:, start : start + chunk_samples]
+                yield chunk[0] if mono else chunk
+            pending = [buffered[:, full:]]
+            pending_samples = buffered.shape[1] - full
+        if pending_samples:
+            chunk = np.concatenate(pending, axis=1)
+            yield chunk[0] if mono else chunk
+
+    def save(self, file_path: Path, data: Any, loader_config: Optional[Dict[str, Any]] = None) -> None:
+        """Encode audio samples to a file.
+
+        Args:
+            file_path (Path): Path to save to; the container and default codec follow the suffix
+            data (Any): ``(samples, sample_rate)``, or a samples array together with `sr`.
+                Samples are float in [-1, 1] (or int16), shaped (samples,) or (channels, samples)
+            loader_config (Optional[Dict]): Encoder configuration options
+        """
+        import numpy as np
+
+        av = _import_av()
+        config = loader_config or {}
+        used_keys: Set[str] = set()
+        for key in self.SUPPORTED_SAVE_CONFIG:
+            if key in config:
+                used_keys.add(key)
+
+        # Warn about unused config options
+        self._warn_unused_config(config, used_keys, "AudioLoader")
+
+        if isinstance(data, tuple):
+            samples, sample_rate = data
+        else:
+            samples, sample_rate = data, config.get("sr")
+        if not sample_rate:
+            raise ValueError("Pass the sample rate as (samples, sr) or with sr=...")
+        samples = np.asarray(samples)
+        if samples.dtype == np.int16:
+            samples = samples.astype(np.float32) / 32768
+        samples = np.ascontiguousarray(np.atleast_2d(samples), dtype=np.float32)
+
+        suffix = Path(file_path).suffix.lower()
+        codec = config.get("codec") or _DEFAULT_CODECS.get(suffix)
+        if codec is None:
+            raise ValueError(f"No default audio codec for '{suffix}'; pass codec=...")
+        layout = "mono" if samples.shape[0] == 1 else "stereo" if samples.shape[0] == 2 else None
+        if layout is None:
+            raise ValueError(f"Expected 1 or 2 channels, got {samples.shape[0]}")
+
+        with av.open(str(file_path), mode="w") as container:
+            stream = container.add_stream(codec, rate=int(sample_rate))
+            stream.layout = layout
+            if "bit_rate" in config:
+                stream.bit_rate = config["bit_rate"]
+            stream.codec_context.open()
+            # Converts to the encoder's sample format and, for codecs with fixed frame
+            # sizes (mp3, aac, opus, vorbis), regroups samples into frames of that size
+            resampler = av.AudioResampler(
+                format=stream.codec_context.format.name,
+                layout=layout,
+                rate=int(sample_rate),
+                frame_size=stream.codec_context.frame_size or None,
+            )
+            frame = av.AudioFrame.from_ndarray(samples, format="fltp", layout=layout)
+            frame.sample_rate = int(sample_rate)
+            for resampled in [*resampler.resample(frame), *resampler.resample(None)]:
+                for packet in stream.encode(resampled):
+                    container.mux(packet)
+            for packet in stream.encode():
+                container.mux(packet)
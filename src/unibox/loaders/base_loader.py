@@ -1,11 +1,180 @@
 """basic loader class"""
 
 # base_loader.py
+import gc
+import mmap
+import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """Pause the cyclic garbage collector while bulk-creating objects.
+
+    Parsers like orjson allocate millions of acyclic containers, which otherwise trigger
+    repeated, useless full-heap collections.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+class MmapReader:
+    """Read-only, memory-mapped view over a local file.
+
+    Hands out zero-copy ``memoryview`` slices that parsers such as ``orjson`` accept
+    directly, so large files are not copied into Python ``bytes`` before parsing.
+    Views are only guaranteed to be valid inside the ``with`` block.
+
+    Example:
+        >>> with MmapReader("data.jsonl") as reader:
+        ...     for line in reader.iter_lines():
+        ...         record = orjson.loads(line)
+    """
+
+    def __init__(self, file_path: Union[str, Path]):
+        self.file_path = Path(file_path)
+        self._mmap: Optional[mmap.mmap] = None
+        self._buffer: Optional[memoryview] = None
+        self._size = 0
+
+    def __enter__(self) -> "MmapReader":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def open(self) -> None:
+        """Map the file into memory. Empty files are represented by an empty buffer."""
+        with open(self.file_path, "rb") as f:
+            self._size = os.fstat(f.fileno()).st_size
+            # mmap refuses zero-length files; the mapping keeps its own handle, so `f` can be closed
+            if self._size:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._buffer = memoryview(self._mmap)
+            else:
+                self._buffer = memoryview(b"")
+
+    def close(self) -> None:
+        """Release the mapping.
+
+        If a caller still holds a view, the mapping is released once that view is garbage collected.
+        """
+        if self._buffer is not None:
+            self._buffer.release()
+            self._buffer = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+            self._mmap = None
+
+    @property
+    def buffer(self) -> memoryview:
+        """The whole file as a read-only ``memoryview``."""
+        if self._buffer is None:
+            raise ValueError(f"MmapReader for {self.file_path} is not open")
+        return self._buffer
+
+    def view(self, start: int = 0, end: Optional[int] = None) -> memoryview:
+        """Return a zero-copy view of bytes ``[start, end)``."""
+        return self.buffer[start:end]
+
+    def find(self, sub: bytes, start: int = 0, end: Optional[int] = None) -> int:
+        """Find `sub` in ``[start, end)`` without copying; returns -1 if absent."""
+        if self._mmap is None:
+            return -1
+        return self._mmap.find(sub, start, self._size if end is None else end)
+
+    def iter_line_ranges(self, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+        """Yield ``(line_start, line_end)`` byte offsets for each line in ``[start, end)``.
+
+        `line_end` includes the trailing newline. Like iterating over a file object, no empty
+        line is produced after a final newline.
+        """
+        if self._mmap is None:
+            return
+        end = self._size if end is None else end
+        # The C-level search, bound once: it runs once per line
+        find = self._mmap.find
+        pos = start
+        while pos < end:
+            newline = find(b"\n", pos, end)
+            line_end = end if newline == -1 else newline + 1
+            yield pos, line_end
+            pos = line_end
+
+    def iter_lines(self, start: int = 0, end: Optional[int] = None) -> Iterator[memoryview]:
+        """Yield each line in ``[start, end)`` as a zero-copy ``memoryview`` (newline included)."""
+        buffer = self.buffer
+        for line_start, line_end in self.iter_line_ranges(start, end):
+            yield buffer[line_start:line_end]
+
+    def iter_line_bytes(self, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """Yield each line in ``[start, end)`` as ``bytes`` (newline included).
+
+        Uses the mapping's C-level ``readline``, which beats slicing views for short lines such as
+        JSONL records. Each line is a small, transient copy; the file itself is never copied whole.
+        """
+        if self._mmap is None:
+            return
+        end = self._size if end is None else end
+        readline = self._mmap.readline
+        tell = self._mmap.tell
+        self._mmap.seek(start)
+        while tell() < end:
+            line = readline()
+            overshoot = tell() - end
+            yield line[:-overshoot] if overshoot > 0 else line
+
+    def split_ranges(self, num_chunks: int) -> List[Tuple[int, int]]:
+        """Split the file into up to `num_chunks` byte ranges aligned to line boundaries.
+
+        Every range starts at the beginning of a line and ends just after a newline (or at EOF),
+        so the ranges can be parsed independently, e.g. by separate worker processes.
+        """
+        if self._size == 0:
+            return []
+        num_chunks = max(1, min(num_chunks, self._size))
+        target = self._size // num_chunks
+
+        ranges = []
+        start = 0
+        for i in range(1, num_chunks):
+            boundary = self.find(b"\n", max(start, i * target))
+            if boundary == -1:
+                break
+            end = boundary + 1
+            if end > start:
+                ranges.append((start, end))
+                start = end
+            if start >= self._size:
+                break
+        if start < self._size:
+            ranges.append((start, self._size))
+        return ranges
 
 
 class BaseLoader:
+    # Whether `compression` in the load/save config means whole-file compression (gzip, zstd, ...)
+    # that the loader streams itself, rather than e.g. a codec inside the file format
+    HANDLES_FILE_COMPRESSION = False
+    # How concurrent_loads parallelizes this loader: "thread" when loading is I/O bound, releases
+    # the GIL, or is fast enough that pickling results between processes would dominate;
+    # "process" for slow pure-Python parsers
+    PREFERRED_EXECUTOR = "thread"
+
     def load(self, local_path: Union[str, Path], loader_config: Optional[Dict] = None) -> Any:
         """Load data from the given path with optional loader-specific configuration.
 
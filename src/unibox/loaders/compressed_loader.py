@@ -0,0 +1,92 @@
+# compressed_loader.py
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from ..utils.compression import open_compressed
+from .base_loader import BaseLoader
+
+# Chunk size used when streaming between compressed and plain files
+COPY_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+class CompressedLoader(BaseLoader):
+    """Wrap another loader to read and write compressed files such as `data.jsonl.zst`.
+
+    Loaders that set `HANDLES_FILE_COMPRESSION` (e.g. JSONL, CSV) stream
+    the compressed file directly. For the rest, the file is stream-decompressed into a
+    temporary file in the global temp dir and handed to the inner loader, and saves
+    are written plain and then stream-compressed into place.
+    """
+
+    def __init__(self, inner: BaseLoader, compression: str):
+        super().__init__()
+        self.inner = inner
+        self.compression = compression
+        self.SUPPORTED_LOAD_CONFIG: Set[str] = getattr(inner, "SUPPORTED_LOAD_CONFIG", set())
+        self.SUPPORTED_SAVE_CONFIG: Set[str] = getattr(inner, "SUPPORTED_SAVE_CONFIG", set())
+        self.PREFERRED_EXECUTOR = inner.PREFERRED_EXECUTOR
+
+    def __repr__(self) -> str:
+        return f"CompressedLoader({type(self.inner).__name__}, compression={self.compression!r})"
+
+    def _temp_path(self, file_path: Path) -> Path:
+        from ..utils.globals import GLOBAL_TMP_DIR
+
+        # Keep the inner suffix (".csv", ".parquet", ...) for loaders that dispatch on it
+        fd, temp_path = tempfile.mkstemp(dir=GLOBAL_TMP_DIR, suffix=f"_{Path(file_path).stem}")
+        os.close(fd)
+        return Path(temp_path)
+
+    def load(self, file_path: Path, loader_config: Optional[Dict[str, Any]] = None) -> Any:
+        """Load a compressed file through the inner loader.
+
+        Args:
+            file_path (Path): Path to the compressed file
+            loader_config (Optional[Dict]): Configuration options for the inner loader
+
+        Returns:
+            Any: Whatever the inner loader returns
+        """
+        config = dict(loader_config or {})
+        if self.inner.HANDLES_FILE_COMPRESSION:
+            config.setdefault("compression", self.compression)
+            return self.inner.load(file_path, loader_config=config)
+
+        temp_path = self._temp_path(file_path)
+        try:
+            with open_compressed(file_path, "rb", self.compression) as src, open(temp_path, "wb") as dst:
+                shutil.copyfileobj(src, dst, COPY_CHUNK_BYTES)
+            return self.inner.load(temp_path, loader_config=config)
+        finally:
+            try:
+                temp_path.unlink()
+            except OSError:
+                # e.g. Windows, when the inner loader keeps a lazy handle open (PIL images)
+                pass
+
+    def save(self, file_path: Path, data: Any, loader_config: Optional[Dict[str, Any]] = None) -> None:
+        """Save data through the inner loader and compress the result.
+
+        Args:
+            file_path (Path): Where to save the compressed file
+            data (Any): Data to save
+            loader_config (Optional[Dict]): Configuration options for the inner loader;
+                `compression_level` is honored for every codec.
+        """
+        config = dict(loader_config or {})
+        if self.inner.HANDLES_FILE_COMPRESSION:
+            config.setdefault("compression", self.compression)
+            self.inner.save(file_path, data, loader_config=config)
+            return
+
+        level = config.pop("compression_level", None)
+        temp_path = self._temp_path(file_path)
+        try:
+            self.inner.save(temp_path, data, loader_config=config)
+            with open(temp_path, "rb") as src, open_compressed(file_path, "wb", self.compression, level=level) as dst:
+                shutil.copyfileobj(src, dst, COPY_CHUNK_BYTES)
+        finally:
+            temp_path.unlink(missing_ok=True)
@@ -10,6 +10,8 @@ from .base_loader import BaseLoader
 class CSVLoader(BaseLoader):
     """Load and save CSV files using pandas."""
 
+    HANDLES_FILE_COMPRESSION = True
+
     SUPPORTED_LOAD_CONFIG = {
         "sep",  # str: Delimiter to use
         "header",  # int, list[int]: Row number(s) to use as column names
@@ -18,6 +20,7 @@ class CSVLoader(BaseLoader):
         "dtype",  # dict: Column dtypes
         "na_values",  # scalar, list, dict: Additional NA/NaN strings
         "nrows",  # int: Number of rows to read
+        "compression",  # str or dict: Compression of the file ('infer' from the suffix by default)
     }
 
     SUPPORTED_SAVE_CONFIG = {
@@ -27,6 +30,7 @@ class CSVLoader(BaseLoader):
         "header",  # bool: Whether to write column names
         "na_rep",  # str: Missing data representation
         "float_format",  # str: Format string for float values
+        "compression",  # str or dict: Output compression ('infer' from the suffix by default)
     }
 
     def load(self, file_path: Path, loader_config: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
@@ -74,6 +78,10 @@ class CSVLoader(BaseLoader):
                 kwargs[key] = config[key]
                 used_keys.add(key)
 
+        # Compress zstd output on all cores
+        if kwargs.get("compression") == "zstd":
+            kwargs["compression"] = {"method": "zstd", "threads": -1}
+
         # Warn about unused config options
         self._warn_unused_config(config, used_keys, "CSVLoader")
 
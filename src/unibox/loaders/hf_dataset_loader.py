@@ -1,18 +1,44 @@
+import fnmatch
 import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import wraps
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Union
+from urllib.parse import quote
 
 import pandas as pd
 from datasets import Dataset, DatasetDict, Image as DSImage, load_dataset
+from datasets.table import InMemoryTable
 
-from unibox.utils.df_utils import coerce_json_like_to_df, generate_dataset_summary
+from unibox.utils.arrow_summary import generate_arrow_dataset_summary
+from unibox.utils.df_utils import coerce_json_like_to_df
 from unibox.utils.utils import parse_hf_uri
 
 from ..backends.hf_hybrid_backend import HuggingfaceHybridBackend
+from ..backends.hf_repo_cache import get_repo_cache
 from .base_loader import BaseLoader
+from .hf_shard_upload import DEFAULT_COMMIT_EVERY, DEFAULT_UPLOAD_WORKERS, push_parquet_shards
+
+if TYPE_CHECKING:
+    import pyarrow as pa
 
 logger = logging.getLogger(__name__)
 
+# Upper bound for the default num_proc; more processes rarely help download/prepare
+MAX_DEFAULT_NUM_PROC = 8
+# Rows per batch when a streamed dataset is read as DataFrames
+DEFAULT_STREAMING_BATCH_SIZE = 10_000
+
+
+def default_num_proc() -> Optional[int]:
+    """Processes for download/prepare: the usable cores, capped; None (no pool) on one core."""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1
+    num_proc = min(MAX_DEFAULT_NUM_PROC, cores)
+    return num_proc if num_proc > 1 else None
+
 
 class HFDatasetLoader(BaseLoader):
     """Loader for HuggingFace datasets using the datasets library.
@@ -28,12 +54,15 @@ class HFDatasetLoader(BaseLoader):
         "cache_dir",  # str: Where to cache the dataset
         "streaming",  # bool: Whether to stream the dataset
         "num_proc",  # int: Number of processes for loading
+        "batch_size",  # int: With streaming, yield batches of this many rows
+        "data_files",  # str or List[str]: Glob(s) over the repo's parquet files to read, e.g. 'data/train-0000*'
+        "columns",  # List[str]: Columns to read
+        "filters",  # pyarrow filters (DNF list or Expression): Rows to keep, pruned by row group statistics
     }
 
     def __init__(self):
         super().__init__()
         self.hf_api_backend = HuggingfaceHybridBackend()
-        self._max_rows_for_df_summary = 200_000
 
     def _install_hf_xet_session_downloader(self) -> None:
         """Use the non-deprecated hf_xet session API when Hugging Face Hub has not adopted it yet."""
@@ -193,14 +222,22 @@ class HFDatasetLoader(BaseLoader):
                 to_pandas (bool): Whether to convert to pandas DataFrame
                 name (str): Dataset name/configuration
                 cache_dir (str): Where to cache the dataset
-                streaming (bool): Whether to stream the dataset
-                num_proc (int): Number of processes for loading
+                streaming (bool): Whether to stream the dataset instead of downloading it
+                num_proc (int): Number of processes for loading (default: usable cores, up to 8)
+                batch_size (int): With streaming, return an iterator of batches of this many rows
+                data_files (Union[str, List[str]]): Globs selecting parquet shards by path in repo
+                columns (List[str]): Columns to read
+                filters (Any): pyarrow filters, e.g. [("score", ">", 0.5)]
 
         Returns:
-            Union[Dataset, Dict[str, Dataset], pd.DataFrame]: The loaded dataset
+            Union[Dataset, Dict[str, Dataset], pd.DataFrame, IterableDataset, Iterator]: The loaded dataset
+                If streaming=True, returns an IterableDataset; with batch_size, an iterator
+                of dict batches; with to_pandas, an iterator of DataFrames
                 If to_pandas=True, returns DataFrame
                 If split is specified, returns Dataset
                 Otherwise returns Dict[split_name, Dataset]
+                The commit sha the revision resolved to is stored in `df.attrs["hf_revision"]`
+                for DataFrames and in a `hf_revision` attribute for datasets
         """
         if not loader_config:
             loader_config = {}
@@ -210,15 +247,131 @@ class HFDatasetLoader(BaseLoader):
         repo_id = parts.repo_id
         split = loader_config.get("split", "train")
         revision = loader_config.get("revision") or parts.revision or "main"
-        # num_proc = loader_config.get("num_proc", 8)
-        num_proc = 8
+        # Read at a fixed commit, so every file of this load (and the datasets cache) is keyed
+        # on immutable content even if the branch moves meanwhile
+        commit = self._pin_revision(repo_id, revision)
+        revision = commit or revision
+        streaming = loader_config.get("streaming", False)
+        dataset_kwargs = {
+            "name": loader_config.get("name"),
+            "split": split,
+            "revision": revision,
+            "cache_dir": loader_config.get("cache_dir"),
+        }
+
+        selection = {key: loader_config[key] for key in ("data_files", "columns", "filters") if loader_config.get(key)}
 
         self._install_hf_xet_session_downloader()
-        dataset = load_dataset(repo_id, split=split, revision=revision, num_proc=num_proc)
+        if streaming:
+            # Rows are fetched lazily from the Hub as the dataset is iterated; nothing is downloaded up front
+            dataset = load_dataset(repo_id, streaming=True, **dataset_kwargs, **selection)
+            batch_size = loader_config.get("batch_size")
+            if to_pandas:
+                return self._iter_dataframes(dataset, batch_size or DEFAULT_STREAMING_BATCH_SIZE, commit)
+            if batch_size:
+                return dataset.iter(batch_size=batch_size)
+            return self._tag_revision(dataset, commit)
+
+        if selection:
+            table = self._read_parquet_shards(repo_id, revision, split, loader_config.get("name"), **selection)
+            if to_pandas:
+                return self._tag_revision(table.to_pandas(), commit)
+            return self._tag_revision(Dataset(InMemoryTable(table)), commit)
+
+        num_proc = loader_config.get("num_proc", default_num_proc())
+        dataset = load_dataset(repo_id, num_proc=num_proc, **dataset_kwargs)
 
         if to_pandas:
-            return dataset.to_pandas()
-        return dataset
+            return self._tag_revision(dataset.to_pandas(), commit)
+        return self._tag_revision(dataset, commit)
+
+    def _pin_revision(self, repo_id: str, revision: str) -> Optional[str]:
+        """Commit sha of `revision`, or None when it cannot be resolved (e.g. offline mode)."""
+        try:
+            return self.hf_api_backend.resolve_revision(f"hf://datasets/{repo_id}", revision)
+        except Exception as e:
+            logger.info(f"Could not resolve {repo_id}@{revision} to a commit; loading it unpinned: {e}")
+            return None
+
+    @staticmethod
+    def _tag_revision(result: Any, commit: Optional[str]) -> Any:
+        """Record the commit a result was read at, in `df.attrs["hf_revision"]` or `result.hf_revision`."""
+        if commit is not None:
+            if isinstance(result, pd.DataFrame):
+                result.attrs["hf_revision"] = commit
+            else:
+                result.hf_revision = commit
+        return result
+
+    @staticmethod
+    def _select_parquet_files(
+        files: List[str],
+        split: Optional[str],
+        name: Optional[str] = None,
+        data_files: Optional[Union[str, List[str]]] = None,
+    ) -> List[str]:
+        """Pick the parquet shards to read from the repo's file list (paths relative to the repo).
+
+        With `data_files`, shards matching any of the globs are used as-is. Otherwise shards
+        are matched to the split by the usual Hub layouts: ``data/{split}-00000-of-00010.parquet``
+        (push_to_hub) and ``{config}/{split}/0000.parquet`` (parquet conversion).
+        """
+        files = sorted(f for f in files if f.endswith(".parquet"))
+        if data_files:
+            patterns = [data_files] if isinstance(data_files, str) else list(data_files)
+            selected = [f for f in files if any(fnmatch.fnmatchcase(f, pattern) for pattern in patterns)]
+            if not selected:
+                raise ValueError(f"No parquet files match {patterns}")
+            return selected
+
+        def in_split(path: str) -> bool:
+            *dirs, filename = path.split("/")
+            if name and name not in dirs:
+                return False
+            return not split or split in dirs or filename.startswith((f"{split}-", f"{split}.", f"{split}_"))
+
+        selected = [f for f in files if in_split(f)]
+        if not selected:
+            raise ValueError(
+                f"No parquet files found for split={split!r}, name={name!r}; pass data_files to choose shards "
+                f"(available: {files[:5]}{'...' if len(files) > 5 else ''})",
+            )
+        return selected
+
+    def _read_parquet_shards(
+        self,
+        repo_id: str,
+        revision: str,
+        split: Optional[str],
+        name: Optional[str] = None,
+        data_files: Optional[Union[str, List[str]]] = None,
+        columns: Optional[List[str]] = None,
+        filters: Any = None,
+    ) -> "pa.Table":
+        """Read selected shards, columns and rows of a dataset straight from its parquet files.
+
+        Files are opened through `HfFileSystem`, so pyarrow only fetches the footers and the
+        byte ranges of the requested columns, and skips row groups whose statistics rule
+        out `filters`. Nothing is written to the datasets cache.
+        """
+        import pyarrow.parquet as pq
+        from huggingface_hub import HfFileSystem
+
+        listed = self.hf_api_backend.ls(
+            f"hf://datasets/{repo_id}", exts=[".parquet"], relative_unix=True, debug_print=False, revision=revision
+        )
+        files = self._select_parquet_files(listed, split, name, data_files)
+        logger.info(f"Reading {len(files)} parquet file(s) from {repo_id}@{revision}")
+
+        # Revisions such as refs/convert/parquet must be URL-encoded in HfFileSystem paths
+        paths = [f"datasets/{repo_id}@{quote(revision, safe='')}/{f}" for f in files]
+        dataset = pq.ParquetDataset(paths, filesystem=HfFileSystem(), filters=filters)
+        return dataset.read(columns=columns)
+
+    @staticmethod
+    def _iter_dataframes(dataset: Any, batch_size: int, commit: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        for batch in dataset.iter(batch_size=batch_size):
+            yield HFDatasetLoader._tag_revision(pd.DataFrame(batch), commit)
 
     def save(self, hf_uri: str, data: Any, loader_config: Optional[Dict] = None) -> None:
         """Save data as a HuggingFace dataset to a local path.
@@ -227,6 +380,14 @@ class HFDatasetLoader(BaseLoader):
             local_path (Union[str, Path]): Local path to save dataset
             data (Union[Dataset, pd.DataFrame]): Dataset to save
             loader_config (Optional[Dict]): Configuration options
+                split (str): Split name for a single Dataset/DataFrame (default: train)
+                private (bool): Create the repo as private (default: True)
+                shard_rows (int): Write parquet shards of this many rows and upload them in
+                    parallel, resumably (see `push_parquet_shards`); default is one push_to_hub per split
+                upload_workers (int): With shard_rows, concurrent shard writes/uploads (default: 8)
+                commit_every (int): With shard_rows, shards per commit (default: 50)
+                resume (bool): With shard_rows, skip shards already uploaded by an earlier run (default: True)
+                revision (str): With shard_rows, branch to commit to (default: main)
         """
         # Parse configs
         parts = parse_hf_uri(hf_uri)
@@ -236,13 +397,12 @@ class HFDatasetLoader(BaseLoader):
 
         dataset_split = loader_config.get("split", "train")
         is_private = loader_config.get("private", True)
+        shard_rows = loader_config.get("shard_rows")
         dict_key_column = loader_config.get("dict_key_column")
         value_column = loader_config.get("value_column")
         flatten_sep = loader_config.get("flatten_sep")
         max_depth = loader_config.get("max_depth")
 
-        readme_text = None  # if not a dataframe, we don't generate a readme update
-
         # Convert JSON-like input to DataFrame if needed
         if isinstance(data, (dict, list, tuple)):
             try:
@@ -258,35 +418,37 @@ class HFDatasetLoader(BaseLoader):
                     f"Cannot convert JSON-like input to DataFrame for HF dataset save: {e}",
                 ) from e
 
-        # Convert DataFrame to Dataset if needed and prepare README
-        if isinstance(data, pd.DataFrame):
-            if "__index_level_0__" in data.columns:
-                data.drop(columns=["__index_level_0__"], inplace=True)
-            try:
-                readme_text = generate_dataset_summary(data, repo_id)
-            except Exception as e:
-                logger.warning(f"Failed to generate dataset summary for {hf_uri}: {e}")
-                readme_text = None
-            data = Dataset.from_pandas(data)
-        elif isinstance(data, Dataset):
-            try:
-                readme_text = self._generate_hf_readme_for_datasets(repo_id, data)
-            except Exception as e:
-                logger.warning(f"Failed to generate dataset card for {hf_uri}: {e}")
-                readme_text = None
-        elif isinstance(data, DatasetDict):
-            try:
-                readme_text = self._generate_hf_readme_for_datasets(repo_id, data)
-            except Exception as e:
-                logger.warning(f"Failed to generate dataset card for {hf_uri}: {e}")
-                readme_text = None
-        else:
+        if not isinstance(data, (pd.DataFrame, Dataset, DatasetDict)):
             raise ValueError("Data must be a pandas DataFrame, datasets.Dataset, or datasets.DatasetDict")
+        if isinstance(data, pd.DataFrame) and "__index_level_0__" in data.columns:
+            data.drop(columns=["__index_level_0__"], inplace=True)
+
+        # The dataset card is computed from Arrow batches in the background while the data uploads
+        readme_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="unibox-readme")
+        readme_future: Future = readme_executor.submit(self._generate_hf_readme_for_datasets, repo_id, data)
+        readme_executor.shutdown(wait=False)
+
+        if isinstance(data, pd.DataFrame) and not shard_rows:
+            data = Dataset.from_pandas(data)
 
         # Save to Hugging Face Hub
         self._install_hf_xet_upload_progress_finalizer()
         try:
-            if isinstance(data, DatasetDict):
+            if shard_rows:
+                splits = dict(data.items()) if isinstance(data, DatasetDict) else {dataset_split: data}
+                uploaded = push_parquet_shards(
+                    self.hf_api_backend.api,
+                    repo_id,
+                    splits,
+                    shard_rows=shard_rows,
+                    private=is_private,
+                    upload_workers=loader_config.get("upload_workers", DEFAULT_UPLOAD_WORKERS),
+                    commit_every=loader_config.get("commit_every", DEFAULT_COMMIT_EVERY),
+                    resume=loader_config.get("resume", True),
+                    revision=loader_config.get("revision") or parts.revision or "main",
+                )
+                logger.debug(f"Uploaded {uploaded} shard(s) to {hf_uri}")
+            elif isinstance(data, DatasetDict):
                 for split_name, split_ds in data.items():
                     split_to_use = split_name
                     try:
@@ -309,8 +471,16 @@ class HFDatasetLoader(BaseLoader):
         except Exception as e:
             logger.error(f"Failed to save dataset to {hf_uri}: {e}")
             raise
+        finally:
+            # Cached revision -> commit mappings of this repo are stale now
+            get_repo_cache().invalidate(repo_id)
 
         # Update the README if needed
+        try:
+            readme_text = readme_future.result()
+        except Exception as e:
+            logger.warning(f"Failed to generate dataset card for {hf_uri}: {e}")
+            readme_text = None
         if readme_text:
             try:
                 self.hf_api_backend.update_readme(repo_id, readme_text, repo_type="dataset")
@@ -319,34 +489,19 @@ class HFDatasetLoader(BaseLoader):
                 logger.warning(f"Failed to update README for dataset {hf_uri}: {e}")
                 # Non-fatal
 
-    def _generate_hf_readme_for_datasets(self, repo_id: str, data: Any) -> str:
-        """Generate a dataset card for Dataset or DatasetDict.
+    def _generate_hf_readme_for_datasets(self, repo_id: str, data: Any) -> Optional[str]:
+        """Generate a dataset card for a DataFrame, Dataset or DatasetDict.
 
         Preference order:
-        - If total rows <= threshold, convert to pandas and call generate_dataset_summary (nicer, exact)
+        - Statistics accumulated over Arrow record batches (no pandas copy of the data)
         - Otherwise, fall back to a lightweight summary based on features and row counts
         """
-        # 1) Try DataFrame-based summary if small enough
+        # 1) Full summary from Arrow batches
         try:
-            if isinstance(data, Dataset):
-                num_rows = getattr(data, "num_rows", None) or len(data)
-                if num_rows <= self._max_rows_for_df_summary:
-                    df = data.to_pandas()
-                    return generate_dataset_summary(df, repo_id)
-            elif isinstance(data, DatasetDict):
-                # Sum total rows across splits
-                total_rows = 0
-                for split_ds in data.values():
-                    total_rows += getattr(split_ds, "num_rows", None) or len(split_ds)
-                if total_rows <= self._max_rows_for_df_summary:
-                    dfs = []
-                    for split_name, split_ds in data.items():
-                        split_df = split_ds.to_pandas()
-                        split_df["split"] = split_name
-                        dfs.append(split_df)
-                    combined_df = pd.concat(dfs, ignore_index=True)
-                    return generate_dataset_summary(combined_df, repo_id)
+            return generate_arrow_dataset_summary(data, repo_id)
         except Exception as e:
+            if isinstance(data, pd.DataFrame):
+                raise
             logger.warning(f"Falling back to lightweight README generation for {repo_id}: {e}")
 
         # 2) Lightweight summary fallback (no full DF conversion)
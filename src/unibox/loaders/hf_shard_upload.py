@@ -0,0 +1,239 @@
+# resumable, sharded parquet uploads of dataset splits to the Hugging Face Hub
+
+import hashlib
+import json
+import logging
+import math
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_UPLOAD_WORKERS = 8
+# Shards per commit: bounds local staging space and the work lost if a commit fails
+DEFAULT_COMMIT_EVERY = 50
+READ_CHUNK_BYTES = 1024 * 1024
+
+
+def shard_path(split: str, index: int, num_shards: int) -> str:
+    """Path in repo of one shard, in the layout `push_to_hub` uses and `load_dataset` detects."""
+    return f"data/{split}-{index:05d}-of-{num_shards:05d}.parquet"
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UploadJournal:
+    """Append-only record of the shards already committed to a repo branch.
+
+    Each line holds a shard's path in repo and the sha256 of its content. A rerun that
+    produces a byte-identical shard at the same path skips uploading it, provided the
+    path is still in the repo.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._done: Dict[str, str] = {}
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line from an interrupted run
+                    self._done[entry["path"]] = entry["sha256"]
+
+    def is_done(self, path_in_repo: str, sha256: str) -> bool:
+        return self._done.get(path_in_repo) == sha256
+
+    def record(self, entries: List[Tuple[str, str]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for path_in_repo, sha256 in entries:
+                f.write(json.dumps({"path": path_in_repo, "sha256": sha256}) + "\n")
+                self._done[path_in_repo] = sha256
+            f.flush()
+            os.fsync(f.fileno())
+
+    def clear(self) -> None:
+        self._done.clear()
+        self.path.unlink(missing_ok=True)
+
+
+def default_journal_path(repo_id: str, revision: str = "main") -> Path:
+    from ..utils.globals import GLOBAL_CACHE_DIR
+
+    name = f"{repo_id.replace('/', '--')}@{revision.replace('/', '--')}.jsonl"
+    return GLOBAL_CACHE_DIR / "hf_uploads" / name
+
+
+def list_remote_files(api: Any, repo_id: str, revision: str = "main") -> Dict[str, Optional[str]]:
+    """Path -> LFS sha256 (None for files not stored in LFS) of every file in a dataset repo."""
+    from huggingface_hub.errors import RepositoryNotFoundError, RevisionNotFoundError
+    from huggingface_hub.hf_api import RepoFile
+
+    try:
+        entries = api.list_repo_tree(repo_id, recursive=True, revision=revision, repo_type="dataset")
+        return {
+            entry.path: entry.lfs.sha256 if entry.lfs else None for entry in entries if isinstance(entry, RepoFile)
+        }
+    except (RepositoryNotFoundError, RevisionNotFoundError):
+        return {}
+
+
+def _to_arrow(data: Any) -> Tuple[Any, int]:
+    """(sliceable table, number of rows) for a DataFrame or datasets.Dataset, without copying a Dataset."""
+    import pyarrow as pa
+
+    if isinstance(data, pd.DataFrame):
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        return table, table.num_rows
+    # Dataset: the arrow format slices its (memory-mapped) table and respects select/shuffle indices
+    return data.with_format("arrow"), data.num_rows
+
+
+def _plan_shards(splits: Dict[str, Any], shard_rows: int) -> Iterator[Tuple[str, Any, int, int]]:
+    """Yield (path_in_repo, table, start, stop) for every shard of every split."""
+    for split, data in splits.items():
+        table, num_rows = _to_arrow(data)
+        num_shards = max(1, math.ceil(num_rows / shard_rows))
+        for i in range(num_shards):
+            start = i * shard_rows
+            yield shard_path(split, i, num_shards), table, start, min(start + shard_rows, num_rows)
+
+
+def _write_shard(table: Any, start: int, stop: int, local_path: Path) -> str:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    local_path.parent.mkdir(parents=True, exist_ok=True)
+    shard = table.slice(start, stop - start) if isinstance(table, pa.Table) else table[start:stop]
+    pq.write_table(shard, local_path)
+    return _sha256(local_path)
+
+
+def push_parquet_shards(
+    api: Any,
+    repo_id: str,
+    splits: Dict[str, Any],
+    shard_rows: int,
+    private: bool = True,
+    upload_workers: int = DEFAULT_UPLOAD_WORKERS,
+    commit_every: int = DEFAULT_COMMIT_EVERY,
+    resume: bool = True,
+    journal_path: Optional[Path] = None,
+    existing_files: Optional[Dict[str, Optional[str]]] = None,
+    revision: str = "main",
+) -> int:
+    """Write splits as parquet shards and upload them in parallel, batched into a few commits.
+
+    Shards are written locally by a thread pool (pyarrow releases the GIL), their blobs are
+    uploaded concurrently with `preupload_lfs_files`, and every `commit_every` shards are
+    committed together. Rerunning after a failure skips shards that are already on the Hub
+    with identical content: a shard is skipped when its path is in the repo and the file's
+    LFS sha256 matches, or, for files without LFS metadata, when the `UploadJournal` of
+    committed shards records the same hash. Shards of the saved splits left over from an
+    earlier, differently sharded save are deleted in the last commit.
+
+    Args:
+        api: `huggingface_hub.HfApi` instance.
+        repo_id: Dataset repo to push to (created if missing).
+        splits: Split name -> DataFrame or datasets.Dataset.
+        shard_rows: Rows per parquet shard.
+        private: Create the repo as private.
+        upload_workers: Concurrent shard writes and uploads.
+        commit_every: Shards per commit.
+        resume: Skip shards already on the Hub; False uploads every shard and starts a fresh journal.
+        journal_path: Journal file; defaults to `GLOBAL_CACHE_DIR / "hf_uploads" / <repo>@<revision>.jsonl`.
+        existing_files: Path -> LFS sha256 of the files in the repo, as `list_remote_files` returns;
+            listed from the Hub when not given.
+        revision: Branch to commit to.
+
+    Returns:
+        int: Number of shards uploaded (not counting skipped ones).
+    """
+    from huggingface_hub import CommitOperationAdd, CommitOperationDelete
+
+    from ..utils.globals import GLOBAL_TMP_DIR
+
+    if shard_rows <= 0:
+        raise ValueError(f"shard_rows must be positive, got {shard_rows}")
+    journal = UploadJournal(journal_path or default_journal_path(repo_id, revision))
+    if not resume:
+        journal.clear()
+    api.create_repo(repo_id=repo_id, private=private, exist_ok=True, repo_type="dataset")
+    if existing_files is None:
+        existing_files = list_remote_files(api, repo_id, revision)
+
+    def on_hub(path: str, sha256: str) -> bool:
+        if path not in existing_files:
+            return False  # the journal alone is not trusted: the file may have been deleted since
+        remote_sha256 = existing_files[path]
+        return remote_sha256 == sha256 if remote_sha256 else journal.is_done(path, sha256)
+
+    plan = list(_plan_shards(splits, shard_rows))
+    wanted = {path for path, *_ in plan}
+    stale = [
+        f
+        for f in existing_files
+        if f not in wanted and any(f.startswith(f"data/{split}-") and f.endswith(".parquet") for split in splits)
+    ]
+
+    staging = Path(tempfile.mkdtemp(prefix="hf_shards_", dir=GLOBAL_TMP_DIR))
+    uploaded = 0
+    try:
+        with ThreadPoolExecutor(max_workers=upload_workers) as pool:
+            for batch_start in range(0, len(plan), commit_every):
+                batch = plan[batch_start : batch_start + commit_every]
+                local_paths = [staging / path for path, *_ in batch]
+                _, tables, starts, stops = zip(*batch)
+                hashes = list(pool.map(_write_shard, tables, starts, stops, local_paths))
+
+                todo = [
+                    (path, local_path, sha256)
+                    for (path, *_), local_path, sha256 in zip(batch, local_paths, hashes)
+                    if not (resume and on_hub(path, sha256))
+                ]
+                skipped = len(batch) - len(todo)
+                if skipped:
+                    logger.info(f"Skipping {skipped} shard(s) already uploaded to {repo_id}")
+                is_last = batch_start + commit_every >= len(plan)
+                deletions = [CommitOperationDelete(path_in_repo=f) for f in stale] if is_last else []
+
+                if todo or deletions:
+                    additions = [
+                        CommitOperationAdd(path_in_repo=path, path_or_fileobj=str(local_path))
+                        for path, local_path, _ in todo
+                    ]
+                    if additions:
+                        api.preupload_lfs_files(
+                            repo_id, additions, repo_type="dataset", revision=revision, num_threads=upload_workers
+                        )
+                    first, last = batch_start + 1, batch_start + len(batch)
+                    api.create_commit(
+                        repo_id,
+                        [*additions, *deletions],
+                        commit_message=f"Upload shards {first}-{last} of {len(plan)}",
+                        repo_type="dataset",
+                        revision=revision,
+                    )
+                    journal.record([(path, sha256) for path, _, sha256 in todo])
+                    uploaded += len(todo)
+                    logger.info(f"Committed {len(todo)} shard(s) ({last}/{len(plan)}) to {repo_id}")
+
+                for local_path in local_paths:
+                    local_path.unlink(missing_ok=True)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return uploaded
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, Optional, Set, Union
+from typing import TYPE_CHECKING, Any, Dict, Optional, Set, Tuple, Union
 
 from PIL import Image
 
@@ -9,12 +9,52 @@ if TYPE_CHECKING:
     import numpy as np
 
 
+# Shrinking by an integer factor first keeps results close to a full-resolution resample
+REDUCING_GAP = 3.0
+
+# Encoder settings by name; "format" must agree with the file suffix, if it names an image format
+IMAGE_SAVE_PRESETS: Dict[str, Dict[str, Any]] = {
+    "jpeg": {"format": "JPEG", "quality": 90, "optimize": True, "progressive": True},
+    "jpeg-small": {"format": "JPEG", "quality": 80, "optimize": True, "progressive": True, "subsampling": "4:2:0"},
+    "webp": {"format": "WEBP", "quality": 90, "method": 4},
+    "webp-small": {"format": "WEBP", "quality": 75, "method": 6},
+    "webp-lossless": {"format": "WEBP", "lossless": True, "quality": 80, "method": 4},
+    "avif": {"format": "AVIF", "quality": 70, "speed": 6},
+    "png": {"format": "PNG", "compress_level": 6},
+}
+
+# Formats whose encoders take the metadata from the save() arguments only
+_METADATA_FORMATS = {"JPEG", "WEBP", "PNG", "AVIF"}
+# Modes each lossy format can store; anything else is converted to RGB first
+_FORMAT_MODES = {"JPEG": {"RGB", "L", "CMYK"}, "AVIF": {"RGB", "RGBA", "L"}}
+
+
+def _as_box(size: Union[int, Tuple[int, int]]) -> Tuple[int, int]:
+    """Normalize an edge length or (width, height) pair to a bounding box."""
+    if isinstance(size, int):
+        return (size, size)
+    return (size[0], size[1])
+
+
+def _fit_within(size: Tuple[int, int], box: Optional[Tuple[int, int]]) -> Optional[Tuple[int, int]]:
+    """Size of `size` scaled down to fit `box` with its aspect ratio kept, or None if it already fits."""
+    if box is None:
+        return None
+    ratio = min(box[0] / size[0], box[1] / size[1])
+    if ratio >= 1:
+        return None
+    return (max(1, round(size[0] * ratio)), max(1, round(size[1] * ratio)))
+
+
 class ImageLoader(BaseLoader):
     """Load and save images using PIL."""
 
     SUPPORTED_LOAD_CONFIG = {
         "mode",  # str: Mode to convert image to (e.g., 'RGB', 'L')
         "size",  # Tuple[int, int]: Size to resize to
+        "max_size",  # int or Tuple[int, int]: Shrink to fit within this box, keeping aspect ratio
+        "thumbnail",  # Alias of max_size
+        "draft",  # bool: Decode JPEGs at a reduced DCT scale when shrinking (default True)
         "as_array",  # bool: Convert to numpy array
     }
 
@@ -23,6 +63,8 @@ class ImageLoader(BaseLoader):
         "quality",  # int: JPEG quality (1-95)
         "optimize",  # bool: Whether to optimize
         "dpi",  # Tuple[int, int]: DPI setting
+        "preset",  # str: Encoder preset from IMAGE_SAVE_PRESETS (e.g. 'webp', 'avif'); explicit keys win
+        "strip_metadata",  # bool: Drop EXIF and ICC metadata (default False)
     }
 
     def load(self, file_path: Path, loader_config: Optional[Dict[str, Any]] = None) -> Union[Image.Image, "np.ndarray"]:
@@ -41,15 +83,34 @@ class ImageLoader(BaseLoader):
         # Load the image
         img = Image.open(file_path)
 
+        max_size = None
+        for key in ("max_size", "thumbnail"):
+            if key in config:
+                max_size = _as_box(config[key])
+                used_keys.add(key)
+
+        use_draft = config.get("draft", True)
+        if "draft" in config:
+            used_keys.add("draft")
+
+        # JPEGs can decode straight to (at least) the target size via DCT scaling,
+        # and to L/RGB without an intermediate decode; other formats ignore draft()
+        target = config.get("size") or _fit_within(img.size, max_size)
+        if use_draft and target is not None:
+            draft_mode = config.get("mode") if config.get("mode") in ("L", "RGB") else None
+            img.draft(draft_mode, tuple(target))
+
         # Handle mode conversion
         if "mode" in config:
             img = img.convert(config["mode"])
             used_keys.add("mode")
 
-        # Handle resizing
+        # Handle resizing; reducing_gap shrinks by an integer factor with reduce() before resampling
         if "size" in config:
-            img = img.resize(config["size"])
+            img = img.resize(config["size"], reducing_gap=REDUCING_GAP if use_draft else None)
             used_keys.add("size")
+        elif max_size is not None:
+            img.thumbnail(max_size, reducing_gap=REDUCING_GAP if use_draft else None)
 
         # Handle numpy conversion
         if config.get("as_array", False):
@@ -77,9 +138,31 @@ class ImageLoader(BaseLoader):
         # Ensure the image is loaded in memory without relying on private attrs like `.fp`
         data.load()
 
+        # registered_extensions() also loads every plugin, so Image.SAVE is complete below
+        extensions = Image.registered_extensions()
+        suffix_format = extensions.get(Path(file_path).suffix.lower())
+
+        kwargs: Dict[str, Any] = {}
+        preset = config.get("preset")
+        if "preset" in config:
+            used_keys.add("preset")
+        if preset is not None:
+            if preset not in IMAGE_SAVE_PRESETS:
+                raise ValueError(f"Unknown image preset: {preset}. Expected one of {sorted(IMAGE_SAVE_PRESETS)}")
+            preset_format = IMAGE_SAVE_PRESETS[preset]["format"]
+            if suffix_format and suffix_format != preset_format and "format" not in config:
+                raise ValueError(
+                    f"Preset {preset!r} writes {preset_format} images, but {Path(file_path).name} "
+                    f"has a {suffix_format} suffix; use a matching preset or suffix",
+                )
+            kwargs.update(IMAGE_SAVE_PRESETS[preset])
+
+        strip_metadata = config.get("strip_metadata", False)
+        if "strip_metadata" in config:
+            used_keys.add("strip_metadata")
+
         # Extract supported arguments from config
-        kwargs = {}
-        for key in self.SUPPORTED_SAVE_CONFIG:
+        for key in self.SUPPORTED_SAVE_CONFIG - {"preset", "strip_metadata"}:
             if key in config:
                 kwargs[key] = config[key]
                 used_keys.add(key)
@@ -87,4 +170,14 @@ class ImageLoader(BaseLoader):
         # Warn about unused config options
         self._warn_unused_config(config, used_keys, "ImageLoader")
 
+        image_format = (kwargs.get("format") or suffix_format or "").upper()
+        if image_format and image_format not in Image.SAVE:
+            raise ValueError(
+                f"This Pillow build cannot write {image_format} images (AVIF needs Pillow>=11.3 with libavif)"
+            )
+        if image_format in _FORMAT_MODES and data.mode not in _FORMAT_MODES[image_format]:
+            data = data.convert("RGBA" if "RGBA" in _FORMAT_MODES[image_format] and "A" in data.getbands() else "RGB")
+        if strip_metadata and image_format in _METADATA_FORMATS:
+            kwargs.update(exif=b"", icc_profile=None)
+
         data.save(file_path, **kwargs)
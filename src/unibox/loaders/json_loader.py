@@ -4,7 +4,7 @@ from typing import Any, Dict, Optional, Set
 
 import orjson
 
-from .base_loader import BaseLoader
+from .base_loader import BaseLoader, MmapReader, gc_paused
 
 
 class JSONLoader(BaseLoader):
@@ -33,28 +33,25 @@ class JSONLoader(BaseLoader):
         config = loader_config or {}
         used_keys: Set[str] = set()
 
-        # Handle encoding if specified
-        if "encoding" in config:
-            used_keys.add("encoding")
-            with open(file_path, encoding=config["encoding"]) as f:
-                file_content = f.read().encode()
-        else:
-            with open(file_path, "rb") as f:
-                file_content = f.read()
-
-        if not file_content:
-            return None
-
         # Handle default function if specified
         kwargs = {}
         if "default" in config:
             kwargs["default"] = config["default"]
             used_keys.add("default")
 
+        if "encoding" in config:
+            used_keys.add("encoding")
+
         # Warn about unused config options
         self._warn_unused_config(config, used_keys, "JSONLoader")
 
-        return orjson.loads(file_content, **kwargs)
+        # Parse straight from the memory map; only non-utf-8 files need a transcoded copy
+        with MmapReader(file_path) as reader, gc_paused():
+            if not len(reader):
+                return None
+            if "encoding" in config:
+                return orjson.loads(str(reader.buffer, config["encoding"]).encode(), **kwargs)
+            return orjson.loads(reader.buffer, **kwargs)
 
     def save(self, file_path: Path, data: Any, loader_config: Optional[Dict[str, Any]] = None) -> None:
         """Save data to a JSON file with optional configuration.
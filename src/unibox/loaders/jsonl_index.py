@@ -0,0 +1,311 @@
+"""Line-offset index for random access into large JSONL files.
+
+The index is a binary sidecar stored next to the data file (``data.jsonl`` ->
+``data.jsonl.idx``)::
+
+    magic (8 bytes) | kind, source size, source mtime_ns, entries (4 x uint64) | entries
+
+Plain files store the byte offset of every line start followed by the end of the file,
+so record ``i`` is bytes ``[offsets[i], offsets[i + 1])``. Zstandard files store one
+``(compressed offset, first line)`` pair per line-aligned frame plus a final
+``(end, line count)`` pair, so a record costs one frame decompression instead of the
+whole file. `JSONLLoader.save(..., index=True)` writes such frames; other zstd files
+are indexed by their existing frame boundaries.
+
+Indexes are rebuilt lazily whenever the source file's size or mtime no longer match.
+"""
+
+import logging
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..utils.compression import _import_zstandard, infer_compression
+from .base_loader import MmapReader
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"UBJLIDX1"
+KIND_PLAIN = 0
+KIND_ZSTD_FRAMES = 1
+
+# Bytes scanned for newlines per numpy pass when indexing plain files
+SCAN_CHUNK_BYTES = 64 * 1024 * 1024
+# Compressed bytes fed to the decompressor per step when indexing zstd files
+ZSTD_SCAN_CHUNK_BYTES = 1024 * 1024
+
+_HEADER = struct.Struct("<8s4Q")
+
+
+def index_path_for(file_path: Union[str, Path]) -> Path:
+    """Return the sidecar index path for a JSONL file."""
+    return Path(str(file_path) + INDEX_SUFFIX)
+
+
+class JsonlIndex:
+    """Random access to the raw lines of an indexed JSONL file.
+
+    Obtain one with `open_index`. Lines are returned as ``bytes`` including the newline;
+    `JSONLLoader.get` / `JSONLLoader.slice` parse them.
+    """
+
+    def __init__(self, file_path: Union[str, Path], kind: int, entries: np.ndarray):
+        self.file_path = Path(file_path)
+        self.kind = kind
+        self.entries = entries
+        # The most recently decompressed zstd frame: (frame number, its lines)
+        self._frame_cache: Optional[Tuple[int, List[bytes]]] = None
+
+    def __len__(self) -> int:
+        if self.kind == KIND_PLAIN:
+            return len(self.entries) - 1
+        return int(self.entries[-1, 1])
+
+    def __repr__(self) -> str:
+        return f"JsonlIndex({str(self.file_path)!r}, lines={len(self)})"
+
+    def line_bytes(self, i: int) -> bytes:
+        """Return line `i` (negative indices count from the end)."""
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(f"line index out of range for {self.file_path} ({n} lines)")
+        return next(self.iter_line_bytes(i, i + 1))
+
+    def iter_line_bytes(self, start: int, stop: int) -> Iterator[bytes]:
+        """Yield lines ``[start, stop)``; both bounds must already be within ``[0, len]``."""
+        if start >= stop:
+            return
+        if self.kind == KIND_PLAIN:
+            yield from self._iter_plain(start, stop)
+        else:
+            yield from self._iter_frames(start, stop)
+
+    def _iter_plain(self, start: int, stop: int) -> Iterator[bytes]:
+        offsets = self.entries
+        base = int(offsets[start])
+        with open(self.file_path, "rb") as f:
+            f.seek(base)
+            data = f.read(int(offsets[stop]) - base)
+        bounds = (offsets[start : stop + 1] - base).tolist()
+        for line_start, line_end in zip(bounds, bounds[1:]):
+            yield data[line_start:line_end]
+
+    def _iter_frames(self, start: int, stop: int) -> Iterator[bytes]:
+        first_lines = self.entries[:, 1]
+        frame = int(np.searchsorted(first_lines, start, side="right")) - 1
+        line = start
+        while line < stop:
+            lines = self._frame_lines(frame)
+            frame_first = int(first_lines[frame])
+            take = min(stop, frame_first + len(lines))
+            yield from lines[line - frame_first : take - frame_first]
+            line = take
+            frame += 1
+
+    def _frame_lines(self, frame: int) -> List[bytes]:
+        if self._frame_cache is not None and self._frame_cache[0] == frame:
+            return self._frame_cache[1]
+        zstandard = _import_zstandard()
+        begin, end = int(self.entries[frame, 0]), int(self.entries[frame + 1, 0])
+        with open(self.file_path, "rb") as f:
+            f.seek(begin)
+            compressed = f.read(end - begin)
+        # Frames that were not line-aligned are merged into one entry, so decode across frames
+        text = zstandard.ZstdDecompressor().decompressobj(read_across_frames=True).decompress(compressed)
+        lines = text.split(b"\n")
+        if lines[-1] == b"":
+            lines.pop()
+        lines = [line + b"\n" for line in lines]
+        self._frame_cache = (frame, lines)
+        return lines
+
+
+def open_index(file_path: Union[str, Path], rebuild: bool = False) -> JsonlIndex:
+    """Open the index of a JSONL file, building (and persisting) it first if needed.
+
+    Args:
+        file_path: Local path to a plain or zstd-compressed JSONL file.
+        rebuild: Ignore any existing sidecar and re-index the file.
+
+    Returns:
+        JsonlIndex: Random-access view over the file's lines.
+    """
+    file_path = Path(file_path)
+    if not rebuild:
+        index = read_index(file_path)
+        if index is not None:
+            return index
+    return build_index(file_path)
+
+
+def read_index(file_path: Union[str, Path]) -> Optional[JsonlIndex]:
+    """Read the sidecar index of `file_path`, or return None if it is missing or stale."""
+    file_path = Path(file_path)
+    index_path = index_path_for(file_path)
+    try:
+        stat = file_path.stat()
+        with open(index_path, "rb") as f:
+            header = f.read(_HEADER.size)
+    except OSError:
+        return None
+    if len(header) != _HEADER.size:
+        return None
+
+    magic, kind, size, mtime_ns, count = _HEADER.unpack(header)
+    if magic != INDEX_MAGIC or kind not in (KIND_PLAIN, KIND_ZSTD_FRAMES):
+        return None
+    if size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+        logger.debug(f"Index {index_path} is stale; it will be rebuilt")
+        return None
+
+    shape = (count,) if kind == KIND_PLAIN else (count // 2, 2)
+    entries = np.memmap(index_path, dtype="<u8", mode="r", offset=_HEADER.size, shape=shape)
+    return JsonlIndex(file_path, kind, entries)
+
+
+def build_index(
+    file_path: Union[str, Path],
+    previous: Optional[JsonlIndex] = None,
+    previous_size: int = 0,
+    frames: Optional[List[Tuple[int, int]]] = None,
+) -> JsonlIndex:
+    """Index `file_path` and write the sidecar.
+
+    Args:
+        file_path: Local path to a plain or zstd-compressed JSONL file.
+        previous: A valid index of the file before data was appended to it; only the
+            appended bytes are scanned.
+        previous_size: Size of the file that `previous` describes.
+        frames: ``(compressed end offset, line count)`` for each frame written after
+            `previous_size`, as recorded while saving. Skips re-reading zstd files.
+
+    Returns:
+        JsonlIndex: The new index.
+    """
+    file_path = Path(file_path)
+    compression = infer_compression(file_path)
+    if compression is None:
+        kind = KIND_PLAIN
+        entries = _index_plain(file_path, previous, previous_size)
+    elif compression == "zstd":
+        kind = KIND_ZSTD_FRAMES
+        entries = _index_zstd(file_path, previous, previous_size, frames)
+    else:
+        raise ValueError(
+            f"Random access needs a plain or zstd-compressed JSONL file, got {compression}: {file_path}. "
+            "Re-save it as .jsonl.zst with index=True.",
+        )
+
+    _write_index(file_path, kind, entries)
+    return JsonlIndex(file_path, kind, entries)
+
+
+def _index_plain(file_path: Path, previous: Optional[JsonlIndex], previous_size: int) -> np.ndarray:
+    """Offsets of every line start in a plain file, followed by the file size."""
+    begin = previous_size if previous is not None else 0
+    parts = []
+    with MmapReader(file_path) as reader:
+        size = len(reader)
+        buffer = reader.buffer
+        if previous is not None:
+            kept = np.asarray(previous.entries)
+            parts.append(kept[kept < begin])
+        if begin == 0 or (begin <= size and buffer[begin - 1] == ord("\n")):
+            parts.append(np.array([begin], dtype="<u8"))
+        for chunk_start in range(begin, size, SCAN_CHUNK_BYTES):
+            chunk = np.frombuffer(buffer[chunk_start : chunk_start + SCAN_CHUNK_BYTES], dtype=np.uint8)
+            parts.append((np.flatnonzero(chunk == ord("\n")) + chunk_start + 1).astype("<u8"))
+            # Drop the numpy view so the mapping can be closed
+            del chunk
+        del buffer
+
+    offsets = np.concatenate(parts) if parts else np.zeros(1, dtype="<u8")
+    if offsets[-1] != size:
+        # No trailing newline: the file end closes the last line
+        offsets = np.append(offsets, np.uint64(size))
+    return offsets.astype("<u8")
+
+
+def _index_zstd(
+    file_path: Path,
+    previous: Optional[JsonlIndex],
+    previous_size: int,
+    frames: Optional[List[Tuple[int, int]]],
+) -> np.ndarray:
+    """``(compressed offset, first line)`` per line-aligned frame, plus ``(end, line count)``."""
+    if previous is not None:
+        entries = [tuple(int(v) for v in row) for row in np.asarray(previous.entries)]
+        # The old end entry becomes the start of the first appended frame
+        entries[-1] = (previous_size, entries[-1][1])
+        begin, lines = previous_size, entries[-1][1]
+    else:
+        entries, begin, lines = [(0, 0)], 0, 0
+
+    if frames is not None:
+        for end, frame_lines in frames:
+            lines += frame_lines
+            entries.append((end, lines))
+    else:
+        entries.extend(_scan_zstd_frames(file_path, begin, lines))
+
+    if len(entries) == 1:
+        entries.append((os.path.getsize(file_path), lines))
+    return np.array(entries, dtype="<u8").reshape(-1, 2)
+
+
+def _scan_zstd_frames(file_path: Path, begin: int, lines: int) -> List[Tuple[int, int]]:
+    """Decompress a zstd file once, recording the end of every frame that ends on a newline."""
+    zstandard = _import_zstandard()
+    dctx = zstandard.ZstdDecompressor()
+    entries = []
+    last_byte = b"\n"
+    with open(file_path, "rb") as f:
+        f.seek(begin)
+        position = begin
+        obj = dctx.decompressobj()
+        while True:
+            chunk = f.read(ZSTD_SCAN_CHUNK_BYTES)
+            if not chunk:
+                break
+            while chunk:
+                out = obj.decompress(chunk)
+                if out:
+                    lines += out.count(b"\n")
+                    last_byte = out[-1:]
+                if not obj.eof:
+                    position += len(chunk)
+                    break
+                unused = obj.unused_data
+                position += len(chunk) - len(unused)
+                # Frames that end mid-line are merged with the next one
+                if last_byte == b"\n":
+                    entries.append((position, lines))
+                obj = dctx.decompressobj()
+                chunk = unused
+
+    if last_byte != b"\n":
+        # The final line has no trailing newline
+        entries.append((position, lines + 1))
+    return entries
+
+
+def _write_index(file_path: Path, kind: int, entries: np.ndarray) -> None:
+    """Atomically write the sidecar; read-only locations keep the index in memory only."""
+    index_path = index_path_for(file_path)
+    stat = file_path.stat()
+    header = _HEADER.pack(INDEX_MAGIC, kind, stat.st_size, stat.st_mtime_ns, entries.size)
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=index_path.parent, prefix=f".{index_path.name}.")
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(np.ascontiguousarray(entries, dtype="<u8").tobytes())
+        os.replace(temp_path, index_path)
+    except OSError as e:
+        logger.warning(f"Could not write JSONL index {index_path}: {e}")
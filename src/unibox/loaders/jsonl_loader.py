@@ -1,38 +1,83 @@
 # jsonl_loader.py
+import io
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union, cast
 
 import orjson
+import pandas as pd
 
-from .base_loader import BaseLoader
+from ..utils.compression import _import_zstandard, infer_compression, open_compressed
+from . import jsonl_index
+from .base_loader import BaseLoader, MmapReader, gc_paused
+
+# Files smaller than this are parsed serially even when `num_workers` is set
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+# Serialized bytes accumulated before each write call when saving
+WRITE_BUFFER_BYTES = 8 * 1024 * 1024
+# DataFrame rows converted to Python objects at a time when saving
+DATAFRAME_BATCH_ROWS = 65_536
+
+
+def _parse_jsonl_range(
+    file_path: str,
+    start: int,
+    end: int,
+    encoding: str,
+    skip_errors: bool,
+    replace_nan: bool,
+    kwargs: Dict[str, Any],
+    output: str,
+) -> Any:
+    """Worker entry point: parse one newline-aligned byte range and convert it to `output`."""
+    with MmapReader(file_path) as reader, gc_paused():
+        records = JSONLLoader._parse_range(reader, start, end, encoding, skip_errors, replace_nan, kwargs)
+        return JSONLLoader._convert_records(records, output)
 
 
 class JSONLLoader(BaseLoader):
     """Load and save JSONL files using orjson."""
 
+    HANDLES_FILE_COMPRESSION = True
+
     SUPPORTED_LOAD_CONFIG = {
         "encoding",  # str: File encoding for reading lines
         "skip_errors",  # bool: Whether to skip lines that can't be parsed
         "replace_nan",  # bool: Whether to replace NaN with null
         "default",  # Callable: Function to handle unknown types
+        "num_workers",  # int: Parse byte ranges in this many processes (large files only)
+        "to_pandas",  # bool: Return a pandas DataFrame (built via Arrow) instead of a list
+        "to_arrow",  # bool: Return a pyarrow Table instead of a list
+        "compression",  # str: 'gzip', 'zstd', 'bz2', 'xz', None, or 'infer' from the suffix (default)
     }
 
     SUPPORTED_SAVE_CONFIG = {
         "encoding",  # str: File encoding for writing lines
         "option",  # int: orjson option flags
         "default",  # Callable: Function to handle unknown types
+        "append",  # bool: Append to an existing file instead of overwriting it
+        "compression",  # str: 'gzip', 'zstd', 'bz2', 'xz', None, or 'infer' from the suffix (default)
+        "compression_level",  # int: Codec-specific compression level
+        "buffer_size",  # int: Bytes of serialized lines to accumulate per write
+        "index",  # bool: Also write a line-offset index (`<file>.idx`) for get()/slice()
     }
 
-    def load(self, file_path: Path, loader_config: Optional[Dict[str, Any]] = None) -> List[Any]:
+    def load(self, file_path: Path, loader_config: Optional[Dict[str, Any]] = None) -> Any:
         """Load a JSONL file with optional configuration.
 
+        With `num_workers` > 1, files above `PARALLEL_MIN_BYTES` are split into byte ranges
+        aligned to newlines, parsed in a process pool and concatenated in file order. Combine
+        it with `to_pandas` or `to_arrow` so each worker returns a columnar chunk instead of
+        pickling every record back to the parent.
+
         Args:
             file_path (Path): Path to the JSONL file
             loader_config (Optional[Dict]): Configuration options for JSONL loading
 
         Returns:
-            List[Any]: List of parsed JSON objects
+            Any: List of parsed JSON objects, or a DataFrame / pyarrow Table if requested
         """
         config = loader_config or {}
         used_keys: Set[str] = set()
@@ -56,51 +101,329 @@ class JSONLLoader(BaseLoader):
             kwargs["default"] = config["default"]
             used_keys.add("default")
 
+        num_workers = config.get("num_workers") or 1
+        if "num_workers" in config:
+            used_keys.add("num_workers")
+
+        output = "list"
+        for key, value in (("to_pandas", "pandas"), ("to_arrow", "arrow")):
+            if key in config:
+                used_keys.add(key)
+                if config[key]:
+                    output = value
+        if config.get("to_pandas") and config.get("to_arrow"):
+            raise ValueError("JSONLLoader: to_pandas and to_arrow are mutually exclusive")
+
+        compression = config.get("compression", "infer")
+        if "compression" in config:
+            used_keys.add("compression")
+        if compression == "infer":
+            compression = infer_compression(file_path)
+
         # Warn about unused config options
         self._warn_unused_config(config, used_keys, "JSONLLoader")
 
-        data = []
-        with open(file_path, "rb") as f:
-            for line in f:
-                line_str = line.decode(encoding, errors="replace")
-                if replace_nan and "NaN" in line_str:
-                    line_str = re.sub(r"\bNaN\b", "null", line_str)
+        if compression:
+            # Compressed streams cannot be split by byte offset; decompress and parse serially
+            raw = cast("io.RawIOBase", open_compressed(file_path, "rb", compression))
+            with io.BufferedReader(raw) as f, gc_paused():
+                records = self._parse_lines(f, encoding, skip_errors, replace_nan, kwargs, replace_nan)
+                return self._concat_chunks([self._convert_records(records, output)], output)
+
+        with MmapReader(file_path) as reader:
+            ranges = reader.split_ranges(num_workers) if len(reader) >= PARALLEL_MIN_BYTES else []
+            if len(ranges) < 2:
+                with gc_paused():
+                    records = self._parse_range(reader, 0, len(reader), encoding, skip_errors, replace_nan, kwargs)
+                    return self._concat_chunks([self._convert_records(records, output)], output)
+
+        with ProcessPoolExecutor(max_workers=min(num_workers, len(ranges))) as executor:
+            futures = [
+                executor.submit(
+                    _parse_jsonl_range,
+                    str(file_path),
+                    start,
+                    end,
+                    encoding,
+                    skip_errors,
+                    replace_nan,
+                    kwargs,
+                    output,
+                )
+                for start, end in ranges
+            ]
+            chunks = [future.result() for future in futures]
+        return self._concat_chunks(chunks, output)
+
+    @staticmethod
+    def _convert_records(records: List[Any], output: str) -> Any:
+        """Convert one chunk of records into the form workers hand back to the parent.
+
+        Both DataFrame and Arrow outputs travel as Arrow tables, which pickle as flat buffers
+        instead of millions of Python objects. Records Arrow cannot type (e.g. a field mixing
+        ints and strings) fall back to a DataFrame for pandas output.
+        """
+        if output == "list":
+            return records
+
+        import pyarrow as pa
+
+        try:
+            return pa.Table.from_pylist(records)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            if output == "arrow":
+                raise
+            return pd.DataFrame(records)
+
+    @staticmethod
+    def _concat_chunks(chunks: List[Any], output: str) -> Any:
+        """Concatenate converted chunks in file order."""
+        if output == "list":
+            if len(chunks) == 1:
+                return chunks[0]
+            with gc_paused():
+                return [record for chunk in chunks for record in chunk]
+
+        import pyarrow as pa
+
+        tables = [chunk for chunk in chunks if isinstance(chunk, pa.Table)]
+        if len(tables) == len(chunks):
+            try:
+                # Chunks infer their schemas independently; "permissive" unifies e.g. null vs int columns
+                table = pa.concat_tables(tables, promote_options="permissive") if len(tables) > 1 else tables[0]
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                if output == "arrow":
+                    raise
+            else:
+                return table if output == "arrow" else table.to_pandas()
+
+        frames = [chunk.to_pandas() if isinstance(chunk, pa.Table) else chunk for chunk in chunks]
+        return pd.concat(frames, ignore_index=True)
+
+    @staticmethod
+    def _parse_range(
+        reader: MmapReader,
+        start: int,
+        end: int,
+        encoding: str,
+        skip_errors: bool,
+        replace_nan: bool,
+        kwargs: Dict[str, Any],
+    ) -> List[Any]:
+        """Parse the JSONL lines in bytes ``[start, end)`` of a mapped file.
+
+        utf-8 lines are handed to orjson as raw bytes; lines that need NaN replacement,
+        another encoding, or invalid-utf-8 replacement are decoded to `str` first.
+        """
+        # Only look for NaN line-by-line when the range contains it at all
+        check_nan = replace_nan and reader.find(b"NaN", start, end) != -1
+        lines = reader.iter_line_bytes(start, end)
+        return JSONLLoader._parse_lines(lines, encoding, skip_errors, replace_nan, kwargs, check_nan)
+
+    @staticmethod
+    def _parse_lines(
+        lines: Iterable[bytes],
+        encoding: str,
+        skip_errors: bool,
+        replace_nan: bool,
+        kwargs: Dict[str, Any],
+        check_nan: bool,
+    ) -> List[Any]:
+        """Parse an iterable of raw JSONL lines (newlines included).
+
+        `check_nan` enables the per-line NaN scan; callers pass False when they know the
+        input contains no NaN at all.
+        """
+        raw_utf8 = encoding.lower().replace("_", "-") in ("utf-8", "utf8")
+        check_nan = check_nan or (replace_nan and not raw_utf8)
+
+        data: List[Any] = []
+        append = data.append
+        for line in lines:
+            if raw_utf8 and not (check_nan and b"NaN" in line):
                 try:
-                    data.append(orjson.loads(line_str, **kwargs))
+                    append(orjson.loads(line, **kwargs))
+                    continue
                 except orjson.JSONDecodeError:
-                    if not skip_errors:
-                        raise
+                    # Retry below: invalid utf-8 is decoded with replacement characters
+                    pass
+
+            line_str = line.decode(encoding, errors="replace")
+            if replace_nan and "NaN" in line_str:
+                line_str = re.sub(r"\bNaN\b", "null", line_str)
+            try:
+                append(orjson.loads(line_str, **kwargs))
+            except orjson.JSONDecodeError:
+                if not skip_errors:
+                    raise
         return data
 
-    def save(self, file_path: Path, data: List[Any], loader_config: Optional[Dict[str, Any]] = None) -> None:
-        """Save a list of objects to a JSONL file with optional configuration.
+    def save(self, file_path: Path, data: Any, loader_config: Optional[Dict[str, Any]] = None) -> None:
+        """Save a list of objects (or a DataFrame's rows) to a JSONL file with optional configuration.
+
+        Lines are serialized into blocks of roughly `buffer_size` bytes and written one block
+        at a time, so large dumps cost a handful of write calls rather than one per record.
+        DataFrames are serialized column-batch by column-batch without `to_dict("records")`.
 
         Args:
             file_path (Path): Where to save the JSONL file
-            data (List[Any]): Objects to save
+            data (Any): Iterable of objects, or a pandas DataFrame
             loader_config (Optional[Dict]): Configuration options for JSONL saving
         """
         config = loader_config or {}
         used_keys: Set[str] = set()
 
         # Extract supported arguments from config
-        kwargs = {}
-        for key in self.SUPPORTED_SAVE_CONFIG - {"encoding"}:
+        kwargs: Dict[str, Any] = {}
+        for key in ("option", "default"):
             if key in config:
                 kwargs[key] = config[key]
                 used_keys.add(key)
+        kwargs["option"] = (kwargs.get("option") or 0) | orjson.OPT_APPEND_NEWLINE
 
         # Handle encoding
         encoding = config.get("encoding", "utf-8")
         if "encoding" in config:
             used_keys.add("encoding")
 
+        mode = "ab" if config.get("append", False) else "wb"
+        if "append" in config:
+            used_keys.add("append")
+
+        compression = config.get("compression", "infer")
+        if "compression" in config:
+            used_keys.add("compression")
+        if compression == "infer":
+            compression = infer_compression(file_path)
+
+        compression_level = config.get("compression_level")
+        if "compression_level" in config:
+            used_keys.add("compression_level")
+
+        buffer_size = config.get("buffer_size", WRITE_BUFFER_BYTES)
+        if "buffer_size" in config:
+            used_keys.add("buffer_size")
+
+        index = config.get("index", False)
+        if "index" in config:
+            used_keys.add("index")
+
         # Warn about unused config options
         self._warn_unused_config(config, used_keys, "JSONLLoader")
 
-        with open(file_path, "wb") as f:
-            for item in data:
-                line = orjson.dumps(item, **kwargs)
-                if encoding != "utf-8":
-                    line = line.decode("utf-8").encode(encoding)
-                f.write(line + b"\n")
+        if "default" not in kwargs and isinstance(data, pd.DataFrame):
+            # Timestamps / NaT / NA are what to_dict("records") would have handed orjson; serialize them
+            kwargs["default"] = _pandas_default
+
+        transcode = encoding.lower().replace("_", "-") not in ("utf-8", "utf8")
+        if index and (transcode or compression not in (None, "zstd")):
+            raise ValueError("JSONLLoader: index=True needs a utf-8 file that is uncompressed or zstd-compressed")
+
+        # When appending, a still-valid index only needs the new bytes indexed
+        previous = jsonl_index.read_index(file_path) if index and mode == "ab" else None
+        previous_size = os.path.getsize(file_path) if previous is not None else 0
+        # zstd: end a frame after every block so each one can be decompressed on its own
+        frames: Optional[List[Tuple[int, int]]] = None
+        if index and compression == "zstd" and (mode == "wb" or previous is not None):
+            frames = []
+            flush_frame = _import_zstandard().FLUSH_FRAME
+
+        with open_compressed(file_path, mode, compression, level=compression_level) as f:
+            for block in self._iter_blocks(data, kwargs, buffer_size):
+                f.write(block.decode("utf-8").encode(encoding) if transcode else block)
+                if frames is not None:
+                    # zstd stream writers take a flush mode, which IO.flush does not declare
+                    cast(Any, f).flush(flush_frame)
+                    frames.append((previous_size + f.tell(), block.count(b"\n")))
+
+        if index:
+            jsonl_index.build_index(file_path, previous, previous_size, frames)
+
+    def open_index(self, file_path: Union[str, Path], rebuild: bool = False) -> jsonl_index.JsonlIndex:
+        """Open the line-offset index of a local JSONL file, building it on first use.
+
+        The index is stored next to the file as `<file>.idx` and rebuilt whenever the file
+        changes. Plain and zstd-compressed files are supported; for zstd, files saved with
+        `index=True` decompress a single block per lookup.
+
+        Args:
+            file_path (Union[str, Path]): Path to the JSONL file
+            rebuild (bool): Re-index the file even if a valid index exists
+
+        Returns:
+            JsonlIndex: Random-access view over the file's raw lines
+        """
+        return jsonl_index.open_index(file_path, rebuild=rebuild)
+
+    def get(self, file_path: Union[str, Path], i: int) -> Any:
+        """Return record `i` of a local JSONL file without parsing the rest of it.
+
+        Args:
+            file_path (Union[str, Path]): Path to the JSONL file
+            i (int): Record number; negative values count from the end
+
+        Returns:
+            Any: The parsed record
+        """
+        line = self.open_index(file_path).line_bytes(i)
+        return self._parse_lines([line], "utf-8", False, True, {}, True)[0]
+
+    def slice(self, file_path: Union[str, Path], start: Optional[int] = None, stop: Optional[int] = None) -> List[Any]:
+        """Return records ``[start:stop]`` of a local JSONL file, with list slicing semantics.
+
+        Args:
+            file_path (Union[str, Path]): Path to the JSONL file
+            start (Optional[int]): First record (negative values count from the end)
+            stop (Optional[int]): Record to stop before
+
+        Returns:
+            List[Any]: The parsed records
+        """
+        index = self.open_index(file_path)
+        bounds = range(len(index))[start:stop]
+        with gc_paused():
+            return self._parse_lines(index.iter_line_bytes(bounds.start, bounds.stop), "utf-8", False, True, {}, True)
+
+    @staticmethod
+    def _iter_blocks(data: Any, kwargs: Dict[str, Any], buffer_size: int) -> Iterator[bytearray]:
+        """Serialize `data` to newline-terminated JSON and yield it in blocks of ~`buffer_size` bytes.
+
+        The yielded buffer is reused; consume it before advancing the iterator.
+        """
+        dumps = orjson.dumps
+        default = kwargs.get("default")
+        option = kwargs["option"]
+        # Copy each line into one bytearray right away: orjson's outputs are over-allocated,
+        # so keeping thousands of them alive until a join costs far more than the copy
+        block = bytearray()
+        for item in JSONLLoader._iter_records(data):
+            block += dumps(item, default, option)
+            if len(block) >= buffer_size:
+                yield block
+                block.clear()
+        if block:
+            yield block
+
+    @staticmethod
+    def _iter_records(data: Any) -> Iterator[Any]:
+        """Yield records from an iterable, or row dicts from a DataFrame one column batch at a time."""
+        if not isinstance(data, pd.DataFrame):
+            yield from data
+            return
+
+        names = [str(name) for name in data.columns]
+        for start in range(0, len(data), DATAFRAME_BATCH_ROWS):
+            batch = data.iloc[start : start + DATAFRAME_BATCH_ROWS]
+            # Series.tolist() turns numpy scalars into Python objects orjson serializes natively
+            columns = [batch.iloc[:, i].tolist() for i in range(len(names))]
+            for row in zip(*columns):
+                yield dict(zip(names, row))
+
+
+def _pandas_default(obj: Any) -> Any:
+    """orjson fallback for pandas scalars that appear in DataFrame rows."""
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, (pd.Timestamp, pd.Timedelta)):
+        return obj.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
@@ -6,11 +6,14 @@ from pathlib import Path
 from typing import Any, Optional, Union
 
 from ..backends.backend_router import get_backend_for_uri
-from ..utils.constants import IMG_FILES
+from ..utils.compression import COMPRESSION_SUFFIXES
+from ..utils.constants import AUDIO_FILES, IMG_FILES, VIDEO_FILES
 from ..utils.utils import parse_hf_uri
+from .audio_loader import AudioLoader
 from .base_loader import BaseLoader
-from .csv_loader import CSVLoader
 from .cdc_parquet_loader import CdcParquetLoader
+from .compressed_loader import CompressedLoader
+from .csv_loader import CSVLoader
 from .hf_dataset_loader import HFDatasetLoader
 from .image_loder import ImageLoader
 from .json_loader import JSONLoader
@@ -18,6 +21,7 @@ from .jsonl_loader import JSONLLoader
 from .parquet_loader import ParquetLoader
 from .toml_loader import TOMLLoader
 from .txt_loader import TxtLoader
+from .video_loader import VideoLoader
 from .yaml_loader import YAMLLoader
 
 
@@ -70,6 +74,11 @@ def get_loader_for_path(path: Union[str, Path]) -> Optional[BaseLoader]:
     suffixes = [s.lower() for s in Path(path_str).suffixes]
     suffix = suffixes[-1] if suffixes else ""
 
+    # Compressed files (data.jsonl.zst, table.csv.gz): route by the inner suffix
+    if len(suffixes) >= 2 and suffix in COMPRESSION_SUFFIXES:
+        inner = get_loader_for_path(path_str[: -len(suffix)])
+        return CompressedLoader(inner, COMPRESSION_SUFFIXES[suffix]) if inner else None
+
     if len(suffixes) >= 2 and suffixes[-2:] in ([".cdc", ".parquet"], [".parquet", ".cdc"]):
         return CdcParquetLoader()
     if suffix == ".csv":
@@ -88,6 +97,11 @@ def get_loader_for_path(path: Union[str, Path]) -> Optional[BaseLoader]:
         return TOMLLoader()
     if suffix == ".yaml" or suffix == ".yml":
         return YAMLLoader()
+    # Before video: .ogg is in both lists and is far more often Vorbis/Opus audio
+    if suffix in AUDIO_FILES:
+        return AudioLoader()
+    if suffix in VIDEO_FILES:
+        return VideoLoader()
 
     return None
 
@@ -130,8 +144,9 @@ def load_data(path: Union[str, Path], loader_config: Optional[dict] = None) -> A
 
     # if it's huggingface, let loader load it instead of downloading at backend
     if not str(local_path).startswith("hf://"):
-        # Resolve symlinks (non-strict) so linked files work; accept symlinks via lexists
-        resolved_path = Path(local_path).resolve(strict=False)
+        # Keep symlinks unresolved: the loader is picked by the link's suffix (HF cache entries
+        # link to extensionless blobs), and opening the link reads the target anyway
+        resolved_path = Path(os.path.abspath(local_path))
         if not (resolved_path.exists() or os.path.lexists(str(resolved_path))):
             raise FileNotFoundError(f"Downloaded file/folder not found: {resolved_path}")
         local_path = resolved_path
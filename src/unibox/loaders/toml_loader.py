@@ -10,6 +10,9 @@ from .base_loader import BaseLoader
 class TOMLLoader(BaseLoader):
     """Load and save TOML files using tomli/tomli_w."""
 
+    # tomli is a pure-Python parser
+    PREFERRED_EXECUTOR = "process"
+
     SUPPORTED_LOAD_CONFIG = {
         "multiline_strings",  # bool: Parse multiline strings
     }
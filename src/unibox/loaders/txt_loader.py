@@ -1,7 +1,7 @@
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 
-from .base_loader import BaseLoader
+from .base_loader import BaseLoader, MmapReader
 
 
 class TxtLoader(BaseLoader):
@@ -49,11 +49,21 @@ class TxtLoader(BaseLoader):
         # Warn about unused config options
         self._warn_unused_config(config, used_keys, "TxtLoader")
 
-        with open(file_path, encoding=encoding) as f:
-            lines = [line.strip() if strip else line.rstrip("\n") for line in f]
-            if skip_empty:
-                lines = [line for line in lines if line]
-            return lines
+        # Decode straight from the memory map instead of buffering the file through a text stream
+        with MmapReader(file_path) as reader:
+            text = str(reader.buffer, encoding)
+
+        # Match text-mode universal newlines: "\r\n" and "\r" both end a line
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        lines = text.split("\n")
+        if lines and not lines[-1]:
+            lines.pop()
+
+        lines = [line.strip() for line in lines] if strip else lines
+        if skip_empty:
+            lines = [line for line in lines if line]
+        return lines
 
     def save(self, file_path: Path, data: List[str], loader_config: Optional[Dict[str, Any]] = None) -> None:
         """Save a list of strings to a text file.
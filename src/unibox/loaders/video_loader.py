@@ -0,0 +1,238 @@
+from fractions import Fraction
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from PIL import Image
+
+from .base_loader import BaseLoader
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# PIL mode -> PyAV pixel format that converts to it without a copy
+_FRAME_FORMATS = {"RGB": "rgb24", "RGBA": "rgba", "L": "gray"}
+# When the next sampled frame is closer than this, decoding forward is cheaper than seeking
+# back to a keyframe (typical GOPs are 1-10 seconds)
+SEEK_GAP_SECONDS = 1.0
+
+
+def _import_av():
+    try:
+        import av
+    except ImportError as e:
+        raise ImportError("Video and audio loading require PyAV: pip install av (or pip install 'unibox[video]')") from e
+    return av
+
+
+def _fit_size(width: int, height: int, max_size: Optional[Tuple[int, int]]) -> Optional[Tuple[int, int]]:
+    """Frame size scaled down to fit `max_size` with its aspect ratio kept, or None if it already fits."""
+    if max_size is None:
+        return None
+    ratio = min(max_size[0] / width, max_size[1] / height)
+    if ratio >= 1:
+        return None
+    return (max(1, round(width * ratio)), max(1, round(height * ratio)))
+
+
+def _stream_span(container, stream) -> Tuple[float, float]:
+    """(start, end) of the stream in seconds, from the stream header or the container."""
+    start = float(stream.start_time * stream.time_base) if stream.start_time is not None else 0.0
+    if stream.duration is not None:
+        return start, start + float(stream.duration * stream.time_base)
+    if container.duration is not None:
+        return start, start + container.duration / 1_000_000
+    raise ValueError("Cannot sample frames uniformly: the video has no duration; use every_n instead")
+
+
+class VideoLoader(BaseLoader):
+    """Load video frames using PyAV (FFmpeg), decoding only what the sampling needs.
+
+    Without sampling options every frame is returned. `num_frames` and `start` seek
+    through the container index to the keyframe before each requested time instead of
+    decoding from the beginning, and `keyframes_only` makes the decoder skip all other
+    frames.
+    """
+
+    SUPPORTED_LOAD_CONFIG = {
+        "every_n",  # int: Keep every n-th decoded frame
+        "num_frames",  # int: Sample this many frames uniformly over [start, end), seeking to each
+        "keyframes_only",  # bool: Decode keyframes only
+        "start",  # float: Start time in seconds (seeks instead of decoding up to it)
+        "end",  # float: End time in seconds
+        "max_size",  # int or Tuple[int, int]: Scale frames to fit within this box, keeping aspect ratio
+        "mode",  # str: 'RGB' (default), 'RGBA' or 'L'
+        "as_array",  # bool: Return one (N, H, W, C) uint8 array instead of a list of PIL images
+        "iterator",  # bool: Return a lazy iterator of frames instead of a list
+        "stream_index",  # int: Which video stream to read (default 0)
+    }
+
+    SUPPORTED_SAVE_CONFIG = {
+        "fps",  # int or Fraction: Frame rate (default 24)
+        "codec",  # str: Encoder name (default 'libx264')
+        "pix_fmt",  # str: Encoded pixel format (default 'yuv420p')
+        "bit_rate",  # int: Target bit rate
+        "options",  # Dict[str, str]: Encoder options, e.g. {'crf': '23', 'preset': 'fast'}
+    }
+
+    def load(self, file_path: Path, loader_config: Optional[Dict[str, Any]] = None) -> Any:
+        """Load sampled frames from a video file.
+
+        Args:
+            file_path (Path): Path to the video file
+            loader_config (Optional[Dict]): Configuration options for frame sampling
+
+        Returns:
+            Union[List[Image.Image], np.ndarray, Iterator]: The frames, as PIL images, one
+            (N, H, W, C) array, or a lazy iterator of either with `iterator=True`
+        """
+        config = loader_config or {}
+        used_keys: Set[str] = set()
+        for key in self.SUPPORTED_LOAD_CONFIG:
+            if key in config:
+                used_keys.add(key)
+
+        # Warn about unused config options
+        self._warn_unused_config(config, used_keys, "VideoLoader")
+
+        if config.get("num_frames") is not None and (config.get("every_n") or config.get("keyframes_only")):
+            raise ValueError("num_frames cannot be combined with every_n or keyframes_only")
+        mode = config.get("mode", "RGB")
+        if mode not in _FRAME_FORMATS:
+            raise ValueError(f"Unsupported mode: {mode}. Expected one of {sorted(_FRAME_FORMATS)}")
+
+        frames = self._iter_frames(str(file_path), config)
+        if config.get("as_array", False):
+            import numpy as np
+
+            frames = (frame.to_ndarray() for frame in frames)
+            if config.get("iterator", False):
+                return frames
+            arrays = list(frames)
+            if not arrays:
+                return np.empty((0, 0, 0, len(mode)), dtype=np.uint8)
+            batch = np.stack(arrays)
+            return batch[..., None] if batch.ndim == 3 else batch
+
+        images = (frame.to_image() for frame in frames)
+        return images if config.get("iterator", False) else list(images)
+
+    def _iter_frames(self, path: str, config: Dict[str, Any]) -> Iterator[Any]:
+        """Yield the selected frames as `av.VideoFrame`s already scaled and converted."""
+        av = _import_av()
+
+        with av.open(path) as container:
+            stream = container.streams.video[config.get("stream_index", 0)]
+            frame_format = _FRAME_FORMATS[config.get("mode", "RGB")]
+            max_size = config.get("max_size")
+            if isinstance(max_size, int):
+                max_size = (max_size, max_size)
+            size = _fit_size(stream.codec_context.width, stream.codec_context.height, max_size)
+
+            def convert(frame):
+                # Scaling and color conversion run together in swscale
+                if size is None:
+                    return frame.reformat(format=frame_format)
+                return frame.reformat(width=size[0], height=size[1], format=frame_format)
+
+            if config.get("num_frames") is not None:
+                for frame in self._sample_uniform(container, stream, config):
+                    yield convert(frame)
+                return
+
+            if config.get("keyframes_only", False):
+                stream.codec_context.skip_frame = "NONKEY"
+            else:
+                stream.thread_type = "AUTO"
+
+            start, end = config.get("start"), config.get("end")
+            if start:
+                container.seek(int(start / stream.time_base), stream=stream, backward=True)
+            every_n = config.get("every_n") or 1
+
+            kept = 0
+            for frame in container.decode(stream):
+                if start is not None and frame.time is not None and frame.time < start:
+                    continue  # decoded from the keyframe before `start`
+                if end is not None and frame.time is not None and frame.time >= end:
+                    break
+                if kept % every_n == 0:
+                    yield convert(frame)
+                kept += 1
+
+    def _sample_uniform(self, container, stream, config: Dict[str, Any]) -> Iterator[Any]:
+        """Yield `num_frames` frames at evenly spaced times, seeking only across large gaps."""
+        num_frames = config["num_frames"]
+        if num_frames <= 0:
+            return
+        start, end = _stream_span(container, stream)
+        start = max(start, config.get("start") or start)
+        end = min(end, config.get("end") or end)
+        step = (end - start) / num_frames
+        # Middle of each of num_frames equal segments
+        targets = [start + step * (i + 0.5) for i in range(num_frames)]
+
+        decoder: Optional[Iterator] = None
+        last_time = float("-inf")
+        frame = None
+        for target in targets:
+            if decoder is None or target - last_time > SEEK_GAP_SECONDS:
+                container.seek(int(target / stream.time_base), stream=stream, backward=True)
+                decoder = container.decode(stream)
+                frame = None
+            elif frame is not None and frame.time is not None and frame.time >= target:
+                # Frames are sparser than the samples; repeat the current one
+                yield frame
+                continue
+
+            for frame in decoder:
+                last_time = frame.time if frame.time is not None else last_time
+                if frame.time is None or frame.time >= target:
+                    break
+            else:
+                if frame is None:
+                    return
+            yield frame
+
+    def save(self, file_path: Path, data: Any, loader_config: Optional[Dict[str, Any]] = None) -> None:
+        """Encode frames to a video file.
+
+        Args:
+            file_path (Path): Path to save the video to; the container follows the suffix
+            data (Any): PIL images or (H, W, 3) uint8 arrays, or one (N, H, W, 3) array
+            loader_config (Optional[Dict]): Encoder configuration options
+        """
+        import numpy as np
+
+        av = _import_av()
+        config = loader_config or {}
+        used_keys: Set[str] = set()
+        for key in self.SUPPORTED_SAVE_CONFIG:
+            if key in config:
+                used_keys.add(key)
+
+        # Warn about unused config options
+        self._warn_unused_config(config, used_keys, "VideoLoader")
+
+        frames: List["np.ndarray"] = [
+            np.asarray(frame.convert("RGB") if isinstance(frame, Image.Image) else frame, dtype=np.uint8)
+            for frame in data
+        ]
+        if not frames:
+            raise ValueError("No frames to save")
+        height, width = frames[0].shape[:2]
+
+        with av.open(str(file_path), mode="w") as container:
+            stream = container.add_stream(config.get("codec", "libx264"), rate=Fraction(config.get("fps", 24)))
+            stream.width, stream.height = width, height
+            stream.pix_fmt = config.get("pix_fmt", "yuv420p")
+            if "bit_rate" in config:
+                stream.bit_rate = config["bit_rate"]
+            if "options" in config:
+                stream.options = {key: str(value) for key, value in config["options"].items()}
+
+            for array in frames:
+                for packet in stream.encode(av.VideoFrame.from_ndarray(array, format="rgb24")):
+                    container.mux(packet)
+            for packet in stream.encode():
+                container.mux(packet)
@@ -9,6 +9,9 @@ from .base_loader import BaseLoader
 class YAMLLoader(BaseLoader):
     """Load and save YAML files."""
 
+    # yaml.safe_load is pure Python and holds the GIL for the whole parse
+    PREFERRED_EXECUTOR = "process"
+
     SUPPORTED_LOAD_CONFIG = {
         "encoding",  # str: File encoding
         "Loader",  # yaml.Loader: Custom YAML loader class
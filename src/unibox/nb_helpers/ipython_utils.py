@@ -1,10 +1,15 @@
 from io import BytesIO
-from typing import List, Union, cast
+from typing import List, Optional, Sequence, Union, cast
 
 from IPython.display import HTML, Image, display
 from PIL import Image as PILImage
 
 from ..unibox import concurrent_loads
+from .paged_gallery import PagedGallery
+from .thumbnail_cache import get_thumbnail_cache
+
+# Above this many items, galleries switch to PagedGallery instead of one inline HTML blob
+MAX_INLINE_ITEMS = 1000
 
 
 def peek_df(df, n=1):
@@ -22,6 +27,15 @@ def _src_from_data(data):
                 return f"data:{mimetype};base64,{b64value}"
 
 
+def _load_thumbnails(
+    paths: List[str], thumbnail_size: int, num_workers: int, debug_print: bool
+) -> List[Optional[PILImage.Image]]:
+    """Load images, shrinking while decoding (JPEG draft mode) when a thumbnail size is set."""
+    if thumbnail_size > 0:
+        return concurrent_loads(paths, num_workers=num_workers, debug_print=debug_print, max_size=thumbnail_size)
+    return concurrent_loads(paths, num_workers=num_workers, debug_print=debug_print)
+
+
 def _gallery(
     items: Union[List[str], List[PILImage.Image]],
     labels: list[str] = [],
@@ -29,6 +43,8 @@ def _gallery(
     num_workers=32,
     debug_print=True,
     thumbnail_size: int = 512,
+    use_cache: bool = True,
+    **paged_kwargs,
 ):
     """Shows a set of images in a gallery that flexes with the width of the notebook.
 
@@ -51,21 +67,39 @@ def _gallery(
 
     thumbnail_size: int (optional)
         If provided, resize images to this size using PIL's thumbnail method.
+
+    use_cache: bool
+        Reuse encoded thumbnails of paths from the persistent thumbnail cache.
+
+    More than 1000 items are shown page by page with a `PagedGallery`, which is returned.
+    Extra keyword arguments go to it, e.g. `page_size=200` or `serve="http"` to serve
+    thumbnails from a local server instead of inlining them.
     """
     if not items:
         return
 
-    if len(items) > 1000:
-        raise ValueError("Too many images to display.")
-
     if len(labels) > 0 and len(labels) != len(items):
         raise ValueError("Number of labels must match number of items.")
 
-    images: List[PILImage.Image]
+    if len(items) > MAX_INLINE_ITEMS:
+        return PagedGallery(
+            items,
+            labels=labels or None,
+            thumbnail_size=thumbnail_size if thumbnail_size > 0 else 512,
+            row_height=row_height,
+            num_workers=num_workers,
+            **paged_kwargs,
+        ).display()
+
+    images: Sequence[Union[PILImage.Image, bytes, None]]
     paths: List[str]
     if isinstance(items[0], str):
         paths = cast("List[str]", items)
-        images = concurrent_loads(paths, num_workers=num_workers, debug_print=debug_print)
+        if use_cache and thumbnail_size > 0:
+            # Encoded JPEG thumbnails, loaded and encoded only on a cache miss
+            images = get_thumbnail_cache().get_many(paths, thumbnail_size, num_workers, debug_print)
+        else:
+            images = _load_thumbnails(paths, thumbnail_size, num_workers, debug_print)
     else:
         images = cast("List[PILImage.Image]", items)
         paths = [f"Image {i}" for i in range(len(items))]
@@ -73,16 +107,21 @@ def _gallery(
     figures = []
     for i, image in enumerate(images):
         try:
-            if thumbnail_size > 0 and image:
-                image.thumbnail((thumbnail_size, thumbnail_size))
+            if isinstance(image, bytes):
+                img_data = image
+            else:
+                if image is None:
+                    raise ValueError("image could not be loaded")
+                if thumbnail_size > 0:
+                    image.thumbnail((thumbnail_size, thumbnail_size))
 
-            # Ensure image is in RGB mode for saving as JPEG
-            if image is not None and image.mode in ("RGBA", "P"):
-                image = image.convert("RGB")
+                # Ensure image is in RGB mode for saving as JPEG
+                if image.mode in ("RGBA", "P"):
+                    image = image.convert("RGB")
 
-            buffered = BytesIO()
-            image.save(buffered, format="JPEG")
-            img_data = buffered.getvalue()
+                buffered = BytesIO()
+                image.save(buffered, format="JPEG")
+                img_data = buffered.getvalue()
             src = _src_from_data(img_data)
             if len(labels) > 0:
                 caption_str = labels[i]
@@ -121,6 +160,8 @@ def _label_gallery(
     num_workers=32,
     debug_print=True,
     thumbnail_size: int = 512,
+    use_cache: bool = True,
+    **paged_kwargs,
 ):
     """Displays images in a gallery with JavaScript-based selection.
 
@@ -138,38 +179,60 @@ def _label_gallery(
         Whether to print debug information or not.
     thumbnail_size: int
         If provided, resize images to this size using PIL's thumbnail method.
-    """
-    if len(paths) > 1000:
-        raise ValueError("Too many images to display.")
+    use_cache: bool
+        Reuse encoded thumbnails from the persistent thumbnail cache.
 
+    More than 1000 paths are shown page by page with a selectable `PagedGallery`, which is returned.
+    Extra keyword arguments go to it, e.g. `page_size=200` or `serve="http"`.
+    """
     if len(labels) > 0 and len(labels) != len(paths):
         raise ValueError("Number of labels must match number of paths.")
 
-    # Load images using ub.concurrent_loads()
-    images = concurrent_loads(paths, num_workers=num_workers)  # list of PIL images
-
-    # convert to rgb if necessary
-    for i, img in enumerate(images):
-        if img is not None and img.mode in ("RGBA", "P"):
-            images[i] = img.convert("RGB")
-
-    # Process images: resize and handle None
-    processed_images = []
-    for img in images:
-        if img is not None:
-            if thumbnail_size > 0:
-                img.thumbnail((thumbnail_size, thumbnail_size))
-            processed_images.append(img)
-        else:
-            processed_images.append(None)  # Keep None for images that failed to load
+    if len(paths) > MAX_INLINE_ITEMS:
+        return PagedGallery(
+            paths,
+            labels=labels or None,
+            thumbnail_size=thumbnail_size if thumbnail_size > 0 else 512,
+            row_height=row_height,
+            num_workers=num_workers,
+            selectable=True,
+            **paged_kwargs,
+        ).display()
+
+    processed_images: List[Union[PILImage.Image, bytes, None]]
+    if use_cache and thumbnail_size > 0:
+        # Encoded JPEG thumbnails, loaded and encoded only on a cache miss
+        processed_images = list(get_thumbnail_cache().get_many(paths, thumbnail_size, num_workers, debug_print))
+    else:
+        # Load images using ub.concurrent_loads()
+        images = _load_thumbnails(paths, thumbnail_size, num_workers, debug_print)  # list of PIL images
+
+        # convert to rgb if necessary
+        for i, img in enumerate(images):
+            if img is not None and img.mode in ("RGBA", "P"):
+                images[i] = img.convert("RGB")
+
+        # Process images: resize and handle None
+        processed_images = []
+        for img in images:
+            if img is not None:
+                if thumbnail_size > 0:
+                    img.thumbnail((thumbnail_size, thumbnail_size))
+                processed_images.append(img)
+            else:
+                processed_images.append(None)  # Keep None for images that failed to load
 
     figures = []
     for i, image in enumerate(processed_images):
         if image is not None:
             try:
-                buffered = BytesIO()
-                image.save(buffered, format="JPEG")
-                img_data = base64.b64encode(buffered.getvalue()).decode()
+                if isinstance(image, bytes):
+                    jpeg_bytes = image
+                else:
+                    buffered = BytesIO()
+                    image.save(buffered, format="JPEG")
+                    jpeg_bytes = buffered.getvalue()
+                img_data = base64.b64encode(jpeg_bytes).decode()
                 src = f"data:image/jpeg;base64,{img_data}"
 
                 if len(labels) > 0:
@@ -0,0 +1,317 @@
+# paginated notebook gallery for large image sets
+
+import base64
+import html
+import logging
+import secrets
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from typing import Dict, Optional, Sequence, Union
+
+from PIL import Image as PILImage
+
+from .thumbnail_cache import ThumbnailCache, get_thumbnail_cache
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_thumbnail(image: PILImage.Image, thumbnail_size: int) -> bytes:
+    image = image.copy()
+    image.thumbnail((thumbnail_size, thumbnail_size))
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def _make_handler(gallery_ref: "weakref.ref[PagedGallery]", token: str):
+    class ThumbnailHandler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802
+            gallery = gallery_ref()
+            # /<token>/<index>.jpg; the random token keeps other local users from enumerating images
+            parts = self.path.strip("/").split("/")
+            data = None
+            if gallery is not None and len(parts) == 2 and parts[0] == token and parts[1].endswith(".jpg"):
+                try:
+                    data = gallery.thumbnail(int(parts[1][:-4]))
+                except (ValueError, IndexError):
+                    data = None
+            if data is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("Cache-Control", "max-age=3600")
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):  # noqa: A002
+            return
+
+    return ThumbnailHandler
+
+
+class PagedGallery:
+    """Notebook gallery that renders one page of thumbnails at a time.
+
+    Thumbnails are produced by a bounded thread pool (through the persistent
+    `ThumbnailCache` for paths) and the next pages are prefetched in the background, so
+    the kernel holds at most a few pages of encoded thumbnails.
+
+    Pages embed their thumbnails as base64 by default, which works wherever the notebook
+    runs. With ``serve="http"`` they reference the thumbnails through a small server on
+    127.0.0.1 instead, so rendering a page never waits for images; the server is only
+    reachable when the browser runs on the same machine as the kernel.
+
+    Example:
+        >>> g = PagedGallery(ub.ls("s3://bucket/images/", exts=ub.IMG_FILES), page_size=200)
+        >>> g.display()  # prev/next buttons with ipywidgets; otherwise g.next() / g.show(5)
+    """
+
+    def __init__(
+        self,
+        items: Sequence[Union[str, PILImage.Image]],
+        labels: Optional[Sequence[str]] = None,
+        page_size: int = 100,
+        thumbnail_size: int = 256,
+        row_height: str = "150px",
+        num_workers: int = 8,
+        prefetch_pages: int = 1,
+        serve: str = "inline",
+        selectable: bool = False,
+        cache: Optional[ThumbnailCache] = None,
+    ):
+        if labels and len(labels) != len(items):
+            raise ValueError("Number of labels must match number of items.")
+        if serve not in ("http", "inline"):
+            raise ValueError(f"serve must be 'http' or 'inline', got {serve!r}")
+
+        self.items = list(items)
+        self.labels = list(labels) if labels else None
+        self.page_size = page_size
+        self.thumbnail_size = thumbnail_size
+        self.row_height = row_height
+        self.prefetch_pages = prefetch_pages
+        self.serve = serve
+        self.selectable = selectable
+        self.cache = cache or get_thumbnail_cache()
+        self.page = 0
+        self.gallery_id = secrets.token_hex(4)
+
+        self._executor = ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="unibox-gallery")
+        self._lock = threading.Lock()
+        self._inflight: Dict[int, Future] = {}
+        # Encoded thumbnails of the pages around the current one
+        self._memory: "OrderedDict[int, Optional[bytes]]" = OrderedDict()
+        self._memory_limit = page_size * (2 * prefetch_pages + 2)
+        self._output = None
+
+        self._server = None
+        self._token = secrets.token_urlsafe(16)
+        if serve == "http":
+            handler = _make_handler(weakref.ref(self), self._token)
+            self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+            self._server.daemon_threads = True
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self._finalizer = weakref.finalize(self, PagedGallery._shutdown, self._server, self._executor)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def num_pages(self) -> int:
+        return max(1, -(-len(self.items) // self.page_size))
+
+    # --- thumbnails -------------------------------------------------------------------------
+
+    def _build_thumbnail(self, index: int) -> Optional[bytes]:
+        item = self.items[index]
+        try:
+            if isinstance(item, str):
+                data = self.cache.get(item, self.thumbnail_size)
+                if data is None:
+                    from ..unibox import loads
+
+                    image = loads(item, max_size=self.thumbnail_size, debug_print=False)
+                    data = self.cache.put(item, self.thumbnail_size, image)
+            else:
+                data = _encode_thumbnail(item, self.thumbnail_size)
+        except Exception as e:
+            logger.warning(f"Could not create a thumbnail for item {index}: {e}")
+            data = None
+
+        with self._lock:
+            self._inflight.pop(index, None)
+            self._memory[index] = data
+            while len(self._memory) > self._memory_limit:
+                self._memory.popitem(last=False)
+        return data
+
+    def _submit(self, index: int) -> Optional[Future]:
+        """Start building thumbnail `index` unless it is ready or in flight; call with the lock held."""
+        if index in self._memory:
+            self._memory.move_to_end(index)
+            return None
+        future = self._inflight.get(index)
+        if future is None:
+            future = self._executor.submit(self._build_thumbnail, index)
+            self._inflight[index] = future
+        return future
+
+    def thumbnail(self, index: int) -> Optional[bytes]:
+        """Return the encoded JPEG thumbnail of item `index` (None if it failed to load)."""
+        if not 0 <= index < len(self.items):
+            raise IndexError(index)
+        with self._lock:
+            future = self._submit(index)
+            if future is None:
+                return self._memory[index]
+        return future.result()
+
+    def _page_range(self, page: int) -> range:
+        start = page * self.page_size
+        return range(start, min(start + self.page_size, len(self.items)))
+
+    def prefetch(self, page: int) -> None:
+        """Queue thumbnails of `page` in the background."""
+        if 0 <= page < self.num_pages:
+            with self._lock:
+                for index in self._page_range(page):
+                    self._submit(index)
+
+    # --- rendering --------------------------------------------------------------------------
+
+    def page_html(self, page: int) -> str:
+        """HTML for one page; with serve="inline" this waits for the page's thumbnails."""
+        indices = self._page_range(page)
+        self.prefetch(page)
+        base_url = None
+        if self._server is not None:
+            host, port = self._server.server_address[:2]
+            # Typed as str | bytes; an AF_INET server address is always a str
+            host = host.decode() if isinstance(host, bytes) else host
+            base_url = f"http://{host}:{port}/{self._token}"
+
+        figures = []
+        for index in indices:
+            item = self.items[index]
+            if self.labels:
+                caption = self.labels[index]
+            else:
+                caption = item.split("/")[-1] if isinstance(item, str) else f"Image {index}"
+            if base_url is not None:
+                src = f"{base_url}/{index}.jpg"
+            else:
+                data = self.thumbnail(index)
+                src = f"data:image/jpeg;base64,{base64.b64encode(data).decode()}" if data else ""
+            onclick = f' onclick="ubGallerySelect_{self.gallery_id}({index}, this)"' if self.selectable else ""
+            figures.append(
+                f'<figure style="margin: 5px !important;">'
+                f'<img src="{src}" loading="lazy" data-index="{index}" style="height: {self.row_height}; '
+                f'cursor: pointer; box-sizing: border-box;"{onclick}>'
+                f'<figcaption style="font-size: 0.6em">{html.escape(str(caption))}</figcaption></figure>',
+            )
+
+        header = (
+            f'<div style="font-size: 0.8em">Page {page + 1} / {self.num_pages} '
+            f"(items {indices.start}-{max(indices.start, indices.stop - 1)} of {len(self.items)})</div>"
+        )
+        body = f'<div style="display: flex; flex-flow: row wrap; text-align: center;">{"".join(figures)}</div>'
+        return header + body + (self._selection_script() if self.selectable else "")
+
+    def _selection_script(self) -> str:
+        # Selections live in the browser and survive page changes; indices are global
+        gid = self.gallery_id
+        return f"""
+        <div id="ub-selection-{gid}" style="font-size: 0.8em"></div>
+        <script>
+        window.ubSelections = window.ubSelections || {{}};
+        var sel = window.ubSelections["{gid}"] = window.ubSelections["{gid}"] || new Set();
+        function ubGalleryShow_{gid}() {{
+            var s = Array.from(window.ubSelections["{gid}"]).sort((a, b) => a - b);
+            document.getElementById("ub-selection-{gid}").innerText = "Selected indices: [" + s.join(", ") + "]";
+        }}
+        function ubGallerySelect_{gid}(index, img) {{
+            var s = window.ubSelections["{gid}"];
+            if (s.has(index)) {{ s.delete(index); img.style.outline = ""; }}
+            else {{ s.add(index); img.style.outline = "4px solid blue"; }}
+            ubGalleryShow_{gid}();
+        }}
+        document.querySelectorAll("img[onclick^='ubGallerySelect_{gid}']").forEach(function (img) {{
+            if (sel.has(Number(img.dataset.index))) img.style.outline = "4px solid blue";
+        }});
+        ubGalleryShow_{gid}();
+        </script>
+        """
+
+    def show(self, page: Optional[int] = None) -> None:
+        """Render `page` (default: the current one) and prefetch the following pages."""
+        from IPython.display import HTML, display
+
+        self.page = min(max(0, self.page if page is None else page), self.num_pages - 1)
+        content = HTML(self.page_html(self.page))
+        for ahead in range(1, self.prefetch_pages + 1):
+            self.prefetch(self.page + ahead)
+
+        if self._output is not None:
+            self._output.clear_output(wait=True)
+            with self._output:
+                display(content)
+        else:
+            display(content)
+
+    def next(self) -> None:
+        self.show(self.page + 1)
+
+    def prev(self) -> None:
+        self.show(self.page - 1)
+
+    def display(self) -> "PagedGallery":
+        """Show the gallery with prev/next controls (requires ipywidgets; falls back to page 0)."""
+        from IPython.display import display
+
+        try:
+            import ipywidgets as widgets
+        except ImportError:
+            logger.info("ipywidgets is not installed; use .next(), .prev() or .show(page) to navigate")
+            self.show(0)
+            return self
+
+        prev_button = widgets.Button(description="◀ Prev")
+        next_button = widgets.Button(description="Next ▶")
+        page_input = widgets.BoundedIntText(
+            value=1, min=1, max=self.num_pages, description="Page", layout={"width": "160px"}
+        )
+        self._output = widgets.Output()
+
+        def go(page: int) -> None:
+            self.show(page)
+            page_input.value = self.page + 1
+
+        prev_button.on_click(lambda _: go(self.page - 1))
+        next_button.on_click(lambda _: go(self.page + 1))
+        page_input.observe(lambda change: go(change["new"] - 1) if change["new"] - 1 != self.page else None, "value")
+
+        display(widgets.VBox([widgets.HBox([prev_button, page_input, next_button]), self._output]))
+        self.show(0)
+        return self
+
+    # --- lifecycle --------------------------------------------------------------------------
+
+    @staticmethod
+    def _shutdown(server: Optional[ThreadingHTTPServer], executor: ThreadPoolExecutor) -> None:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    def close(self) -> None:
+        """Stop the thumbnail server and background workers."""
+        self._finalizer()
@@ -0,0 +1,172 @@
+# persistent on-disk cache of encoded thumbnails for the notebook galleries
+
+import hashlib
+import logging
+import os
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from typing import List, Optional, Union
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+# After exceeding max_bytes, evict down to this fraction so eviction does not run on every put
+EVICT_TARGET_RATIO = 0.9
+
+_FORMAT_SUFFIXES = {"JPEG": ".jpg", "WEBP": ".webp"}
+
+
+class ThumbnailCache:
+    """Small encoded thumbnails stored on disk, evicted least-recently-used first.
+
+    Entries are keyed by URI, thumbnail size and format; local files also include their
+    size and mtime, so edited images get a fresh thumbnail. Remote URIs are assumed to be
+    immutable and are never re-checked. Each hit refreshes the entry's mtime, which is
+    what eviction orders by.
+
+    Example:
+        >>> cache = ThumbnailCache()
+        >>> jpegs = cache.get_many(paths, thumbnail_size=512)
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        format: str = "JPEG",
+        quality: int = 85,
+    ):
+        from ..utils.globals import GLOBAL_CACHE_DIR
+
+        if format.upper() not in _FORMAT_SUFFIXES:
+            raise ValueError(f"Unsupported thumbnail format: {format}. Expected one of {sorted(_FORMAT_SUFFIXES)}")
+        self.cache_dir = Path(cache_dir) if cache_dir else GLOBAL_CACHE_DIR / "thumbnails"
+        self.max_bytes = max_bytes
+        self.format = format.upper()
+        self.quality = quality
+
+    def _path(self, uri: str, thumbnail_size: int) -> Path:
+        uri = str(uri)
+        if "://" in uri:
+            key = uri
+        else:
+            uri = os.path.abspath(uri)
+            stat = os.stat(uri)
+            key = f"{uri}\0{stat.st_size}\0{stat.st_mtime_ns}"
+        digest = hashlib.sha1(f"{key}\0{thumbnail_size}\0{self.format}\0{self.quality}".encode()).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}{_FORMAT_SUFFIXES[self.format]}"
+
+    def get(self, uri: str, thumbnail_size: int) -> Optional[bytes]:
+        """Return the cached thumbnail bytes, or None on a miss."""
+        try:
+            path = self._path(uri, thumbnail_size)
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def put(self, uri: str, thumbnail_size: int, image: Image.Image) -> bytes:
+        """Shrink `image` to fit `thumbnail_size`, encode and store it; returns the encoded bytes."""
+        image.thumbnail((thumbnail_size, thumbnail_size))
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        buffer = BytesIO()
+        image.save(buffer, format=self.format, quality=self.quality)
+        data = buffer.getvalue()
+
+        path = self._path(uri, thumbnail_size)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".part")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write thumbnail cache entry {path}: {e}")
+        return data
+
+    def get_many(
+        self,
+        uris: List[str],
+        thumbnail_size: int,
+        num_workers: int = 32,
+        debug_print: bool = True,
+    ) -> List[Optional[bytes]]:
+        """Return encoded thumbnails for `uris`, loading and caching only the misses.
+
+        Misses are loaded with `concurrent_loads(..., max_size=thumbnail_size)`, so they are
+        decoded at reduced resolution. Images that fail to load are returned as None.
+        """
+        from ..unibox import concurrent_loads
+
+        results: List[Optional[bytes]] = [self.get(uri, thumbnail_size) for uri in uris]
+        misses = [i for i, data in enumerate(results) if data is None]
+        if not misses:
+            return results
+
+        images = concurrent_loads(
+            [uris[i] for i in misses],
+            num_workers=num_workers,
+            debug_print=debug_print,
+            max_size=thumbnail_size,
+        )
+        for i, image in zip(misses, images):
+            if image is None:
+                continue
+            try:
+                results[i] = self.put(uris[i], thumbnail_size, image)
+            except Exception as e:
+                logger.warning(f"Could not create a thumbnail for {uris[i]}: {e}")
+        self.evict()
+        return results
+
+    def size_bytes(self) -> int:
+        """Total size of the cached thumbnails."""
+        return sum(path.stat().st_size for path in self.cache_dir.glob("*/*") if path.is_file())
+
+    def evict(self) -> None:
+        """Delete least-recently-used entries once the cache is larger than `max_bytes`."""
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*/*"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total += stat.st_size
+        if total <= self.max_bytes:
+            return
+
+        target = self.max_bytes * EVICT_TARGET_RATIO
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Delete every cached thumbnail."""
+        for path in self.cache_dir.glob("*/*"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+_default_cache: Optional[ThumbnailCache] = None
+
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    """Return the shared cache the galleries use (under `GLOBAL_CACHE_DIR / "thumbnails"`)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ThumbnailCache()
+    return _default_cache
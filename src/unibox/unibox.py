@@ -1,16 +1,20 @@
 # unibox.py
+import math
 import os
 import warnings
-from collections.abc import Iterable, Mapping
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
 from functools import partial
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 from tqdm.auto import tqdm
 
 from .backends.backend_router import get_backend_for_uri
+from .backends.hf_hybrid_backend import HuggingfaceHybridBackend
 from .backends.http_backend import HTTPBackend
 from .loaders.loader_router import get_loader_for_path, load_data
 from .utils.df_utils import coerce_json_like_to_df
@@ -21,10 +25,15 @@ s3_client = None
 logger = UniLogger()
 HTTP_DOWNLOAD_KWARGS = {"target_dir", "timeout", "retries", "retry_backoff", "chunk_size", "headers"}
 NON_HTTP_DOWNLOAD_KWARGS = HTTP_DOWNLOAD_KWARGS - {"target_dir"}
+CONCURRENT_EXECUTORS = ("auto", "thread", "process")
+# Process pools get about this many tasks per worker, each loading a batch of URIs, so the
+# per-task IPC and pickling overhead is shared by many files while work stays balanced
+PROCESS_TASKS_PER_WORKER = 4
 
 
 def _resolve_downloaded_path(local_path: Union[str, Path]) -> Path:
-    resolved_path = Path(local_path).resolve(strict=False)
+    # abspath rather than resolve(): symlinks keep their own name and suffix for loader routing
+    resolved_path = Path(os.path.abspath(local_path))
     if not (resolved_path.exists() or os.path.lexists(str(resolved_path))):
         raise FileNotFoundError(f"File not found: {resolved_path}")
     return resolved_path
@@ -49,8 +58,9 @@ def _detect_image_loader(local_path: Path) -> Any:
 
         from .loaders.image_loder import ImageLoader
 
-        with Image.open(local_path) as image:
-            image.verify()
+        # Opening parses only the header; that is enough to tell whether this is an image
+        with Image.open(local_path):
+            pass
     except (OSError, UnidentifiedImageError, ValueError):
         return None
 
@@ -243,20 +253,64 @@ def ls(
     return backend.ls(str(uri), exts=exts, relative_unix=relative_unix, debug_print=debug_print, **kwargs)
 
 
+def _choose_executor(uris: List[str], file: bool) -> str:
+    """Use processes only if a loader involved prefers them; downloads and the rest use threads."""
+    if file:
+        return "thread"
+    # The loader follows from the suffixes, so one URI per distinct suffix is enough
+    checked = set()
+    for uri in uris:
+        key = "".join(Path(uri).suffixes[-2:]).lower()
+        if key in checked:
+            continue
+        checked.add(key)
+        loader = get_loader_for_path(uri)
+        if loader is not None and loader.PREFERRED_EXECUTOR == "process":
+            return "process"
+    return "thread"
+
+
+def _load_batch(uris: List[str], file: bool, kwargs: Dict[str, Any]) -> List[Tuple[Any, Optional[str]]]:
+    """Load several URIs in one process-pool task; errors are returned per URI instead of raised."""
+    results: List[Tuple[Any, Optional[str]]] = []
+    for uri in uris:
+        try:
+            results.append((loads(uri, file=file, debug_print=False, **kwargs), None))
+        except Exception as e:
+            results.append((None, str(e)))
+    return results
+
+
 def concurrent_loads(
     uris_list: List[Union[str, Path]],
     num_workers: int = 8,
     file: bool = False,
     debug_print: bool = True,
+    executor: str = "auto",
     **kwargs,
 ) -> List[Any]:
     """Load multiple files concurrently.
 
-    For pure HTTP/HTTPS batches, this uses a thread pool because the workload is
-    dominated by network I/O. Other URI types keep the existing process-based
-    behavior. For HTTP/HTTPS batches with `file=True`, pass `target_dir` to
-    save downloads into a specific directory.
+    With ``executor="auto"``, files are loaded in a thread pool unless one of their
+    loaders sets ``PREFERRED_EXECUTOR = "process"`` (slow pure-Python parsers such as YAML
+    and TOML). Threads suit network I/O and loaders that release the GIL (images, parquet,
+    CSV), and avoid pickling every parsed result back from a worker process. Process pools
+    receive the URIs in batches. For HTTP/HTTPS batches with `file=True`, pass
+    `target_dir` to save downloads into a specific directory.
+
+    Args:
+        uris_list: Paths or URIs to load.
+        num_workers: Worker threads or processes.
+        file: Return local file paths instead of parsed contents.
+        debug_print: Show a progress bar.
+        executor: "auto", "thread" or "process".
+        **kwargs: Passed to `loads` for every file.
+
+    Returns:
+        List[Any]: Results in input order; None for files that failed to load.
     """
+    if executor not in CONCURRENT_EXECUTORS:
+        raise ValueError(f"executor must be one of {CONCURRENT_EXECUTORS}, got {executor!r}")
     uris = [str(uri) for uri in uris_list]
     results = [None] * len(uris_list)
     all_http = bool(uris) and all(_is_http_uri(uri) for uri in uris)
@@ -273,8 +327,23 @@ def concurrent_loads(
             logger.warning(f"{missing} loads returned None.")
         return results
 
-    executor_cls = ThreadPoolExecutor if all_http else ProcessPoolExecutor
-    with executor_cls(max_workers=num_workers) as executor:
+    if executor == "auto":
+        executor = "thread" if all_http else _choose_executor(uris, file)
+    if executor == "process":
+        _process_loads(uris, results, num_workers, file, debug_print, kwargs)
+    else:
+        _thread_loads(uris, results, num_workers, file, debug_print, kwargs)
+
+    missing = sum(r is None for r in results)
+    if missing > 0:
+        logger.warning(f"{missing} loads returned None.")
+    return results
+
+
+def _thread_loads(
+    uris: List[str], results: List[Any], num_workers: int, file: bool, debug_print: bool, kwargs: Dict[str, Any]
+) -> None:
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
         partial_load = partial(loads, file=file, debug_print=False, **kwargs)
         future_to_idx = {executor.submit(partial_load, uri): i for i, uri in enumerate(uris)}
 
@@ -290,10 +359,139 @@ def concurrent_loads(
             except Exception as e:
                 logger.error(f"Exception reading {uris[idx]}: {e}")
 
-    missing = sum(r is None for r in results)
-    if missing > 0:
-        logger.warning(f"{missing} loads returned None.")
-    return results
+
+def _process_loads(
+    uris: List[str], results: List[Any], num_workers: int, file: bool, debug_print: bool, kwargs: Dict[str, Any]
+) -> None:
+    batch_size = max(1, math.ceil(len(uris) / (num_workers * PROCESS_TASKS_PER_WORKER)))
+    progress = tqdm(total=len(uris), desc="Loading concurrent") if debug_print else None
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        future_to_start = {
+            executor.submit(_load_batch, uris[start : start + batch_size], file, kwargs): start
+            for start in range(0, len(uris), batch_size)
+        }
+        for future in as_completed(future_to_start):
+            start = future_to_start[future]
+            count = min(batch_size, len(uris) - start)
+            try:
+                batch = future.result()
+            except Exception as e:
+                # e.g. a result that cannot be pickled, or a crashed worker
+                batch = [(None, str(e))] * count
+            for offset, (result, error) in enumerate(batch):
+                results[start + offset] = result
+                if error is not None:
+                    logger.error(f"Exception reading {uris[start + offset]}: {error}")
+            if progress is not None:
+                progress.update(count)
+    if progress is not None:
+        progress.close()
+
+
+def iter_loads(
+    uris: Iterable[Union[str, Path]],
+    window: Optional[int] = None,
+    ordered: bool = True,
+    num_workers: int = 8,
+    file: bool = False,
+    executor: str = "auto",
+    **kwargs,
+) -> Iterator[Tuple[Union[str, Path], Any]]:
+    """Load files concurrently and yield them one by one with bounded memory.
+
+    Unlike `concurrent_loads`, `uris` may be a lazy iterable of any length: at most
+    `window` files are loading or loaded-but-not-yet-consumed at any time, and new loads
+    are only started as results are consumed. Memory therefore stays flat no matter how
+    many files flow through, and a slow consumer throttles the loading.
+
+    Args:
+        uris: Paths or URIs to load; consumed lazily.
+        window: Maximum files in flight (default: 4 per worker).
+        ordered: Yield in input order; False yields each file as soon as it is loaded.
+        num_workers: Worker threads or processes.
+        file: Yield local file paths instead of parsed contents.
+        executor: "auto", "thread" or "process", as in `concurrent_loads`; "auto" decides
+            from the first `window` URIs and keeps that pool for the rest of the stream.
+        **kwargs: Passed to `loads` for every file.
+
+    Returns:
+        Iterator[Tuple[Union[str, Path], Any]]: ``(uri, result)`` pairs; result is None if the
+        file failed to load.
+
+    Raises:
+        ValueError: On the call itself for an unknown executor or a window below 1. With
+            `file=True` and HTTP-only download options, when the stream reaches a non-HTTP URI.
+
+    Example:
+        >>> for uri, image in ub.iter_loads(ub.ls("s3://bucket/images/"), window=64):
+        ...     train_step(image)
+    """
+    if executor not in CONCURRENT_EXECUTORS:
+        raise ValueError(f"executor must be one of {CONCURRENT_EXECUTORS}, got {executor!r}")
+    window = window or num_workers * 4
+    if window < 1:
+        raise ValueError(f"window must be at least 1, got {window}")
+    # Validated here rather than in the generator, so bad arguments fail at the call, not at the first next()
+    return _iter_loads(iter(uris), window, ordered, num_workers, file, executor, kwargs)
+
+
+def _iter_loads(
+    source: Iterator[Union[str, Path]],
+    window: int,
+    ordered: bool,
+    num_workers: int,
+    file: bool,
+    executor: str,
+    kwargs: Dict[str, Any],
+) -> Iterator[Tuple[Union[str, Path], Any]]:
+    head = list(islice(source, window))
+    head_uris = [str(uri) for uri in head]
+    if executor == "auto":
+        all_http = bool(head_uris) and all(_is_http_uri(uri) for uri in head_uris)
+        executor = "thread" if all_http else _choose_executor(head_uris, file)
+
+    def checked(uris: Iterator[Union[str, Path]]) -> Iterator[Union[str, Path]]:
+        # The stream may turn non-HTTP after the head, so every URI is checked as it is pulled
+        for uri in uris:
+            if not _is_http_uri(uri):
+                _raise_if_unsupported_non_http_download_kwargs(kwargs, "are")
+            yield uri
+
+    pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    pool = pool_cls(max_workers=num_workers)
+    partial_load = partial(loads, file=file, debug_print=False, **kwargs)
+    source = chain(head, source)
+    if file:
+        source = checked(source)
+
+    def result_of(uri: Union[str, Path], future: Future) -> Tuple[Union[str, Path], Any]:
+        try:
+            return uri, future.result()
+        except Exception as e:
+            logger.error(f"Exception reading {uri}: {e}")
+            return uri, None
+
+    try:
+        if ordered:
+            # A slot is freed only when the oldest load is consumed, so loads that finish
+            # early wait in the window instead of piling up
+            queue = deque((uri, pool.submit(partial_load, str(uri))) for uri in islice(source, window))
+            while queue:
+                item = result_of(*queue.popleft())
+                for uri in islice(source, 1):
+                    queue.append((uri, pool.submit(partial_load, str(uri))))
+                yield item
+        else:
+            pending = {pool.submit(partial_load, str(uri)): uri for uri in islice(source, window)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for uri in islice(source, 1):
+                        pending[pool.submit(partial_load, str(uri))] = uri
+                    yield result_of(pending.pop(future), future)
+    finally:
+        # Also runs when the consumer stops early; queued loads are dropped, running ones finish
+        pool.shutdown(wait=True, cancel_futures=True)
 
 
 def traverses(
@@ -344,11 +542,15 @@ def gallery(
     num_workers=32,
     debug_print=True,
     thumbnail_size: int = 512,
+    use_cache: bool = True,
+    **paged_kwargs,
 ):
     try:
         from .nb_helpers.ipython_utils import _gallery
 
-        _gallery(paths, labels, row_height, num_workers, debug_print, thumbnail_size)
+        return _gallery(
+            paths, labels, row_height, num_workers, debug_print, thumbnail_size, use_cache, **paged_kwargs
+        )
     except (ImportError, ModuleNotFoundError):
         print("IPython is not available. Gallery function cannot run.")
 
@@ -360,11 +562,15 @@ def label_gallery(
     num_workers=32,
     debug_print=True,
     thumbnail_size: int = 512,
+    use_cache: bool = True,
+    **paged_kwargs,
 ):
     try:
         from .nb_helpers.ipython_utils import _label_gallery
 
-        _label_gallery(paths, labels, row_height, num_workers, debug_print, thumbnail_size)
+        return _label_gallery(
+            paths, labels, row_height, num_workers, debug_print, thumbnail_size, use_cache, **paged_kwargs
+        )
     except (ImportError, ModuleNotFoundError):
         print("IPython is not available. label_gallery function cannot run.")
 
@@ -379,3 +585,15 @@ def presigns(s3_uri: str | list[str], expiration: int = 604800) -> str:
         return [s3_client.generate_presigned_uri(uri, expiration=expiration) for uri in s3_uri]
 
     return s3_client.generate_presigned_uri(s3_uri, expiration=expiration)
+
+
+def resolve_revision(uri: str, revision: Optional[str] = None) -> str:
+    """Resolve the revision of a Hugging Face URI (or `revision`, default main) to a commit sha.
+
+    Results are cached per branch for a few minutes, and loads of HF datasets and files read
+    at the same sha. Pass it back as ``hf://owner/repo@<sha>`` to pin later reads.
+    """
+    backend = get_backend_for_uri(str(uri))
+    if not isinstance(backend, HuggingfaceHybridBackend):
+        raise ValueError(f"Not a Hugging Face URI: {uri}")
+    return backend.resolve_revision(str(uri), revision)
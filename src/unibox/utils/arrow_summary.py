@@ -0,0 +1,379 @@
+# dataset card statistics computed from Arrow record batches with mergeable accumulators
+
+import collections
+import logging
+import math
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .df_utils import dataframe_to_markdown_fallback, human_readable_size, truncate_text
+
+logger = logging.getLogger(__name__)
+
+BATCH_ROWS = 65_536
+# Distinct values tracked per column before reporting "more than N"
+MAX_TRACKED_VALUES = 10_000
+
+
+def _kind(data_type: pa.DataType) -> str:
+    if pa.types.is_dictionary(data_type):
+        return _kind(data_type.value_type)
+    if pa.types.is_null(data_type):
+        return "null"
+    if pa.types.is_boolean(data_type):
+        return "bool"
+    if pa.types.is_integer(data_type) or pa.types.is_floating(data_type) or pa.types.is_decimal(data_type):
+        return "numeric"
+    if pa.types.is_temporal(data_type):
+        return "temporal"
+    if pa.types.is_string(data_type) or pa.types.is_large_string(data_type):
+        return "string"
+    if pa.types.is_list(data_type) or pa.types.is_large_list(data_type) or pa.types.is_fixed_size_list(data_type):
+        return "list"
+    return "other"
+
+
+class ColumnStats:
+    """Statistics of one column, updated batch by batch and mergeable with another partial result.
+
+    Missing counts, sizes and numeric/temporal/boolean aggregates are exact over all rows;
+    distinct values and list lengths are tracked for the profiled rows only.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.kind = "null"
+        self.dtype = "null"
+        self.count = 0
+        self.null_count = 0
+        self.nbytes = 0
+        # numeric: count, mean and sum of squared deviations, merged with Chan's formula
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min: Any = None
+        self.max: Any = None
+        self.true_count = 0
+        self.values: collections.Counter = collections.Counter()
+        self.values_overflow = False
+        self.profiled = 0
+        self.len_sum = 0
+        self.len_n = 0
+
+    def update(self, array: pa.Array, profile: bool = True) -> None:
+        if self.kind == "null" and not pa.types.is_null(array.type):
+            self.kind, self.dtype = _kind(array.type), str(array.type)
+        self.count += len(array)
+        self.null_count += array.null_count
+        self.nbytes += array.nbytes
+        if pa.types.is_dictionary(array.type):
+            array = array.dictionary_decode()
+        if array.null_count == len(array) or _kind(array.type) != self.kind:
+            return
+
+        if self.kind == "numeric":
+            self._merge_range(pc.min_max(array))
+            array = array.cast(pa.float64())
+            n = len(array) - array.null_count
+            self._merge_moments(n, pc.mean(array).as_py(), pc.variance(array, ddof=0).as_py() * n)
+        elif self.kind == "temporal":
+            self._merge_range(pc.min_max(array))
+        elif self.kind == "bool":
+            self.true_count += pc.sum(array).as_py() or 0
+        elif profile and self.kind == "string":
+            self.profiled += len(array)
+            if not self.values_overflow:
+                counts = pc.value_counts(array.drop_null())
+                self.values.update(dict(zip(counts.field("values").to_pylist(), counts.field("counts").to_pylist())))
+                self.values_overflow = len(self.values) > MAX_TRACKED_VALUES
+        elif profile and self.kind == "list":
+            self.profiled += len(array)
+            lengths = pc.list_value_length(array)
+            self.len_n += len(lengths) - lengths.null_count
+            self.len_sum += pc.sum(lengths).as_py() or 0
+            self._merge_range(pc.min_max(lengths))
+
+    def _merge_moments(self, n: int, mean: float, m2: float) -> None:
+        if n == 0:
+            return
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+
+    def _merge_range(self, min_max: Any) -> None:
+        low, high = min_max["min"].as_py(), min_max["max"].as_py()
+        if low is not None and (self.min is None or low < self.min):
+            self.min = low
+        if high is not None and (self.max is None or high > self.max):
+            self.max = high
+
+    def merge(self, other: "ColumnStats") -> "ColumnStats":
+        if self.kind == "null":
+            self.kind, self.dtype = other.kind, other.dtype
+        self.count += other.count
+        self.null_count += other.null_count
+        self.nbytes += other.nbytes
+        self._merge_moments(other.n, other.mean, other.m2)
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None or value < self.min else self.min
+                self.max = value if self.max is None or value > self.max else self.max
+        self.true_count += other.true_count
+        self.values.update(other.values)
+        self.values_overflow = self.values_overflow or other.values_overflow or len(self.values) > MAX_TRACKED_VALUES
+        self.profiled += other.profiled
+        self.len_sum += other.len_sum
+        self.len_n += other.len_n
+        return self
+
+    def summary_lines(self, max_unique_for_freq: int) -> List[str]:
+        lines = [f"\n→ {self.name} ({self.dtype})"]
+        if self.kind == "numeric" and self.n:
+            std = math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else float("nan")
+            parts = [("Min", self.min), ("Max", self.max), ("Mean", self.mean), ("Std", std)]
+            lines.append(
+                "  - " + ", ".join(f"{key}: {val:.3f}" if isinstance(val, float) else f"{key}: {val}" for key, val in parts)
+            )
+        elif self.kind == "bool":
+            valid = self.count - self.null_count
+            false_count = valid - self.true_count
+            if self.count:
+                lines.append(
+                    f"  - True: {self.true_count} ({self.true_count / self.count:.2%}), "
+                    f"False: {false_count} ({false_count / self.count:.2%})",
+                )
+        elif self.kind == "temporal" and self.min is not None:
+            lines.append(f"  - Range: {self.min} → {self.max}")
+        elif self.kind == "string" and self.profiled:
+            if self.values_overflow:
+                lines.append(f"  - Unique values: more than {MAX_TRACKED_VALUES}")
+            else:
+                lines.append(f"  - Unique values: {len(self.values)}")
+                if len(self.values) <= max_unique_for_freq:
+                    for value, count in self.values.most_common(max_unique_for_freq):
+                        lines.append(f"    - {value!r}: {count} ({count / self.profiled * 100:.2f}%)")
+        elif self.kind == "list" and self.len_n:
+            lines.append(f"  - Typical length: mean={self.len_sum / self.len_n:.2f}, min={self.min}, max={self.max}")
+        elif self.kind == "null":
+            lines.append("  - All values missing")
+        else:
+            lines.append(f"  - Values: {self.count - self.null_count}")
+        return lines
+
+
+def _column_hashes(array: pa.Array) -> np.ndarray:
+    """64-bit hash of each value; nested values (lists, structs, images) are hashed by their repr."""
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+    if _kind(array.type) in ("list", "other"):
+        return np.fromiter((hash(repr(value)) for value in array.to_pylist()), dtype=np.int64, count=len(array)).view(
+            np.uint64
+        )
+    return pd.util.hash_array(array.to_numpy(zero_copy_only=False))
+
+
+def _row_hashes(batch: pa.RecordBatch) -> np.ndarray:
+    """Combine the column hashes of each row (FNV-style, order sensitive)."""
+    hashes = np.zeros(batch.num_rows, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for column in batch.columns:
+            hashes = (hashes ^ _column_hashes(column)) * np.uint64(1099511628211)
+    return hashes
+
+
+class DatasetStats:
+    """Mergeable summary of a table: per-column stats, sampled duplicates and preview rows."""
+
+    def __init__(self, profile_rows: int = 200_000, max_rows_for_duplicates: int = 200_000, sample_rows: int = 3):
+        self.profile_rows = profile_rows
+        self.max_rows_for_duplicates = max_rows_for_duplicates
+        self.sample_rows = sample_rows
+        self.num_rows = 0
+        self.columns: Dict[str, ColumnStats] = {}
+        self.row_hashes: Set[int] = set()
+        self.duplicate_count = 0
+        self.duplicate_rows_checked = 0
+        self.preview: Optional[pd.DataFrame] = None
+
+    def update(self, batch: pa.RecordBatch) -> None:
+        profile = self.num_rows < self.profile_rows
+        for name, column in zip(batch.schema.names, batch.columns):
+            self.columns.setdefault(name, ColumnStats(name)).update(column, profile=profile)
+
+        if self.preview is None or len(self.preview) < self.sample_rows:
+            head = batch.slice(0, self.sample_rows).to_pandas()
+            self.preview = head if self.preview is None else pd.concat([self.preview, head]).head(self.sample_rows)
+
+        remaining = self.max_rows_for_duplicates - self.duplicate_rows_checked
+        if remaining > 0:
+            self._count_duplicates(batch.slice(0, remaining))
+        self.num_rows += batch.num_rows
+
+    def _count_duplicates(self, batch: pa.RecordBatch) -> None:
+        hashes = _row_hashes(batch)
+        unique = np.unique(hashes)
+        self.duplicate_count += len(hashes) - len(unique)
+        seen = len(self.row_hashes)
+        self.row_hashes.update(unique.tolist())
+        self.duplicate_count += seen + len(unique) - len(self.row_hashes)
+        self.duplicate_rows_checked += len(hashes)
+
+    def merge(self, other: "DatasetStats") -> "DatasetStats":
+        for name, column in other.columns.items():
+            if name in self.columns:
+                self.columns[name].merge(column)
+            else:
+                self.columns[name] = column
+        seen = len(self.row_hashes)
+        self.row_hashes.update(other.row_hashes)
+        self.duplicate_count += other.duplicate_count + seen + len(other.row_hashes) - len(self.row_hashes)
+        self.duplicate_rows_checked += other.duplicate_rows_checked
+        if self.preview is None:
+            self.preview = other.preview
+        self.num_rows += other.num_rows
+        return self
+
+
+def iter_record_batches(data: Any, batch_rows: int = BATCH_ROWS) -> Iterator[pa.RecordBatch]:
+    """Record batches of a DataFrame, datasets.Dataset, pa.Table or iterable of batches/tables.
+
+    DataFrames are converted one slice at a time and Datasets are read from their
+    (memory-mapped) Arrow table, so the whole table is never copied.
+    """
+    if isinstance(data, pd.DataFrame):
+        for start in range(0, len(data), batch_rows):
+            yield from pa.Table.from_pandas(data.iloc[start : start + batch_rows], preserve_index=False).to_batches()
+    elif isinstance(data, pa.Table):
+        yield from data.to_batches(max_chunksize=batch_rows)
+    elif isinstance(data, pa.RecordBatch):
+        yield data
+    elif hasattr(data, "with_format") and hasattr(data, "num_rows"):
+        for table in data.with_format("arrow").iter(batch_size=batch_rows):
+            yield from table.to_batches()
+    else:
+        for item in data:
+            yield from iter_record_batches(item, batch_rows)
+
+
+def compute_dataset_stats(data: Any, batch_rows: int = BATCH_ROWS, **stats_kwargs) -> DatasetStats:
+    """Accumulate `DatasetStats` over the record batches of `data`."""
+    stats = DatasetStats(**stats_kwargs)
+    for batch in iter_record_batches(data, batch_rows):
+        stats.update(batch)
+    return stats
+
+
+def render_dataset_summary(
+    stats: DatasetStats,
+    repo_id: str,
+    max_unique_for_freq: int = 20,
+    split_rows: Optional[Dict[str, int]] = None,
+) -> str:
+    """Markdown dataset card in the layout of `generate_dataset_summary`."""
+    columns = list(stats.columns.values())
+    total_bytes = sum(column.nbytes for column in columns)
+    stats_rows = [
+        {
+            "Column": column.name,
+            "Dtype": column.dtype,
+            "Arrow Size": human_readable_size(column.nbytes),
+            "Missing Count": column.null_count,
+            "Missing Rate": f"{column.null_count / column.count * 100:.2f}%" if column.count else "N/A",
+        }
+        for column in columns
+    ]
+    total_missing = sum(column.null_count for column in columns)
+    cells = stats.num_rows * len(columns)
+    stats_rows.append(
+        {
+            "Column": "**TOTAL**",
+            "Dtype": "N/A",
+            "Arrow Size": human_readable_size(total_bytes),
+            "Missing Count": total_missing,
+            "Missing Rate": f"{total_missing / cells * 100:.2f}%" if cells else "N/A",
+        },
+    )
+    stats_table = dataframe_to_markdown_fallback(pd.DataFrame(stats_rows), index=False)
+
+    checked = stats.duplicate_rows_checked
+    duplicate_rate = f"{stats.duplicate_count / checked * 100:.2f}%" if checked else "N/A"
+    duplicate_note = f"(sample of {checked})" if checked < stats.num_rows else ""
+
+    summary_header = "## Column Summaries:"
+    if stats.num_rows > stats.profile_rows:
+        summary_header = f"## Column Summaries (distinct values and lengths from the first ~{stats.profile_rows} rows):"
+    summary_lines = [summary_header]
+    for column in columns:
+        summary_lines.extend(column.summary_lines(max_unique_for_freq))
+
+    preview = stats.preview if stats.preview is not None else pd.DataFrame()
+    preview = preview.apply(lambda col: col.map(lambda x: truncate_text(x, 50) if isinstance(x, str) else x))
+    try:
+        sample_table = dataframe_to_markdown_fallback(preview.head(stats.sample_rows).astype(str), index=False)
+    except Exception as e:
+        sample_table = f"Preview table failed. Error: {e}"
+
+    splits_text = ""
+    if split_rows:
+        splits_text = "- Splits: " + ", ".join(f"{name} ({rows} rows)" for name, rows in split_rows.items()) + "\n"
+
+    return f"""# {repo_id}
+(Auto-generated summary)
+
+## Basic Info:
+- Shape: **{stats.num_rows}** rows × **{len(columns)}** columns
+- Total Arrow Size: {human_readable_size(total_bytes)}
+- Duplicates: {stats.duplicate_count} ({duplicate_rate}) {duplicate_note}
+{splits_text}
+
+## Column Stats:
+
+{stats_table}
+
+{chr(10).join(summary_lines)}
+
+## Sample Rows (first {stats.sample_rows}):
+
+```
+{sample_table}
+```
+
+## Usage Example:
+
+```python
+import unibox as ub
+df = ub.loads("hf://{repo_id}").to_pandas()
+```
+
+## Saving to dataset:
+
+```python
+import unibox as ub
+ub.saves(df, "hf://{repo_id}")
+```
+
+(last updated: {pd.Timestamp.now()})
+"""
+
+
+def generate_arrow_dataset_summary(data: Any, repo_id: str, **stats_kwargs) -> str:
+    """Dataset card for a DataFrame, Dataset or DatasetDict, computed from Arrow batches.
+
+    Splits of a DatasetDict are summarized separately and merged, so no split is ever
+    converted to pandas as a whole.
+    """
+    if isinstance(data, dict):
+        stats: Optional[DatasetStats] = None
+        split_rows = {}
+        for split, split_data in data.items():
+            split_stats = compute_dataset_stats(split_data, **stats_kwargs)
+            split_rows[split] = split_stats.num_rows
+            stats = split_stats if stats is None else stats.merge(split_stats)
+        return render_dataset_summary(stats or DatasetStats(**stats_kwargs), repo_id, split_rows=split_rows)
+    return render_dataset_summary(compute_dataset_stats(data, **stats_kwargs), repo_id)
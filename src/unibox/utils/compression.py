@@ -0,0 +1,88 @@
+"""Helpers for reading and writing compressed files (gzip, zstd, bz2, xz)."""
+
+import bz2
+import gzip
+import lzma
+from pathlib import Path
+from typing import IO, Any, Optional, Union, cast
+
+COMPRESSION_SUFFIXES = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+    ".bz2": "bz2",
+    ".xz": "xz",
+}
+
+# Default levels favor throughput; zstd 3 is its own default and close to gzip 9 in ratio
+DEFAULT_COMPRESSION_LEVELS = {
+    "gzip": 6,
+    "zstd": 3,
+    "bz2": 9,
+    "xz": 6,
+}
+
+
+def infer_compression(path: Union[str, Path]) -> Optional[str]:
+    """Return the compression implied by the last suffix of `path`, or None."""
+    return COMPRESSION_SUFFIXES.get(Path(str(path)).suffix.lower())
+
+
+def _import_zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd compression requires the 'zstandard' package: pip install zstandard") from e
+    return zstandard
+
+
+def open_compressed(
+    path: Union[str, Path],
+    mode: str = "rb",
+    compression: Optional[str] = None,
+    level: Optional[int] = None,
+    threads: int = -1,
+) -> IO[bytes]:
+    """Open `path` as a binary stream, transparently (de)compressing it.
+
+    Args:
+        path: File to open.
+        mode: One of "rb", "wb" or "ab". Appending writes a new gzip member / zstd frame,
+            which standard readers decode as one continuous stream.
+        compression: "gzip", "zstd", "bz2", "xz", or None for an uncompressed file.
+        level: Compression level; defaults to `DEFAULT_COMPRESSION_LEVELS`.
+        threads: zstd worker threads (-1 uses all cores, 0 disables multithreading).
+            Ignored by the other codecs.
+
+    Returns:
+        IO[bytes]: A file-like object; close it (or use it as a context manager) to flush.
+    """
+    if mode not in ("rb", "wb", "ab"):
+        raise ValueError(f"Unsupported mode for open_compressed: {mode}")
+    if compression is None:
+        return open(path, mode)
+
+    compression = compression.lower()
+    if compression not in DEFAULT_COMPRESSION_LEVELS:
+        raise ValueError(f"Unsupported compression: {compression}. Expected one of {sorted(DEFAULT_COMPRESSION_LEVELS)}")
+    codec_level = DEFAULT_COMPRESSION_LEVELS[compression] if level is None else level
+    reading = mode == "rb"
+
+    stream: Any
+    if compression == "gzip":
+        stream = gzip.open(path, mode) if reading else gzip.open(path, mode, compresslevel=codec_level)
+    elif compression == "bz2":
+        stream = bz2.open(path, mode) if reading else bz2.open(path, mode, compresslevel=codec_level)
+    elif compression == "xz":
+        stream = lzma.open(path, mode) if reading else lzma.open(path, mode, preset=codec_level)
+    else:
+        zstandard = _import_zstandard()
+        raw = open(path, mode)
+        if reading:
+            # read_across_frames: files written in append mode hold several frames
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        else:
+            stream = zstandard.ZstdCompressor(level=codec_level, threads=threads).stream_writer(raw, closefd=True)
+    # All of these are binary file objects, though their stubs do not derive from IO[bytes]
+    return cast("IO[bytes]", stream)
@@ -27,3 +27,8 @@ GLOBAL_TMP_DIR.mkdir(parents=True, exist_ok=True)
 # @atexit.register
 # def cleanup_global_tmp_dir():
 #     shutil.rmtree(GLOBAL_TMP_DIR, ignore_errors=True)
+
+# Persistent caches (e.g. image hashes) that should survive across runs, unlike GLOBAL_TMP_DIR.
+# Created on first use so importing unibox never writes to the home directory.
+_default_cache_dir = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "unibox"
+GLOBAL_CACHE_DIR = Path(os.environ.get("UNIBOX_CACHE_DIR", _default_cache_dir))
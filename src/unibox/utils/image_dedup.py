@@ -0,0 +1,324 @@
+# exact and perceptual image deduplication
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from PIL import Image
+from tqdm.auto import tqdm
+
+logger = logging.getLogger(__name__)
+
+HASH_METHODS = ("ahash", "dhash", "phash")
+HASH_COLUMNS = ["uri", "size", "sha256", *HASH_METHODS, "error"]
+CACHE_FILENAME = "image_hashes.sqlite"
+
+# Side of the grayscale image pHash takes its DCT of; the hash keeps the 8x8 lowest frequencies
+PHASH_SIZE = 32
+READ_CHUNK_BYTES = 1024 * 1024
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, so ``C @ X @ C.T`` is the 2D DCT of ``X``."""
+    k = np.arange(n)[:, None]
+    basis = np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    basis[0] /= np.sqrt(2)
+    return basis
+
+
+_DCT = _dct_matrix(PHASH_SIZE)
+
+
+def _bits_to_hex(bits: np.ndarray) -> str:
+    return np.packbits(bits.ravel()).tobytes().hex()
+
+
+def hamming_distance(a: Union[int, str], b: Union[int, str]) -> int:
+    """Number of differing bits between two hashes (ints or hex strings)."""
+    if isinstance(a, str):
+        a = int(a, 16)
+    if isinstance(b, str):
+        b = int(b, 16)
+    return (a ^ b).bit_count()
+
+
+def image_hashes(file_path: Union[str, Path]) -> Dict[str, Any]:
+    """Compute the sha256 of a local file and the aHash, dHash and pHash of its image.
+
+    The image is decoded at reduced resolution (JPEG draft mode) straight to grayscale,
+    since the perceptual hashes only need a 32x32 thumbnail.
+
+    Returns:
+        Dict[str, Any]: size, sha256, and 64-bit ahash / dhash / phash as 16-char hex strings.
+    """
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_BYTES), b""):
+            sha256.update(chunk)
+
+    with Image.open(file_path) as img:
+        img.draft("L", (PHASH_SIZE * 2, PHASH_SIZE * 2))
+        gray = img.convert("L")
+
+    small = np.asarray(gray.resize((8, 8), Image.Resampling.LANCZOS), dtype=np.float32)
+    wide = np.asarray(gray.resize((9, 8), Image.Resampling.LANCZOS), dtype=np.float32)
+    pixels = np.asarray(gray.resize((PHASH_SIZE, PHASH_SIZE), Image.Resampling.LANCZOS), dtype=np.float64)
+    low_freq = (_DCT @ pixels @ _DCT.T)[:8, :8]
+
+    return {
+        "size": os.path.getsize(file_path),
+        "sha256": sha256.hexdigest(),
+        "ahash": _bits_to_hex(small > small.mean()),
+        "dhash": _bits_to_hex(wide[:, 1:] > wide[:, :-1]),
+        "phash": _bits_to_hex(low_freq > np.median(low_freq)),
+    }
+
+
+class _HashCache:
+    """sqlite store of image hashes keyed by (uri, size, mtime_ns); safe to share between threads."""
+
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS hashes ("
+                "uri TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+                "sha256 TEXT, ahash TEXT, dhash TEXT, phash TEXT)",
+            )
+
+    def get(self, uri: str, size: int, mtime_ns: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha256, ahash, dhash, phash FROM hashes WHERE uri = ? AND size = ? AND mtime_ns = ?",
+                (uri, size, mtime_ns),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"size": size, **dict(zip(("sha256", *HASH_METHODS), row))}
+
+    def put_many(self, rows: List[Tuple[str, int, int, str, str, str, str]]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _stat(uri: str, s3_client: Optional[Any]) -> Optional[Tuple[int, int]]:
+    """(size, mtime_ns) used as the cache key, or None for URIs that cannot be stat'ed cheaply."""
+    if uri.startswith("s3://"):
+        return s3_client.stat(uri) if s3_client is not None else None
+    if "://" in uri:
+        return None
+    stat = os.stat(uri)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def compute_image_hashes(
+    uris: List[Union[str, Path]],
+    num_workers: int = 16,
+    cache: bool = True,
+    cache_path: Optional[Union[str, Path]] = None,
+    debug_print: bool = True,
+) -> pd.DataFrame:
+    """Compute sha256 and perceptual hashes (aHash, dHash, pHash) for many images in parallel.
+
+    Results for local files and S3 objects are cached in a sqlite index keyed by
+    URI + size + mtime, so re-running over a mostly unchanged listing only hashes new or
+    modified images. Other remote URIs are downloaded and hashed every time.
+
+    Args:
+        uris: Image paths or URIs, e.g. from `ub.ls`.
+        num_workers: Hashing threads.
+        cache: Read and update the persistent hash cache.
+        cache_path: sqlite file to use; defaults to `GLOBAL_CACHE_DIR / "image_hashes.sqlite"`.
+        debug_print: Show a progress bar.
+
+    Returns:
+        pd.DataFrame: Columns uri, size, sha256, ahash, dhash, phash (hex strings) and error.
+    """
+    uri_strs = [str(uri) if "://" in str(uri) else os.path.abspath(uri) for uri in uris]
+
+    hash_cache = None
+    if cache:
+        from .globals import GLOBAL_CACHE_DIR
+
+        hash_cache = _HashCache(Path(cache_path) if cache_path else GLOBAL_CACHE_DIR / CACHE_FILENAME)
+
+    s3_client = None
+    if any(uri.startswith("s3://") for uri in uri_strs):
+        from .s3_client import S3Client
+
+        s3_client = S3Client()
+
+    def hash_one(uri: str) -> Tuple[Dict[str, Any], Optional[Tuple]]:
+        try:
+            key = _stat(uri, s3_client) if hash_cache is not None else None
+            if key is not None and hash_cache is not None:
+                cached = hash_cache.get(uri, *key)
+                if cached is not None:
+                    return {"uri": uri, **cached}, None
+
+            path = uri
+            if "://" in uri:
+                from ..unibox import loads
+
+                path = str(loads(uri, file=True, debug_print=False))
+            hashes = image_hashes(path)
+            new_row = (uri, *key, *(hashes[c] for c in ("sha256", *HASH_METHODS))) if key else None
+            return {"uri": uri, **hashes}, new_row
+        except Exception as e:
+            logger.debug(f"Could not hash {uri}: {e}")
+            return {"uri": uri, "error": f"{type(e).__name__}: {e}"}, None
+
+    try:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            results = executor.map(hash_one, uri_strs)
+            if debug_print:
+                results = tqdm(results, total=len(uri_strs), desc="Hashing images")
+            records, new_rows = zip(*results) if uri_strs else ((), ())
+        if hash_cache is not None:
+            hash_cache.put_many([row for row in new_rows if row is not None])
+    finally:
+        if hash_cache is not None:
+            hash_cache.close()
+
+    df = pd.DataFrame.from_records(list(records), columns=HASH_COLUMNS)
+    df["size"] = df["size"].astype("Int64")
+    return df
+
+
+class BKTree:
+    """Burkhard-Keller tree for nearest-neighbour queries under an integer metric.
+
+    With the Hamming distance over 64-bit hashes, a query for matches within a small
+    radius only visits a small fraction of the tree.
+    """
+
+    def __init__(self, distance: Callable[[Any, Any], int] = hamming_distance):
+        self._distance = distance
+        # node: [key, value, {distance: child}]
+        self._root: Optional[list] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, key: Any, value: Any = None) -> None:
+        node = [key, value, {}]
+        self._size += 1
+        if self._root is None:
+            self._root = node
+            return
+        current = self._root
+        while True:
+            d = self._distance(key, current[0])
+            child = current[2].get(d)
+            if child is None:
+                current[2][d] = node
+                return
+            current = child
+
+    def query(self, key: Any, max_distance: int) -> List[Tuple[int, Any]]:
+        """Return ``(distance, value)`` for every entry within `max_distance` of `key`."""
+        matches = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            d = self._distance(key, node[0])
+            if d <= max_distance:
+                matches.append((d, node[1]))
+            # Triangle inequality: only children at distance d +/- max_distance can match
+            for child_distance, child in node[2].items():
+                if d - max_distance <= child_distance <= d + max_distance:
+                    stack.append(child)
+        return matches
+
+
+def find_duplicates(
+    data: Union[pd.DataFrame, List[Union[str, Path]]],
+    method: str = "phash",
+    max_distance: int = 4,
+    **hash_kwargs,
+) -> pd.DataFrame:
+    """Group exact and near-duplicate images.
+
+    Images with the same sha256 are always grouped; images whose `method` hashes differ
+    in at most `max_distance` bits are grouped with them (transitively).
+
+    Args:
+        data: URIs to hash, or the output of `compute_image_hashes`.
+        method: "ahash", "dhash" or "phash".
+        max_distance: Hamming radius for near duplicates; 0 groups identical hashes only,
+            -1 disables perceptual matching.
+        **hash_kwargs: Passed to `compute_image_hashes` when `data` is a list.
+
+    Returns:
+        pd.DataFrame: One row per image that has duplicates, with columns group, uri,
+        keep (True for the first image of each group in input order) and distance
+        (bits from the kept image's hash).
+
+    Example:
+        >>> dupes = ub.find_duplicates(ub.ls("data/images", exts=ub.IMG_FILES))
+        >>> to_delete = dupes[~dupes.keep].uri
+    """
+    if method not in HASH_METHODS:
+        raise ValueError(f"Unknown hash method: {method}. Expected one of {HASH_METHODS}")
+    df = data if isinstance(data, pd.DataFrame) else compute_image_hashes(data, **hash_kwargs)
+    df = df[df["error"].isna()].reset_index(drop=True) if "error" in df else df.reset_index(drop=True)
+
+    parent = list(range(len(df)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i: int, j: int) -> None:
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            # Keep the earliest row as the root so it becomes the kept image
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    for rows in df.groupby("sha256", sort=False).indices.values():
+        for row in rows[1:]:
+            union(rows[0], row)
+
+    hashes = [int(h, 16) for h in df[method]]
+    if max_distance >= 0:
+        rows_by_hash: Dict[int, List[int]] = {}
+        for row, h in enumerate(hashes):
+            rows_by_hash.setdefault(h, []).append(row)
+        tree = BKTree()
+        for h, rows in rows_by_hash.items():
+            for row in rows[1:]:
+                union(rows[0], row)
+            for _, other in tree.query(h, max_distance):
+                union(rows[0], other)
+            tree.add(h, rows[0])
+
+    roots = [find(i) for i in range(len(df))]
+    counts = pd.Series(roots).value_counts()
+    members = [i for i, root in enumerate(roots) if counts[root] > 1]
+    group_ids = {root: n for n, root in enumerate(dict.fromkeys(roots[i] for i in members))}
+
+    return pd.DataFrame(
+        {
+            "group": [group_ids[roots[i]] for i in members],
+            "uri": [df["uri"].iloc[i] for i in members],
+            "keep": [roots[i] == i for i in members],
+            "distance": [hamming_distance(hashes[i], hashes[roots[i]]) for i in members],
+        },
+        columns=["group", "uri", "keep", "distance"],
+    )
@@ -0,0 +1,153 @@
+# image metadata probing from headers only
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd
+from PIL import Image, UnidentifiedImageError
+from tqdm.auto import tqdm
+
+logger = logging.getLogger(__name__)
+
+# Bytes fetched first for remote images; enough for the header of almost every JPEG/PNG/WebP
+DEFAULT_HEADER_BYTES = 64 * 1024
+# Give up growing the fetched prefix past this (e.g. JPEGs with huge embedded thumbnails)
+MAX_HEADER_BYTES = 4 * 1024 * 1024
+
+EXIF_ORIENTATION_TAG = 0x0112
+PROBE_COLUMNS = ["uri", "width", "height", "mode", "format", "orientation", "byte_size", "error"]
+
+
+def _read_header(image: Image.Image) -> Dict[str, Any]:
+    """Collect metadata PIL parsed from the header; nothing is decoded."""
+    try:
+        orientation = image.getexif().get(EXIF_ORIENTATION_TAG)
+    except Exception:
+        orientation = None
+    return {
+        "width": image.width,
+        "height": image.height,
+        "mode": image.mode,
+        "format": image.format,
+        "orientation": orientation,
+    }
+
+
+def _probe_bytes(read_range, header_bytes: int) -> Dict[str, Any]:
+    """Probe an image from prefixes returned by `read_range(length) -> (bytes, total_size)`.
+
+    The prefix is grown 4x at a time while PIL cannot identify the image yet.
+    """
+    length = header_bytes
+    while True:
+        data, total_size = read_range(length)
+        complete = len(data) < length or (total_size is not None and len(data) >= total_size)
+        try:
+            with Image.open(BytesIO(data)) as image:
+                info = _read_header(image)
+        except (UnidentifiedImageError, OSError, SyntaxError, ValueError):
+            if complete or length >= MAX_HEADER_BYTES:
+                raise
+            length = min(length * 4, MAX_HEADER_BYTES)
+            continue
+        info["byte_size"] = total_size if total_size is not None else (len(data) if complete else None)
+        return info
+
+
+def probe_image(
+    uri: Union[str, Path],
+    header_bytes: int = DEFAULT_HEADER_BYTES,
+    s3_client: Optional[Any] = None,
+) -> Dict[str, Any]:
+    """Read an image's size, mode, format and EXIF orientation without decoding pixels.
+
+    Local files are opened directly (PIL only reads the header). S3 and HTTP(S) images
+    are fetched with range requests for their first `header_bytes`; other URIs are
+    downloaded through their backend.
+
+    Args:
+        uri: Local path, s3:// URI, http(s):// URL, or any URI `ub.loads(file=True)` accepts.
+        header_bytes: Bytes to fetch first for remote images.
+        s3_client: Optional shared `S3Client` to reuse across calls.
+
+    Returns:
+        Dict[str, Any]: width, height, mode, format, orientation (EXIF, or None) and byte_size.
+    """
+    uri = str(uri)
+    if uri.startswith("s3://"):
+        from .s3_client import S3Client
+
+        client = s3_client or S3Client()
+        return _probe_bytes(lambda length: client.read_range(uri, 0, length), header_bytes)
+
+    if uri.startswith(("http://", "https://")):
+        from ..backends.http_backend import HTTPBackend
+
+        backend = HTTPBackend()
+        return _probe_bytes(lambda length: backend.read_range(uri, 0, length), header_bytes)
+
+    if "://" in uri:
+        from ..unibox import loads
+
+        uri = str(loads(uri, file=True, debug_print=False))
+
+    with Image.open(uri) as image:
+        info = _read_header(image)
+    info["byte_size"] = os.path.getsize(uri)
+    return info
+
+
+def probe_images(
+    uris: List[Union[str, Path]],
+    num_workers: int = 32,
+    header_bytes: int = DEFAULT_HEADER_BYTES,
+    debug_print: bool = True,
+) -> pd.DataFrame:
+    """Probe many images in parallel from their headers only.
+
+    Failures do not raise; they are reported in the `error` column with the other
+    columns left empty.
+
+    Args:
+        uris: Local paths, s3:// URIs or http(s):// URLs.
+        num_workers: Concurrent probes (threads; the work is I/O bound).
+        header_bytes: Bytes to fetch first for remote images.
+        debug_print: Show a progress bar.
+
+    Returns:
+        pd.DataFrame: One row per URI, in input order, with columns
+        uri, width, height, mode, format, orientation, byte_size and error.
+
+    Example:
+        >>> df = ub.probe_images(ub.ls("s3://bucket/images/", exts=ub.IMG_FILES))
+        >>> large = df[(df.width >= 1024) & (df.height >= 1024)]
+    """
+    uri_strs = [str(uri) for uri in uris]
+    s3_client = None
+    if any(uri.startswith("s3://") for uri in uri_strs):
+        from .s3_client import S3Client
+
+        # boto3 clients are thread-safe; share one instead of creating one per image
+        s3_client = S3Client()
+
+    def probe(uri: str) -> Dict[str, Any]:
+        try:
+            return {"uri": uri, **probe_image(uri, header_bytes=header_bytes, s3_client=s3_client), "error": None}
+        except Exception as e:
+            logger.debug(f"Could not probe {uri}: {e}")
+            return {"uri": uri, "error": f"{type(e).__name__}: {e}"}
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        rows = executor.map(probe, uri_strs)
+        if debug_print:
+            rows = tqdm(rows, total=len(uri_strs), desc="Probing images")
+        records = list(rows)
+
+    df = pd.DataFrame.from_records(records, columns=PROBE_COLUMNS)
+    for column in ("width", "height", "orientation", "byte_size"):
+        df[column] = df[column].astype("Int64")
+    return df
@@ -1,5 +1,15 @@
+import logging
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Tuple
+
 from PIL import Image, ImageDraw, ImageFont
 
+logger = logging.getLogger(__name__)
+
 
 def concatenate_images_horizontally(images, max_height=1024) -> Image.Image:
     """Concatenates a list of PIL.Image objects horizontally, ensuring no image exceeds a specified maximum height.
@@ -47,17 +57,62 @@ def textsize(text, font):
     return width, height
 
 
+# Memoized font sizes of file-backed fonts, keyed on (path, face index, text, box)
+FONT_SIZE_CACHE_SIZE = 4096
+_font_size_cache: Dict[Tuple[str, int, str, int, int], int] = {}
+
+
+def _search_font_size(base_font, text, max_width, max_height) -> int:
+    """Largest size of `base_font` at which `text` fits in the box (0 if even size 1 does not).
+
+    Text size grows monotonically with the font size, so an exponential then binary
+    search needs about 2*log2(size) measurements instead of one per size.
+    """
+
+    def fits(size):
+        text_width, text_height = textsize(text, base_font.font_variant(size=size))
+        return text_width <= max_width and text_height <= max_height
+
+    if not fits(1):
+        return 0
+    low, high = 1, 2
+    while fits(high):
+        low, high = high, high * 2
+    # fits(low) and not fits(high)
+    while high - low > 1:
+        mid = (low + high) // 2
+        if fits(mid):
+            low = mid
+        else:
+            high = mid
+    return low
+
+
+def _largest_fitting_font_size(base_font, text, max_width, max_height) -> int:
+    """`_search_font_size`, memoized for fonts loaded from a file path.
+
+    Fonts without a path (e.g. `ImageFont.load_default()`, backed by in-memory bytes) are
+    measured every time.
+    """
+    path = getattr(base_font, "path", None)
+    if not isinstance(path, (str, os.PathLike)):
+        return _search_font_size(base_font, text, max_width, max_height)
+    key = (os.fspath(path), getattr(base_font, "index", 0), text, max_width, max_height)
+    size = _font_size_cache.get(key)
+    if size is None:
+        size = _search_font_size(base_font, text, max_width, max_height)
+        if len(_font_size_cache) >= FONT_SIZE_CACHE_SIZE:
+            _font_size_cache.pop(next(iter(_font_size_cache)))  # drop the oldest entry
+        _font_size_cache[key] = size
+    return size
+
+
 def get_font_size(text, max_width, max_height, base_font, size_adjustment):
     if len(text) < 7:
         text = text + "a" * (7 - len(text))  # if text to short, add spaces to make it longer (to void oversized font)
 
-    font_size = 1
-    while True:
-        temp_font = base_font.font_variant(size=font_size)
-        text_width, text_height = textsize(text, temp_font)
-        if text_width > max_width or text_height > max_height:
-            break
-        font_size += 1
+    # First size that no longer fits; memoized per (font file, text, box)
+    font_size = _largest_fitting_font_size(base_font, text, max_width, max_height) + 1
 
     if size_adjustment == "default":
         font_size = font_size
@@ -100,6 +155,7 @@ def create_new_image_with_space(pil_image, max_width, max_height, padding, posit
     return new_image
 
 
+@lru_cache(maxsize=None)
 def load_font():
     try:
         font_path = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"  # Common path on many Linux systems
@@ -180,3 +236,119 @@ def add_annotations(pil_image: Image.Image, annotations: list, position: str = "
         draw.text((text_x, text_y), annotation, fill="black", font=font)
 
     return new_image
+
+
+def _fit_caption(text, font, max_width):
+    """Truncate `text` with an ellipsis so it fits in `max_width` pixels at `font`."""
+    if font.getlength(text) <= max_width:
+        return text
+    low, high = 0, len(text)  # longest prefix that fits, by binary search
+    while low < high:
+        mid = (low + high + 1) // 2
+        if font.getlength(text[:mid] + "…") <= max_width:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low] + "…"
+
+
+def _load_thumbnail(item, cell_width, cell_height):
+    """Decode (paths/URIs, at reduced resolution) and shrink one image to fit the cell."""
+    if isinstance(item, (str, Path)):
+        from ..unibox import loads
+
+        image = loads(str(item), max_size=(cell_width, cell_height), debug_print=False)
+    else:
+        image = item.copy()
+        image.thumbnail((cell_width, cell_height), reducing_gap=3.0)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return image
+
+
+def make_contact_sheet(
+    images,
+    cols=None,
+    cell_size=(256, 256),
+    captions=None,
+    caption_height=None,
+    padding=4,
+    background=(255, 255, 255),
+    num_workers=8,
+    skip_errors=True,
+) -> Image.Image:
+    """Lays out images in a grid of fixed-size cells, optionally with a caption under each one.
+
+    Images are decoded and shrunk in a thread pool (paths and URIs go through `ub.loads` with
+    `max_size`, so JPEGs are decoded at reduced resolution) and pasted as they arrive. The
+    caption font size is found once per sheet by binary search; captions that are too wide
+    for their cell are truncated with an ellipsis.
+
+    :param images: List of PIL.Image objects, local paths or URIs.
+    :param cols: Number of columns. Defaults to a roughly square grid.
+    :param cell_size: (width, height) of each cell; images are scaled to fit and centered.
+    :param captions: Optional list of strings, one per image.
+    :param caption_height: Height of the caption band below each cell. Defaults to a tenth of
+        the cell height (at least 12 pixels).
+    :param padding: Pixels between cells and around the sheet.
+    :param background: Background color of the sheet.
+    :param num_workers: Threads used to decode and resize the images.
+    :param skip_errors: Leave cells of images that fail to load empty instead of raising.
+    :return: A single RGB PIL.Image with ``ceil(len(images) / cols)`` rows.
+    :raises ValueError: If `images` is empty, or `captions` does not have one entry per image.
+    """
+    if not images:
+        raise ValueError("make_contact_sheet needs at least one image")
+    if captions is not None and len(captions) != len(images):
+        raise ValueError(f"Got {len(captions)} captions for {len(images)} images")
+
+    cell_width, cell_height = (cell_size, cell_size) if isinstance(cell_size, int) else cell_size
+    cols = cols or math.ceil(math.sqrt(len(images)))
+    rows = math.ceil(len(images) / cols)
+    band = 0
+    if captions is not None:
+        band = caption_height or max(12, cell_height // 10)
+
+    sheet = Image.new(
+        "RGB",
+        (cols * (cell_width + padding) + padding, rows * (cell_height + band + padding) + padding),
+        background,
+    )
+
+    def cell_origin(i):
+        row, col = divmod(i, cols)
+        return padding + col * (cell_width + padding), padding + row * (cell_height + band + padding)
+
+    def load(i):
+        try:
+            return _load_thumbnail(images[i], cell_width, cell_height)
+        except Exception as e:
+            if not skip_errors:
+                raise
+            logger.warning(f"Could not load image {i}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        # Pasting happens here in the calling thread while the workers decode the next images
+        for i, thumb in enumerate(executor.map(load, range(len(images)))):
+            if thumb is None:
+                continue
+            x, y = cell_origin(i)
+            sheet.paste(thumb, (x + (cell_width - thumb.width) // 2, y + (cell_height - thumb.height) // 2))
+
+    if captions is not None:
+        base_font = load_font()
+        # One size for the whole sheet, measured on text with ascenders and descenders
+        if hasattr(base_font, "font_variant"):
+            size = _largest_fitting_font_size(base_font, "Agj", cell_width, band)
+            font = base_font.font_variant(size=max(size, 1))
+        else:
+            font = base_font
+        draw = ImageDraw.Draw(sheet)
+        for i, caption in enumerate(captions):
+            caption = _fit_caption(str(caption), font, cell_width)
+            x, y = cell_origin(i)
+            text_x = x + (cell_width - font.getlength(caption)) / 2
+            draw.text((text_x, y + cell_height), caption, fill="black", font=font)
+
+    return sheet
@@ -57,6 +57,30 @@ class S3Client:
         except self.s3.exceptions.ClientError:
             return False
 
+    def read_range(self, s3_uri: str, start: int = 0, length: int = 65536) -> tuple[bytes, int | None]:
+        """Read `length` bytes starting at `start` without downloading the whole object.
+        :param s3_uri: S3 URI (e.g. s3://bucket/key)
+        :param start: First byte to read
+        :param length: Number of bytes to read (fewer are returned at the end of the object)
+        :return: (bytes read, total object size or None if S3 did not report it)
+        """
+        bucket, key = parse_s3_url(s3_uri)
+        response = self.s3.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{start + length - 1}")
+        data = response["Body"].read()
+        # "bytes 0-65535/1234567"
+        content_range = response.get("ContentRange") or ""
+        total = content_range.rpartition("/")[2]
+        return data, int(total) if total.isdigit() else response.get("ContentLength")
+
+    def stat(self, s3_uri: str) -> tuple[int, int]:
+        """Return the size and last-modified time of an object with a single HEAD request.
+        :param s3_uri: S3 URI (e.g. s3://bucket/key)
+        :return: (size in bytes, last modified as nanoseconds since the epoch)
+        """
+        bucket, key = parse_s3_url(s3_uri)
+        response = self.s3.head_object(Bucket=bucket, Key=key)
+        return response["ContentLength"], int(response["LastModified"].timestamp() * 1_000_000_000)
+
     def walk(self, s3_uri: str):
         """Generator that walks all objects under the given S3 URI.
         Yields metadata dictionaries for each object.
@@ -73,3 +73,37 @@ def test_generate_dataset_summary_fallback_markdown(monkeypatch):
     assert "## Column Stats:" in summary
     assert "Error generating stats table." not in summary
     assert "Memory Usage" in summary
+
+
+def test_arrow_dataset_summary_merges_batches_and_splits(monkeypatch):
+    import numpy as np
+    from datasets import Dataset, DatasetDict
+
+    from unibox.utils.arrow_summary import compute_dataset_stats, generate_arrow_dataset_summary
+
+    df = pd.DataFrame(
+        {
+            "x": np.arange(100, dtype=float),
+            "label": ["a", "b"] * 50,
+            "tags": [[1, 2]] * 100,
+            "flag": [True] * 25 + [False] * 75,
+        },
+    )
+    df.loc[::10, "x"] = None
+    data = pd.concat([df, df.head(5)])
+    stats = compute_dataset_stats(data, batch_rows=16)
+    x = stats.columns["x"]
+    valid = df["x"].dropna()
+    assert x.null_count == 11 and x.min == valid.min() and x.max == valid.max()
+    assert x.mean == pytest.approx(pd.concat([valid, valid.head(4)]).mean())
+    # tags is constant, so pandas can check duplicates on the hashable columns
+    assert stats.duplicate_count == data.drop(columns="tags").duplicated().sum()
+    assert stats.columns["label"].values == {"a": 53, "b": 52}
+
+    # Splits are summarized from Arrow batches without converting them to pandas
+    monkeypatch.setattr(Dataset, "to_pandas", lambda *args, **kwargs: pytest.fail("to_pandas called"))
+    ds = Dataset.from_pandas(df, preserve_index=False)
+    summary = generate_arrow_dataset_summary(DatasetDict(train=ds, test=ds.select(range(10))), "owner/repo")
+    assert "**110** rows × **4** columns" in summary
+    assert "train (100 rows), test (10 rows)" in summary
+    assert "Typical length: mean=2.00, min=2, max=2" in summary
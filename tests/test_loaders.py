@@ -1,11 +1,15 @@
 import inspect
 from pathlib import Path
 from types import SimpleNamespace
+from typing import Dict, Optional
 
+import orjson
 import pandas as pd
 import pytest
 
 import unibox as ub
+from unibox.loaders import jsonl_loader
+from unibox.loaders.base_loader import MmapReader
 from unibox.loaders.cdc_parquet_loader import CdcParquetLoader
 from unibox.loaders.hf_dataset_loader import HFDatasetLoader
 from unibox.loaders.loader_router import get_loader_for_path
@@ -152,3 +156,376 @@ def test_hf_xet_upload_progress_finalizer_completes_successful_upload_bars() ->
     assert reporter.completed_items == reporter.known_items
     assert reporter.data_processing_bar.description == "Processing Files (1 / 1)"
     assert reporter.notified_complete
+
+
+def test_mmap_reader_splits_on_line_boundaries(tmp_path: Path) -> None:
+    path = tmp_path / "lines.jsonl"
+    lines = [f'{{"id": {i}}}\n'.encode() for i in range(100)]
+    path.write_bytes(b"".join(lines))
+
+    with MmapReader(path) as reader:
+        ranges = reader.split_ranges(7)
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == len(reader)
+        assert all(prev_end == start for (_, prev_end), (start, _) in zip(ranges, ranges[1:]))
+        chunks = [line for start, end in ranges for line in reader.iter_line_bytes(start, end)]
+        views = [bytes(view) for view in reader.iter_lines()]
+
+    assert chunks == lines
+    assert views == lines
+
+
+def test_jsonl_and_txt_loaders_edge_cases(tmp_path: Path) -> None:
+    jsonl_path = tmp_path / "edge.jsonl"
+    jsonl_path.write_bytes(b'{"a": 1}\n{"b": NaN}\nnot json\n{"c": "\xff"}')
+    txt_path = tmp_path / "edge.txt"
+    txt_path.write_bytes(b"one\r\ntwo\rthree\n\n")
+    empty_json = tmp_path / "empty.json"
+    empty_json.write_bytes(b"")
+
+    assert ub.loads(jsonl_path, debug_print=False) == [{"a": 1}, {"b": None}, {"c": "\ufffd"}]
+    assert ub.loads(txt_path, debug_print=False) == ["one", "two", "three", ""]
+    assert ub.loads(empty_json, debug_print=False) is None
+
+
+def test_jsonl_parallel_load_matches_serial(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "records.jsonl"
+    records = [{"id": i, "name": f"row-{i}", "score": None if i % 7 == 0 else i / 2} for i in range(500)]
+    ub.saves(records, path, debug_print=False)
+    monkeypatch.setattr(jsonl_loader, "PARALLEL_MIN_BYTES", 0)
+
+    parallel = ub.loads(path, num_workers=3, debug_print=False)
+    parallel_df = ub.loads(path, num_workers=3, to_pandas=True, debug_print=False)
+    serial_table = ub.loads(path, to_arrow=True, debug_print=False)
+
+    assert parallel == records
+    assert parallel_df["id"].tolist() == list(range(500))
+    assert serial_table.num_rows == 500
+    assert serial_table.column_names == ["id", "name", "score"]
+
+
+def test_jsonl_save_dataframe_append_and_gzip(tmp_path: Path) -> None:
+    import gzip
+
+    from unibox.loaders.jsonl_loader import JSONLLoader
+
+    df = pd.DataFrame({"id": [1, 2], "when": pd.to_datetime(["2024-01-01", None])})
+    path = tmp_path / "rows.jsonl"
+    loader = JSONLLoader()
+
+    loader.save(path, df)
+    loader.save(path, [{"id": 3, "when": None}], loader_config={"append": True})
+    assert loader.load(path) == [
+        {"id": 1, "when": "2024-01-01T00:00:00"},
+        {"id": 2, "when": None},
+        {"id": 3, "when": None},
+    ]
+
+    gz_path = tmp_path / "rows.jsonl.gz"
+    loader.save(gz_path, [{"id": 1}], loader_config={"buffer_size": 1})
+    loader.save(gz_path, [{"id": 2}], loader_config={"append": True})
+    assert gzip.decompress(gz_path.read_bytes()) == b'{"id":1}\n{"id":2}\n'
+
+
+def test_compressed_suffixes_roundtrip(tmp_path: Path) -> None:
+    from unibox.loaders.compressed_loader import CompressedLoader
+
+    records = [{"id": 1, "score": None}, {"id": 2, "score": 0.5}]
+    for name in ("rows.jsonl.gz", "rows.jsonl.zst", "rows.json.bz2", "rows.yaml.xz"):
+        path = tmp_path / name
+        assert isinstance(get_loader_for_path(path), CompressedLoader)
+        ub.saves(records, str(path))
+        assert ub.loads(str(path)) == records
+
+    df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+    for name in ("table.csv.gz", "table.csv.zst", "table.parquet.xz"):
+        path = tmp_path / name
+        ub.saves(df, str(path))
+        pd.testing.assert_frame_equal(ub.loads(str(path)), df)
+
+    assert get_loader_for_path("archive.gz") is None
+
+
+def test_jsonl_index_random_access(tmp_path: Path) -> None:
+    from unibox.loaders.jsonl_index import index_path_for
+    from unibox.loaders.jsonl_loader import JSONLLoader
+
+    loader = JSONLLoader()
+    records = [{"i": i} for i in range(50)]
+
+    path = tmp_path / "rows.jsonl"
+    path.write_bytes(b"".join(orjson.dumps(r) + b"\n" for r in records[:49]) + orjson.dumps(records[49]))
+    assert loader.get(path, 0) == {"i": 0}
+    assert loader.get(path, -1) == {"i": 49}
+    assert loader.slice(path, 10, 13) == records[10:13]
+    assert index_path_for(path).exists()
+    with pytest.raises(IndexError):
+        loader.get(path, 50)
+
+    # Stale indexes are rebuilt; appends with index=True extend the existing one
+    loader.save(path, records, loader_config={"index": True})
+    loader.save(path, [{"i": 50}], loader_config={"append": True, "index": True})
+    assert len(loader.open_index(path)) == 51
+    assert loader.slice(path, -3) == [{"i": 48}, {"i": 49}, {"i": 50}]
+
+    zst_path = tmp_path / "rows.jsonl.zst"
+    loader.save(zst_path, records, loader_config={"index": True, "buffer_size": 64})
+    loader.save(zst_path, [{"i": 50}], loader_config={"append": True, "index": True})
+    index = loader.open_index(zst_path)
+    assert len(index) == 51 and len(index.entries) > 3
+    assert loader.get(zst_path, 37) == {"i": 37}
+    assert loader.slice(zst_path, 5, 45) == records[5:45]
+    assert loader.load(zst_path) == records + [{"i": 50}]
+
+    # zstd files written without index=True are indexed by their existing frames
+    plain_zst = tmp_path / "plain.jsonl.zst"
+    loader.save(plain_zst, records)
+    assert loader.slice(plain_zst, 48) == records[48:]
+
+    with pytest.raises(ValueError):
+        loader.save(tmp_path / "rows.jsonl.gz", records, loader_config={"index": True})
+
+
+def test_image_loader_reduced_resolution(tmp_path: Path) -> None:
+    from PIL import Image
+
+    from unibox.loaders.image_loder import ImageLoader
+
+    path = tmp_path / "photo.jpg"
+    Image.new("RGB", (1200, 800), (200, 30, 30)).save(path)
+    loader = ImageLoader()
+
+    thumb = loader.load(path, loader_config={"max_size": 300})
+    assert thumb.size == (300, 200)
+    assert loader.load(path, loader_config={"thumbnail": (300, 300), "draft": False}).size == (300, 200)
+
+    resized = loader.load(path, loader_config={"size": (240, 240), "mode": "L", "as_array": True})
+    assert resized.shape == (240, 240)
+    assert loader.load(path, loader_config={"max_size": 4000}).size == (1200, 800)
+
+
+def test_video_loader_sampling(tmp_path: Path) -> None:
+    pytest.importorskip("av")
+    import numpy as np
+
+    from unibox.loaders.video_loader import VideoLoader
+
+    path = tmp_path / "clip.mp4"
+    frames = [np.full((48, 64, 3), i * 4, dtype=np.uint8) for i in range(48)]
+    ub.saves(frames, path, fps=24, options={"g": 12}, debug_print=False)
+    assert isinstance(get_loader_for_path(path), VideoLoader)
+
+    assert len(ub.loads(path, debug_print=False)) == 48
+    sampled = ub.loads(path, num_frames=4, as_array=True, debug_print=False)
+    assert sampled.shape == (4, 48, 64, 3)
+    # Middle of each quarter: frames 6, 18, 30, 42
+    assert np.allclose(sampled[:, 0, 0, 0], [24, 72, 120, 168], atol=4)
+
+    every = ub.loads(path, every_n=16, max_size=32, debug_print=False)
+    assert [img.size for img in every] == [(32, 24)] * 3
+    keyframes = ub.loads(path, keyframes_only=True, as_array=True, debug_print=False)
+    assert len(keyframes) == 4
+    window = ub.loads(path, start=1.0, end=1.5, as_array=True, debug_print=False)
+    assert len(window) == 12 and abs(int(window[0, 0, 0, 0]) - 96) <= 4
+
+
+def test_audio_loader_ranges_and_chunks(tmp_path: Path) -> None:
+    pytest.importorskip("av")
+    import numpy as np
+
+    from unibox.loaders.audio_loader import AudioLoader
+
+    sr = 8000
+    t = np.arange(sr * 4) / sr
+    samples = (0.5 * np.stack([np.sin(2 * np.pi * 440 * t), np.sin(2 * np.pi * 220 * t)])).astype(np.float32)
+    path = tmp_path / "tone.wav"
+    ub.saves((samples, sr), path, debug_print=False)
+    assert isinstance(get_loader_for_path("x.ogg"), AudioLoader)
+
+    loaded, rate = ub.loads(path, debug_print=False)
+    assert rate == sr and loaded.shape == (2, 4 * sr)
+    assert np.abs(loaded - samples).max() < 1e-3
+
+    part, _ = ub.loads(path, offset=1.5, duration=0.5, debug_print=False)
+    assert np.abs(part - samples[:, 12000:16000]).max() < 1e-3
+
+    mono, rate = ub.loads(path, mono=True, sr=4000, duration=1.0, debug_print=False)
+    assert rate == 4000 and mono.shape == (4000,)
+
+    chunks, _ = ub.loads(path, chunk_duration=1.5, debug_print=False)
+    assert [chunk.shape[1] for chunk in chunks] == [12000, 12000, 8000]
+
+
+def _pin_fake_hub(loader: HFDatasetLoader, monkeypatch: pytest.MonkeyPatch, tmp_path: Path, sha: str) -> None:
+    """Point the loader's revision resolution at a fake Hub that reports `sha` for every branch."""
+    from types import SimpleNamespace
+
+    from unibox.backends import hf_repo_cache
+
+    class FakeApi:
+        def __init__(self):
+            self.resolved = []
+
+        def repo_info(self, repo_id, repo_type=None, revision=None):
+            self.resolved.append((repo_type, revision))
+            return SimpleNamespace(sha=sha)
+
+    loader.hf_api_backend.api = FakeApi()
+    monkeypatch.setattr(hf_repo_cache, "_default_cache", hf_repo_cache.HfRepoCache(tmp_path / "hf_repos"))
+
+
+def test_hf_dataset_loader_streaming(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from datasets import Dataset
+
+    from unibox.loaders import hf_dataset_loader
+
+    calls = []
+
+    def fake_load_dataset(repo_id, **kwargs):
+        calls.append((repo_id, kwargs))
+        dataset = Dataset.from_dict({"x": list(range(25))})
+        return dataset.to_iterable_dataset() if kwargs.get("streaming") else dataset
+
+    monkeypatch.setattr(hf_dataset_loader, "load_dataset", fake_load_dataset)
+    monkeypatch.setattr(HFDatasetLoader, "_install_hf_xet_session_downloader", lambda self: None)
+    loader = HFDatasetLoader()
+    _pin_fake_hub(loader, monkeypatch, tmp_path, sha := "c" * 40)
+
+    # The branch is resolved to its commit once, and that commit is read and reported
+    streamed = loader.load("hf://org/repo", {"streaming": True, "name": "en", "cache_dir": "/tmp/hf"})
+    assert [row["x"] for row in streamed.take(3)] == [0, 1, 2]
+    expected = {"streaming": True, "name": "en", "split": "train", "revision": sha, "cache_dir": "/tmp/hf"}
+    assert calls[-1] == ("org/repo", expected)
+    assert streamed.hf_revision == sha
+
+    frames = list(loader.load("hf://org/repo", {"streaming": True, "to_pandas": True, "batch_size": 10}))
+    assert [len(df) for df in frames] == [10, 10, 5]
+    assert frames[0].attrs["hf_revision"] == sha
+    assert loader.hf_api_backend.api.resolved == [("dataset", "main")]
+
+    loader.load("hf://org/repo", {"num_proc": 3})
+    assert calls[-1][1]["num_proc"] == 3 and "streaming" not in calls[-1][1]
+
+
+def test_hf_dataset_loader_reads_selected_parquet_shards(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import fsspec
+    import huggingface_hub
+
+    files = []
+    for split, shards in (("train", 3), ("test", 1)):
+        for i in range(shards):
+            name = f"data/{split}-{i:05d}-of-{shards:05d}.parquet"
+            path = tmp_path / f"datasets/org/repo@{'d' * 40}" / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            shard = pd.DataFrame({"id": range(i * 10, i * 10 + 10), "score": [j / 10 for j in range(10)], "text": "x"})
+            shard.to_parquet(path)
+            files.append(name)
+
+    class LocalHfFileSystem(fsspec.implementations.local.LocalFileSystem):
+        def _strip_protocol(self, path):
+            return str(tmp_path / path)
+
+    loader = HFDatasetLoader()
+    _pin_fake_hub(loader, monkeypatch, tmp_path, "d" * 40)
+    monkeypatch.setattr(huggingface_hub, "HfFileSystem", LocalHfFileSystem)
+    monkeypatch.setattr(loader.hf_api_backend, "ls", lambda uri, **kwargs: list(files))
+
+    assert HFDatasetLoader._select_parquet_files(files, "test") == ["data/test-00000-of-00001.parquet"]
+    with pytest.raises(ValueError, match="No parquet files"):
+        HFDatasetLoader._select_parquet_files(files, "validation")
+
+    df = loader.load("hf://org/repo", {"columns": ["id"], "filters": [("score", ">=", 0.5)], "to_pandas": True})
+    assert list(df.columns) == ["id"] and len(df) == 15
+    assert df.attrs["hf_revision"] == "d" * 40
+
+    ds = loader.load("hf://org/repo", {"data_files": "data/train-0000[12]-*", "columns": ["id", "score"]})
+    assert ds.num_rows == 20 and ds.column_names == ["id", "score"]
+
+
+class _FakeShardHub:
+    """Dataset repo that records commits and lists committed files with their LFS sha256."""
+
+    def __init__(self, files: Optional[Dict[str, Optional[str]]] = None, fail_on_commit: int = -1):
+        self.files = dict(files or {})
+        self.commits = []
+        self.fail_on_commit = fail_on_commit
+
+    def create_repo(self, **kwargs):
+        pass
+
+    def list_repo_tree(self, repo_id, **kwargs):
+        from huggingface_hub.hf_api import RepoFile
+
+        return [
+            RepoFile(path=path, size=1, oid="0", lfs={"size": 1, "oid": sha256, "pointerSize": 1} if sha256 else None)
+            for path, sha256 in self.files.items()
+        ]
+
+    def preupload_lfs_files(self, repo_id, additions, **kwargs):
+        assert all(Path(op.path_or_fileobj).exists() for op in additions)
+
+    def create_commit(self, repo_id, operations, **kwargs):
+        if len(self.commits) == self.fail_on_commit:
+            raise RuntimeError("connection reset")
+        self.commits.append([(type(op).__name__, op.path_in_repo) for op in operations])
+        for op in operations:
+            if type(op).__name__ == "CommitOperationAdd":
+                self.files[op.path_in_repo] = op.upload_info.sha256.hex()
+            else:
+                self.files.pop(op.path_in_repo)
+
+
+def test_push_parquet_shards_resumes_from_journal(tmp_path: Path) -> None:
+    from unibox.loaders.hf_shard_upload import push_parquet_shards
+
+    df = pd.DataFrame({"id": range(95), "text": ["row"] * 95})
+    kwargs = {"shard_rows": 10, "commit_every": 4, "journal_path": tmp_path / "journal.jsonl"}
+    old = {"data/train-00000-of-00002.parquet": "f" * 64, "data/test-00000-of-00001.parquet": "f" * 64}
+    hub = _FakeShardHub({**old, "README.md": None}, fail_on_commit=1)
+
+    with pytest.raises(RuntimeError):
+        push_parquet_shards(hub, "org/repo", {"train": df}, **kwargs)
+    assert len(hub.commits) == 1 and len(hub.commits[0]) == 4
+
+    hub.commits, hub.fail_on_commit = [], -1
+    assert push_parquet_shards(hub, "org/repo", {"train": df}, **kwargs) == 6
+    added = [path for commit in hub.commits for kind, path in commit if kind == "CommitOperationAdd"]
+    assert added[0] == "data/train-00004-of-00010.parquet" and len(added) == 6
+    assert ("CommitOperationDelete", "data/train-00000-of-00002.parquet") in hub.commits[-1]
+    assert all(path != "data/test-00000-of-00001.parquet" for commit in hub.commits for _, path in commit)
+
+    # Everything is on the Hub now; a third run uploads nothing
+    hub.commits = []
+    assert push_parquet_shards(hub, "org/repo", {"train": df}, **kwargs) == 0 and hub.commits == []
+
+    # Files without LFS metadata fall back to the journal
+    no_lfs = _FakeShardHub(dict.fromkeys(hub.files))
+    assert push_parquet_shards(no_lfs, "org/repo", {"train": df}, **kwargs) == 0
+
+
+def test_push_parquet_shards_reuploads_shards_missing_from_the_repo(tmp_path: Path) -> None:
+    from unibox.loaders.hf_shard_upload import push_parquet_shards
+
+    df = pd.DataFrame({"id": range(30)})
+    kwargs = {"shard_rows": 10, "journal_path": tmp_path / "journal.jsonl"}
+    assert push_parquet_shards(_FakeShardHub(), "org/repo", {"train": df}, **kwargs) == 3
+
+    # The journal says every shard is done, but the repo was deleted and recreated (or one shard removed)
+    assert push_parquet_shards(_FakeShardHub(), "org/repo", {"train": df}, **kwargs) == 3
+    hub = _FakeShardHub()
+    push_parquet_shards(hub, "org/repo", {"train": df}, **kwargs)
+    del hub.files["data/train-00001-of-00003.parquet"]
+    hub.commits = []
+    assert push_parquet_shards(hub, "org/repo", {"train": df}, **kwargs) == 1
+    assert hub.commits == [[("CommitOperationAdd", "data/train-00001-of-00003.parquet")]]
+
+    # A file at the path whose content differs is replaced, even though the journal matches
+    hub.files["data/train-00000-of-00003.parquet"] = "0" * 64
+    assert push_parquet_shards(hub, "org/repo", {"train": df}, **kwargs) == 1
+
+
+def test_default_journal_path_is_per_branch() -> None:
+    from unibox.loaders.hf_shard_upload import default_journal_path
+
+    assert default_journal_path("org/repo", "main") != default_journal_path("org/repo", "dev")
+    assert default_journal_path("org/repo").name == "org--repo@main.jsonl"
@@ -3,6 +3,7 @@ from functools import partial
 from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
 from io import BytesIO
 from pathlib import Path
+from types import SimpleNamespace
 
 import pandas as pd
 import pytest
@@ -192,3 +193,310 @@ def test_concurrent_loads_rejects_http_only_kwargs_for_local_file_mode(tmp_path:
 
     with pytest.raises(ValueError, match="only supported for HTTP/HTTPS URIs"):
         ub.concurrent_loads([local_path], file=True, timeout=1, debug_print=False)
+
+
+def test_concurrent_loads_picks_executor_by_loader(tmp_path: Path):
+    from unibox.unibox import _choose_executor
+
+    paths = []
+    for i in range(10):
+        paths.append(tmp_path / f"{i}.json")
+        paths[-1].write_text(f'{{"i": {i}}}', encoding="utf-8")
+    (tmp_path / "conf.yaml").write_text("a: 1\n", encoding="utf-8")
+    uris = [str(path) for path in paths]
+
+    assert _choose_executor(uris, file=False) == "thread"
+    assert _choose_executor([*uris, str(tmp_path / "conf.yaml")], file=False) == "process"
+    assert _choose_executor([str(tmp_path / "conf.yaml")], file=True) == "thread"
+
+    # Batched process tasks keep input order and report failures per file
+    uris.insert(3, str(tmp_path / "missing.json"))
+    for executor in ("thread", "process"):
+        loaded = ub.concurrent_loads(uris, num_workers=2, executor=executor, debug_print=False)
+        assert loaded[3] is None
+        assert [item["i"] for item in loaded[:3] + loaded[4:]] == list(range(10))
+    with pytest.raises(ValueError, match="executor"):
+        ub.concurrent_loads(uris, executor="fork")
+
+
+def test_iter_loads_bounds_window_and_keeps_order(monkeypatch: pytest.MonkeyPatch):
+    import random
+    import time
+
+    from unibox import unibox as unibox_module
+
+    def fake_loads(uri, file=False, debug_print=True, **kwargs):
+        time.sleep(random.random() / 1000)
+        if uri.endswith("7"):
+            raise ValueError("broken file")
+        return uri.upper()
+
+    monkeypatch.setattr(unibox_module, "loads", fake_loads)
+    pulled = []
+
+    def source():
+        for i in range(1000):
+            pulled.append(i)
+            yield f"f{i}"
+
+    # Only the window (plus the item being consumed) is pulled from the source ahead of the consumer
+    stream = ub.iter_loads(source(), window=8, num_workers=4, executor="thread")
+    first = [next(stream) for _ in range(5)]
+    assert first == [(f"f{i}", f"F{i}") for i in range(5)]
+    assert len(pulled) <= 5 + 8
+    stream.close()
+
+    items = list(ub.iter_loads([f"f{i}" for i in range(40)], window=4, executor="thread"))
+    assert [uri for uri, _ in items] == [f"f{i}" for i in range(40)]
+    assert dict(items)["f17"] is None and dict(items)["f18"] == "F18"
+
+    unordered = list(ub.iter_loads((f"f{i}" for i in range(40)), window=4, ordered=False, executor="thread"))
+    assert sorted(unordered, key=lambda item: int(item[0][1:])) == items
+
+
+def test_iter_loads_validates_arguments_up_front(monkeypatch: pytest.MonkeyPatch):
+    from unibox import unibox as unibox_module
+
+    monkeypatch.setattr(unibox_module, "loads", lambda uri, **kwargs: uri)
+
+    # Raised by the call itself, not by the first next()
+    with pytest.raises(ValueError, match="executor"):
+        ub.iter_loads(["a.txt"], executor="fork")
+    with pytest.raises(ValueError, match="window"):
+        ub.iter_loads(["a.txt"], window=-1)
+
+    # HTTP-only download options are checked for every URI, not just the first window
+    uris = [f"https://example.com/{i}.jpg" for i in range(4)] + ["s3://bucket/4.jpg"]
+    stream = ub.iter_loads(uris, window=2, file=True, timeout=5, executor="thread")
+    assert [next(stream)[0] for _ in range(2)] == uris[:2]
+    with pytest.raises(ValueError, match="timeout"):
+        list(stream)
+
+
+def test_probe_images_reads_headers(http_file_server: str, tmp_path: Path):
+    Image.new("RGB", (64, 32)).save(tmp_path / "wide.jpg")
+    Image.new("LA", (8, 16)).save(tmp_path / "tall.png")
+
+    df = ub.probe_images(
+        [tmp_path / "wide.jpg", f"{http_file_server}/tall.png", tmp_path / "alpha.txt"],
+        num_workers=2,
+        header_bytes=16,
+        debug_print=False,
+    )
+
+    assert df["uri"].tolist()[0] == str(tmp_path / "wide.jpg")
+    assert df[["width", "height"]].iloc[:2].values.tolist() == [[64, 32], [8, 16]]
+    assert df["format"].tolist()[:2] == ["JPEG", "PNG"]
+    assert df["mode"].tolist()[1] == "LA"
+    assert df["byte_size"].iloc[1] == (tmp_path / "tall.png").stat().st_size
+    assert df["error"].iloc[:2].isna().all()
+    assert "UnidentifiedImageError" in df["error"].iloc[2]
+
+
+def test_load_image_batch_crops_into_one_array(tmp_path: Path):
+    import numpy as np
+
+    left_red = Image.new("RGB", (200, 100), (0, 0, 255))
+    left_red.paste((255, 0, 0), (0, 0, 100, 100))
+    left_red.save(tmp_path / "wide.png")
+    Image.new("RGB", (50, 80), (0, 255, 0)).save(tmp_path / "tall.jpg")
+
+    paths = [tmp_path / "wide.png", tmp_path / "tall.jpg"]
+    batch = ub.load_image_batch(paths, size=32, num_workers=2, debug_print=False)
+    assert batch.shape == (2, 32, 32, 3) and batch.dtype == np.uint8
+    # Center crop of the wide image: red on the left half, blue on the right
+    assert tuple(batch[0, 16, 2]) == (255, 0, 0) and tuple(batch[0, 16, 29]) == (0, 0, 255)
+    assert batch[1, :, :, 1].min() > 240
+
+    out = np.zeros((3, 8, 16, 1), dtype=np.uint8)
+    result = ub.load_image_batch(
+        [*paths, tmp_path / "missing.png"], size=(16, 8), mode="L", crop=False, out=out, skip_errors=True, debug_print=False
+    )
+    assert result is out and out[0].any() and not out[2].any()
+
+    shared, shm = ub.load_image_batch(paths, size=8, shared_memory=True, debug_print=False)
+    try:
+        assert shared.shape == (2, 8, 8, 3) and shm.size >= shared.nbytes
+    finally:
+        del shared
+        shm.close()
+        shm.unlink()
+
+
+def test_save_images_transcodes_in_parallel(tmp_path: Path):
+    import numpy as np
+
+    source = tmp_path / "src.jpg"
+    exif = Image.Exif()
+    exif[0x010F] = "camera"
+    Image.new("RGB", (40, 30), (10, 200, 30)).save(source, exif=exif.tobytes())
+
+    images = [source, np.zeros((8, 8, 3), dtype=np.uint8), Image.new("RGBA", (6, 6)), tmp_path / "missing.png"]
+    uris = [tmp_path / "out" / f"{i}.webp" for i in range(4)]
+    uris[1] = tmp_path / "out" / "1.jpg"
+
+    df = ub.save_images(images, uris, preset="webp", num_workers=2, debug_print=False)
+
+    assert df["error"].iloc[[0, 2]].isna().all() and "missing.png" in df["error"].iloc[3]
+    assert df["byte_size"].iloc[0] == uris[0].stat().st_size
+    with Image.open(uris[0]) as image:
+        assert image.format == "WEBP" and image.size == (40, 30)
+        assert not image.getexif()
+    # A preset never writes another format under the target's suffix
+    assert "JPEG suffix" in df["error"].iloc[1] and not uris[1].exists()
+    with Image.open(uris[2]) as image:
+        assert image.format == "WEBP"
+    ub.saves(Image.new("RGB", (4, 4)), tmp_path / "out" / "small.jpeg", preset="jpeg-small")
+    with Image.open(tmp_path / "out" / "small.jpeg") as image:
+        assert image.format == "JPEG"
+
+    jpeg = ub.save_images([Image.new("RGBA", (6, 6))], [tmp_path / "a.jpg"], quality=50, debug_print=False)
+    assert jpeg["error"].isna().all()
+
+
+def test_hf_backend_batches_uploads_and_links_downloads(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from unibox.backends import hf_hybrid_backend, hf_repo_cache
+    from unibox.backends.hf_hybrid_backend import HuggingfaceHybridBackend
+
+    # Fake HF cache: snapshot entries are symlinks to blobs, like huggingface_hub lays them out
+    cache = tmp_path / "cache"
+    (cache / "blobs").mkdir(parents=True)
+
+    def fake_hf_hub_download(repo_id, filename, revision=None, repo_type=None):
+        blob = cache / "blobs" / filename.replace("/", "_").replace(".", "_")
+        blob.write_text('{"a": 1}' if filename.endswith(".json") else filename)
+        entry = cache / "snapshots" / filename
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        entry.unlink(missing_ok=True)
+        entry.symlink_to(blob)
+        return str(entry)
+
+    class FakeApi:
+        def __init__(self):
+            self.commits = []
+
+        def create_repo(self, **kwargs):
+            pass
+
+        def create_commit(self, repo_id, operations, commit_message, repo_type, revision, num_threads):
+            self.commits.append([op.path_in_repo for op in operations])
+
+        def repo_info(self, repo_id, repo_type=None, revision=None):
+            return SimpleNamespace(sha="0" * 40)
+
+    api = FakeApi()
+    monkeypatch.setattr(hf_hybrid_backend, "hf_hub_download", fake_hf_hub_download)
+    monkeypatch.setattr(hf_hybrid_backend, "HfApi", lambda: api)
+    monkeypatch.setattr(hf_repo_cache, "_default_cache", hf_repo_cache.HfRepoCache(tmp_path / "repos"))
+    backend = HuggingfaceHybridBackend()
+
+    locals_ = []
+    for i in range(5):
+        locals_.append(tmp_path / f"{i}.txt")
+        locals_[-1].write_text(str(i))
+    uploaded = backend.upload_many(locals_, "hf://datasets/org/repo/docs", files_per_commit=2)
+    assert uploaded[0] == "hf://datasets/org/repo/docs/0.txt"
+    assert [len(commit) for commit in api.commits] == [2, 2, 1]
+    with pytest.raises(ValueError):
+        backend.upload_many({locals_[0]: "a.txt", locals_[1]: "a.txt"}, "hf://datasets/org/repo")
+
+    uris = ["hf://datasets/org/repo/a/x.txt", "hf://datasets/org/repo/b/x.txt", "hf://datasets/org/repo"]
+    paths = backend.download_many(uris, target_dir=str(tmp_path / "out"), num_workers=2, debug_print=False)
+    assert paths[2] is None
+    assert paths[0] == tmp_path / "out" / "a" / "x.txt" and paths[0].read_text() == "a/x.txt"
+    # A read-only view: placed by linking the cached blob rather than copying it
+    assert paths[1].stat().st_ino == (cache / "blobs" / "b_x_txt").stat().st_ino
+
+    # Without a target directory the cache entry itself is returned; loading it still
+    # picks the loader by the entry's suffix although it links to an extensionless blob
+    cached = backend.download("hf://datasets/org/repo/meta/info.json")
+    assert cached == cache / "snapshots" / "meta" / "info.json" and cached.is_symlink()
+    assert ub.loads("hf://datasets/org/repo/meta/info.json", debug_print=False) == {"a": 1}
+    copied = backend.download("hf://datasets/org/repo/meta/info.json", target_dir=str(tmp_path / "dl"))
+    assert not copied.is_symlink() and copied.stat().st_ino == cached.stat().st_ino
+
+    # cp_to_local promises a copy: writing to it must not reach the cached blob
+    own = tmp_path / "own.json"
+    own.write_text("stale")
+    backend.cp_to_local("hf://datasets/org/repo/meta/info.json", str(own))
+    assert own.stat().st_ino != cached.stat().st_ino and own.read_text() == '{"a": 1}'
+    own.write_text("edited")
+    assert cached.read_text() == '{"a": 1}'
+
+
+def test_hf_repo_cache_skips_repeated_hub_calls(tmp_path: Path):
+    from huggingface_hub.errors import RepositoryNotFoundError
+
+    from unibox.backends.hf_repo_cache import HfRepoCache
+
+    class FakeApi:
+        def __init__(self):
+            self.calls = []
+
+        def repo_info(self, repo_id, repo_type=None, revision=None):
+            self.calls.append(("repo_info", repo_type, revision))
+            if repo_type != "dataset":
+                raise RepositoryNotFoundError("not a model", response=SimpleNamespace(headers={}, request=None))
+            return SimpleNamespace(sha="a" * 40)
+
+        def list_repo_files(self, repo_id, repo_type=None, revision=None):
+            self.calls.append(("list_repo_files", repo_type, revision))
+            return ["README.md", "data/train.parquet"]
+
+    api = FakeApi()
+    cache = HfRepoCache(tmp_path, ttl=60)
+    # A URI without a type prefix is a model first, then a dataset; the listing is keyed by commit
+    assert cache.list_files(api, "org/repo", "model", None) == ["README.md", "data/train.parquet"]
+    assert api.calls == [
+        ("repo_info", "model", "main"),
+        ("repo_info", "dataset", "main"),
+        ("list_repo_files", "dataset", "a" * 40),
+    ]
+    assert cache.list_files(api, "org/repo", "model", "main") and len(api.calls) == 3
+
+    # Another process reads the same entries from disk
+    assert HfRepoCache(tmp_path, ttl=60).resolve(api, "org/repo", "model") == ("dataset", "a" * 40)
+    assert len(api.calls) == 3
+
+    # Expired or invalidated revisions are resolved again; the tree of an unchanged commit is reused
+    cache.invalidate("org/repo")
+    cache.list_files(api, "org/repo", "dataset")
+    assert api.calls[3:] == [("repo_info", "dataset", "main")]
+    cache.ttl = 0
+    cache.resolve(api, "org/repo", "dataset")
+    assert len(api.calls) == 5
+
+
+def test_hf_repo_cache_does_not_hold_its_lock_during_hub_calls(tmp_path: Path):
+    import threading
+
+    from unibox.backends.hf_repo_cache import HfRepoCache
+
+    started, release = threading.Event(), threading.Event()
+
+    class SlowApi:
+        def repo_info(self, repo_id, repo_type=None, revision=None):
+            if repo_id == "org/slow":
+                started.set()
+                release.wait(10)
+            return SimpleNamespace(sha=("b" if repo_id == "org/slow" else "a") * 40)
+
+    api = SlowApi()
+    cache = HfRepoCache(tmp_path)
+    cache.resolve(api, "org/fast", "dataset")
+    slow = threading.Thread(target=cache.resolve, args=(api, "org/slow", "dataset"))
+    slow.start()
+    try:
+        assert started.wait(10)
+        # Served while the other repo's Hub call is still in flight
+        results = []
+        fast = threading.Thread(
+            target=lambda: results.extend(cache.resolve(api, "org/fast", "dataset", rev) for rev in ("main", "dev"))
+        )
+        fast.start()
+        fast.join(5)
+        assert results == [("dataset", "a" * 40)] * 2
+    finally:
+        release.set()
+        slow.join()
+    assert cache.resolve(api, "org/slow", "dataset") == ("dataset", "b" * 40)
@@ -1,6 +1,9 @@
 import logging
 from uuid import uuid4
 
+import pandas as pd
+import pytest
+
 from unibox.utils.logger import UniLogger
 from unibox.utils.utils import parse_hf_uri
 
@@ -54,3 +57,170 @@ def test_parse_hf_uri_unpacking() -> None:
     repo_id, subpath = parse_hf_uri("hf://org/repo/path")
     assert repo_id == "org/repo"
     assert subpath == "path"
+
+
+def test_find_duplicates_groups_exact_and_near_copies(tmp_path) -> None:
+    import numpy as np
+    from PIL import Image
+
+    from unibox.utils.image_dedup import BKTree, compute_image_hashes, find_duplicates
+
+    rng = np.random.default_rng(0)
+    base = Image.fromarray(rng.integers(0, 255, (64, 64, 3), dtype=np.uint8)).resize((256, 256))
+    base.save(tmp_path / "a.png")
+    base.save(tmp_path / "a_copy.png")
+    base.resize((200, 200)).save(tmp_path / "a_small.jpg", quality=85)
+    Image.fromarray(rng.integers(0, 255, (64, 64, 3), dtype=np.uint8)).resize((256, 256)).save(tmp_path / "b.png")
+    (tmp_path / "broken.png").write_bytes(b"not an image")
+
+    paths = [str(tmp_path / name) for name in ("a.png", "b.png", "a_copy.png", "a_small.jpg", "broken.png")]
+    cache_path = tmp_path / "cache" / "hashes.sqlite"
+    hashes = compute_image_hashes(paths, num_workers=2, cache_path=cache_path, debug_print=False)
+    assert hashes["sha256"].iloc[0] == hashes["sha256"].iloc[2]
+    assert hashes["error"].iloc[:4].isna().all() and hashes["error"].iloc[4]
+    assert len(hashes["phash"].iloc[0]) == 16
+
+    # Second run is served from the cache
+    cached = compute_image_hashes(paths, cache_path=cache_path, debug_print=False)
+    pd.testing.assert_frame_equal(cached.iloc[:4], hashes.iloc[:4])
+
+    dupes = find_duplicates(hashes, max_distance=6)
+    assert dupes["uri"].tolist() == [paths[0], paths[2], paths[3]]
+    assert dupes["keep"].tolist() == [True, False, False]
+    assert dupes["group"].nunique() == 1 and dupes["distance"].iloc[1] == 0
+    assert find_duplicates(hashes, max_distance=-1)["uri"].tolist() == [paths[0], paths[2]]
+
+    tree = BKTree()
+    for value in (0b0000, 0b0001, 0b0111, 0b1111):
+        tree.add(value, value)
+    assert sorted(v for _, v in tree.query(0, 1)) == [0b0000, 0b0001]
+
+
+def test_thumbnail_cache_hits_and_evicts(tmp_path) -> None:
+    from io import BytesIO
+
+    from PIL import Image
+
+    from unibox.nb_helpers.thumbnail_cache import ThumbnailCache
+
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"{i}.png"
+        Image.new("RGBA", (300, 200), (i * 80, 0, 0, 255)).save(path)
+        paths.append(str(path))
+
+    cache = ThumbnailCache(cache_dir=tmp_path / "thumbs")
+    first = cache.get_many(paths + [str(tmp_path / "missing.png")], thumbnail_size=64, num_workers=2, debug_print=False)
+    assert first[3] is None
+    with Image.open(BytesIO(first[0])) as thumb:
+        assert thumb.format == "JPEG" and thumb.size == (64, 43)
+    assert cache.get(paths[1], 64) == first[1]
+    assert cache.get(paths[1], 128) is None
+
+    # Editing a local file invalidates its entry
+    Image.new("RGB", (10, 10)).save(paths[2])
+    assert cache.get(paths[2], 64) is None
+
+    cache.max_bytes = len(first[0]) + 1
+    cache.evict()
+    assert cache.size_bytes() <= cache.max_bytes
+
+
+def test_paged_gallery_serves_thumbnails(tmp_path) -> None:
+    from urllib.request import urlopen
+
+    from PIL import Image
+
+    from unibox.nb_helpers.paged_gallery import PagedGallery
+    from unibox.nb_helpers.thumbnail_cache import ThumbnailCache
+
+    paths = []
+    for i in range(5):
+        path = tmp_path / f"{i}.png"
+        Image.new("RGB", (120, 80), (i * 50, 0, 0)).save(path)
+        paths.append(str(path))
+
+    cache = ThumbnailCache(cache_dir=tmp_path / "thumbs")
+    gallery = PagedGallery(
+        paths + [str(tmp_path / "missing.png")], page_size=2, thumbnail_size=32, serve="http", cache=cache
+    )
+    try:
+        assert gallery.num_pages == 3
+        page = gallery.page_html(1)
+        assert 'data-index="2"' in page and 'data-index="4"' not in page and "base64" not in page
+
+        url = page.split('src="')[1].split('"')[0]
+        with urlopen(url) as response:
+            assert response.headers["Content-Type"] == "image/jpeg"
+            with Image.open(response) as thumb:
+                assert thumb.size == (32, 21)
+        assert gallery.thumbnail(5) is None
+    finally:
+        gallery.close()
+
+    inline = PagedGallery([Image.new("RGBA", (64, 64))], selectable=True, cache=cache)
+    try:
+        html = inline.page_html(0)
+        assert "data:image/jpeg;base64," in html and "ubGallerySelect_" in html
+    finally:
+        inline.close()
+
+
+def test_large_galleries_inline_thumbnails_unless_http_is_requested(monkeypatch) -> None:
+    from PIL import Image
+
+    from unibox.nb_helpers import ipython_utils
+
+    monkeypatch.setattr(ipython_utils, "MAX_INLINE_ITEMS", 2)
+    images = [Image.new("RGB", (16, 16)) for _ in range(3)]
+
+    paged = ipython_utils._gallery(images, thumbnail_size=8)
+    served = ipython_utils._gallery(images, thumbnail_size=8, serve="http", page_size=2)
+    try:
+        assert paged.serve == "inline" and paged._server is None
+        assert served.serve == "http" and served._server is not None and served.num_pages == 2
+    finally:
+        paged.close()
+        served.close()
+
+
+def test_make_contact_sheet_grid_and_font_search(tmp_path) -> None:
+    from PIL import Image
+
+    from unibox.utils.image_utils import get_font_size, load_font, make_contact_sheet, textsize
+
+    path = tmp_path / "red.jpg"
+    Image.new("RGB", (400, 200), (255, 0, 0)).save(path)
+    images = [str(path), Image.new("RGB", (50, 100), (0, 0, 255)), str(tmp_path / "missing.jpg")]
+
+    sheet = make_contact_sheet(images, cols=2, cell_size=(100, 100), captions=["a", "b", "c"], padding=0)
+    assert sheet.size == (200, 2 * (100 + 12))
+    assert sheet.getpixel((50, 50))[0] > 200  # red image scaled to 100x50 and centered
+    assert sheet.getpixel((50, 10)) == (255, 255, 255)
+    assert sheet.getpixel((150, 50))[2] > 200
+    with pytest.raises(ValueError):
+        make_contact_sheet([])
+
+    # Binary search returns the largest size that fits, like the old linear scan did
+    font = load_font()
+    if hasattr(font, "font_variant"):
+        fitted = get_font_size("some caption", 300, 40, font, "default")
+        width, height = textsize("some caption", fitted)
+        bigger = textsize("some caption", font.font_variant(size=fitted.size + 1))
+        assert width <= 300 and height <= 40
+        assert bigger[0] > 300 or bigger[1] > 40
+
+
+def test_get_font_size_measures_fonts_without_a_file_path() -> None:
+    from PIL import ImageFont
+
+    from unibox.utils.image_utils import get_font_size, textsize
+
+    # load_default() is backed by in-memory bytes: measured with the font itself, not memoized by path
+    font = ImageFont.load_default()
+    if not hasattr(font, "font_variant"):
+        pytest.skip("Pillow built without FreeType")
+    fitted = get_font_size("hello world", 200, 40, font, "default")
+    width, height = textsize("hello world", fitted)
+    assert width <= 200 and height <= 40
+    assert type(fitted) is type(font)